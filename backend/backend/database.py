@@ -0,0 +1,114 @@
+"""
+Database configuration from the environment.
+
+Variables (all optional, the default is the local SQLite file):
+    DB_ENGINE               sqlite (default), postgresql or mysql
+    DB_NAME                 database name, for SQLite the file path
+    DB_USER, DB_PASSWORD    credentials
+    DB_HOST, DB_PORT        server address
+    DB_CONN_MAX_AGE         seconds to keep connections open, 0 closes them after each request
+    DB_CONN_HEALTH_CHECKS   check persistent connections before reuse (default on)
+    DB_POOL                 use the connection pool of the backend (PostgreSQL with psycopg 3)
+    DB_POOL_MIN_SIZE        minimum number of pooled connections
+    DB_POOL_MAX_SIZE        maximum number of pooled connections
+    DB_SQLITE_TIMEOUT       seconds SQLite waits for a locked database before failing
+    DB_REPLICAS             comma separated read replicas: hosts, for SQLite file paths
+"""
+
+ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'postgresql': 'django.db.backends.postgresql',
+    'mysql': 'django.db.backends.mysql',
+}
+
+# WAL lets readers proceed while a single writer commits; synchronous=NORMAL only syncs at
+# checkpoints, which is safe with WAL (a power loss may drop the last commits, never corrupt).
+SQLITE_INIT_COMMAND = 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;'
+
+REPLICA_ALIAS = 'replica{}'
+
+DEFAULT_CONN_MAX_AGE = 60
+DEFAULT_SQLITE_TIMEOUT = 20
+
+
+def env_flag(environ, name, default=False) -> bool:
+    value = environ.get(name)
+    if value is None or value == '':
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def database_from_env(environ, base_dir) -> dict:
+    """
+    Build the `default` entry of `DATABASES` from environment variables.
+
+    Args:
+        environ (Mapping[str, str]): The environment, usually `os.environ`.
+        base_dir (Path): Project directory, home of the default SQLite file.
+
+    Returns:
+        dict: The database settings.
+    """
+    engine = environ.get('DB_ENGINE', 'sqlite').strip().lower()
+    if engine not in ENGINES:
+        raise ValueError(f"DB_ENGINE must be one of the following: {', '.join(ENGINES)}.")
+
+    database = {
+        'ENGINE': ENGINES[engine],
+        'NAME': environ.get('DB_NAME') or (base_dir / 'db.sqlite3' if engine == 'sqlite' else 'beerhub'),
+        'CONN_MAX_AGE': int(environ.get('DB_CONN_MAX_AGE', DEFAULT_CONN_MAX_AGE)),
+        'CONN_HEALTH_CHECKS': env_flag(environ, 'DB_CONN_HEALTH_CHECKS', default=True),
+        'OPTIONS': {},
+    }
+
+    if engine == 'sqlite':
+        database['OPTIONS'] = {
+            'init_command': SQLITE_INIT_COMMAND,
+            'timeout': int(environ.get('DB_SQLITE_TIMEOUT', DEFAULT_SQLITE_TIMEOUT)),
+            # take the write lock when a transaction starts instead of failing to upgrade later
+            'transaction_mode': 'IMMEDIATE',
+        }
+        return database
+
+    database.update({
+        'USER': environ.get('DB_USER', ''),
+        'PASSWORD': environ.get('DB_PASSWORD', ''),
+        'HOST': environ.get('DB_HOST', ''),
+        'PORT': environ.get('DB_PORT', ''),
+    })
+
+    if env_flag(environ, 'DB_POOL'):
+        if engine != 'postgresql':
+            raise ValueError("DB_POOL requires DB_ENGINE=postgresql.")
+        # pooled connections are returned to the pool instead of being kept per thread
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {
+            'min_size': int(environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(environ.get('DB_POOL_MAX_SIZE', 10)),
+        }
+    return database
+
+
+def replicas_from_env(environ, primary) -> dict:
+    """
+    Build the `DATABASES` entries of the read replicas listed in `DB_REPLICAS`.
+
+    Replicas share the settings of the primary, only the host (for SQLite the file) differs.
+    In tests they mirror the primary.
+
+    Args:
+        environ (Mapping[str, str]): The environment, usually `os.environ`.
+        primary (dict): The settings of the primary database.
+
+    Returns:
+        dict[str, dict]: The replica settings keyed by alias (`replica1`, `replica2`, ...).
+    """
+    locations = [location.strip() for location in environ.get('DB_REPLICAS', '').split(',') if location.strip()]
+    location_key = 'NAME' if primary['ENGINE'] == ENGINES['sqlite'] else 'HOST'
+
+    replicas = {}
+    for number, location in enumerate(locations, start=1):
+        replica = {**primary, 'OPTIONS': dict(primary['OPTIONS']), location_key: location}
+        replica['TEST'] = {'MIRROR': 'default'}
+        replicas[REPLICA_ALIAS.format(number)] = replica
+    return replicas
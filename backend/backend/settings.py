@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .database import database_from_env, replicas_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -57,6 +60,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'beers.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -91,11 +95,27 @@ TEMPLATES = [
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# Configured from DB_* environment variables, see backend/database.py
 
 DATABASES = {
+    'default': database_from_env(os.environ, BASE_DIR),
+}
+DATABASES.update(replicas_from_env(os.environ, DATABASES['default']))
+
+# Read actions of the beers app are served by the replicas (see beers/replicas.py)
+DATABASE_ROUTERS = ['beers.replicas.ReplicaRouter']
+BEERS_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+# Responses read from a replica are not cached for this many seconds after a write, the
+# replicas may not have caught up with it yet (see beers/cache.py)
+BEERS_REPLICA_LAG = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
@@ -153,11 +173,13 @@ CORS_ALLOWED_ORIGINS = [
     'http://localhost:8001',  # tui
     'http://localhost:3000',  # gui
 ]
+# readable by browser clients, sizes of the lists answered to HEAD requests
+CORS_EXPOSE_HEADERS = ['X-Total-Count']
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'beers.authentication.CachedTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAdminUser',
@@ -165,6 +187,37 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema',
 }
 
+# Cursor pagination of the beer list (see beers/pagination.py)
+BEERS_PAGE_SIZE = 50
+BEERS_MAX_PAGE_SIZE = 500
+
+# Maximum number of results of the full-text search (see beers/search.py)
+BEERS_SEARCH_MAX_RESULTS = 100
+
+# Response cache of the read endpoints (see beers/cache.py)
+BEERS_CACHE_ALIAS = 'default'
+BEERS_CACHE_TIMEOUT = 300
+
+# Cached beer editor group membership per user (see beers/permissions.py)
+BEERS_PERMISSION_CACHE_TIMEOUT = 60
+
+# Authenticated tokens cached per process and in the cache backend (see beers/authentication.py)
+BEERS_TOKEN_CACHE_SIZE = 1024
+BEERS_TOKEN_CACHE_LOCAL_TIMEOUT = 10
+BEERS_TOKEN_CACHE_TIMEOUT = 300
+
+# Bulk create, update and delete of beers (see BeerViewSet.bulk)
+BEERS_BULK_MAX_ITEMS = 5000
+BEERS_BULK_BATCH_SIZE = 500
+
+# Rows fetched per database round trip when exporting beers (see beers/export.py)
+BEERS_EXPORT_CHUNK_SIZE = 2000
+
+# Request instrumentation (see beers/instrumentation.py): Server-Timing header, and the number of
+# executions of the same query within a request that is logged as N+1 pattern (0 disables)
+BEERS_SERVER_TIMING = True
+BEERS_NPLUSONE_THRESHOLD = 5
+
 ACCOUNT_EMAIL_REQUIRED = True
 ACCOUNT_EMAIL_VERIFICATION = 'none'
 
@@ -0,0 +1,249 @@
+from abc import ABCMeta, abstractmethod
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from .cache import response_cache
+from .conditional import acompute_validators, not_modified, set_validators
+from .filters import BeerFilterBackend, get_ordering
+from .models import Beer, Brewery
+from .pagination import TOTAL_COUNT_HEADER, BeerCursorPagination, total_count_response
+from .renderers import FastJSONRenderer
+from .replicas import replica_reads
+from .serializers import BeerValuesSerializer
+from .views import read_permissions
+
+
+class AsyncReadView(View, metaclass=ABCMeta):
+    """
+    Base class of the native async read endpoints.
+
+    Serves the same responses as the read actions of `BeerViewSet` and `BreweryViewSet`,
+    including authentication, permissions, the response cache and conditional requests, but
+    queries the database with the async ORM. Under an ASGI server a request waiting for the
+    database or a slow client does not hold a thread.
+
+    Authentication runs the synchronous REST framework authenticators in a worker thread,
+    everything else stays on the event loop. Reads are served by the read replicas, if configured.
+
+    Subclasses implement `respond` and optionally `get_validator_queryset` and, for list
+    endpoints, `get_count_queryset`, which adds the `X-Total-Count` header and answers HEAD
+    requests with a count.
+    """
+
+    endpoint = None
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = read_permissions
+    renderer_class = FastJSONRenderer
+
+    async def get(self, request, *args, **kwargs):
+        return await self.serve(request, self.counted_respond, **kwargs)
+
+    async def head(self, request, *args, **kwargs):
+        return await self.serve(request, self.count_respond, **kwargs)
+
+    async def serve(self, request, respond, **kwargs):
+        request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        try:
+            await sync_to_async(self.check_permissions)(request)
+            with replica_reads():
+                response = await respond(request, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(request, exc)
+        return self.finalize(response)
+
+    def check_permissions(self, request):
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    async def conditional_respond(self, request, **kwargs):
+        try:
+            queryset = self.get_validator_queryset(**kwargs)
+            validators = None if queryset is None else await acompute_validators(request, queryset)
+        except (ValueError, DjangoValidationError):
+            # invalid lookup values, e.g. a non-numeric id; respond answers with an error
+            validators = None
+        if validators is None:
+            return await self.cached_respond(request, **kwargs)
+
+        etag, last_modified = validators
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(await self.cached_respond(request, **kwargs), etag, last_modified)
+
+    async def counted_respond(self, request, **kwargs):
+        response = await self.conditional_respond(request, **kwargs)
+        if (isinstance(response, Response) and isinstance(response.data, list)
+                and self.get_count_queryset(request, **kwargs) is not None):
+            response[TOTAL_COUNT_HEADER] = str(len(response.data))
+        return response
+
+    async def cached_respond(self, request, **kwargs):
+        return await response_cache.afetch(self.endpoint, request, lambda: self.respond(request, **kwargs))
+
+    def get_validator_queryset(self, **kwargs):
+        """
+        The beers that make up the response, None if the endpoint does not answer conditional requests.
+        """
+        return None
+
+    def get_count_queryset(self, request, **kwargs):
+        """
+        The rows of a list endpoint, counted for `X-Total-Count`; None if the endpoint is no list.
+        """
+        return None
+
+    @abstractmethod
+    async def respond(self, request, **kwargs) -> Response:
+        pass
+
+    async def count_respond(self, request, **kwargs) -> Response:
+        """
+        Answer a HEAD request: list endpoints with a single COUNT query, the others with the
+        headers of the GET response.
+        """
+        queryset = self.get_count_queryset(request, **kwargs)
+        if queryset is None:
+            return await self.conditional_respond(request, **kwargs)
+        return total_count_response(await queryset.acount())
+
+    def handle_exception(self, request, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticate_header = request.authenticators[0].authenticate_header(request) \
+                if request.authenticators else None
+            if authenticate_header:
+                exc.auth_header = authenticate_header
+            else:
+                exc.status_code = 403
+
+        response = exception_handler(exc, {'view': self, 'request': request, 'args': (), 'kwargs': {}})
+        if response is None:
+            raise exc
+        return response
+
+    def finalize(self, response):
+        if isinstance(response, Response):
+            response.accepted_renderer = self.renderer_class()
+            response.accepted_media_type = self.renderer_class.media_type
+            response.renderer_context = {}
+            response.render()
+        return response
+
+
+class AsyncBeerListView(AsyncReadView):
+    """
+    Async version of the beer list, including filters, ordering, sparse fieldsets, the
+    opt-in cursor pagination and the `X-Total-Count` answer to HEAD requests.
+    """
+    endpoint = 'list'
+
+    async def conditional_respond(self, request, **kwargs):
+        self.queryset = BeerFilterBackend().filter_queryset(request, Beer.objects.all(), self)
+        return await super().conditional_respond(request, **kwargs)
+
+    def get_validator_queryset(self):
+        return self.queryset
+
+    def get_count_queryset(self, request):
+        return BeerFilterBackend().filter_queryset(request, Beer.objects.all(), self)
+
+    async def respond(self, request):
+        fields = BeerValuesSerializer.parse_fields(request.query_params.get('fields'))
+        ordering_fields = [field.lstrip('-') for field in get_ordering(request)]
+        rows = BeerValuesSerializer.values(self.queryset, fields, extra=ordering_fields)
+        paginator = BeerCursorPagination()
+        if not paginator.is_requested(request):
+            return Response(await BeerValuesSerializer(rows, fields).adata())
+
+        # the cursor paginator is synchronous, it reads a single page
+        page = await sync_to_async(paginator.paginate_queryset)(rows, request, self)
+        return paginator.get_paginated_response(BeerValuesSerializer(page, fields).data)
+
+
+class AsyncBeerDetailView(AsyncReadView):
+    """
+    Async version of retrieving a single beer.
+    """
+    endpoint = 'retrieve'
+
+    def get_validator_queryset(self, pk=None):
+        return Beer.objects.filter(pk=pk)
+
+    async def respond(self, request, pk=None):
+        try:
+            rows = BeerValuesSerializer.values(Beer.objects.filter(pk=pk))
+            data = await BeerValuesSerializer(rows[:1]).adata()
+        except (TypeError, ValueError, DjangoValidationError):
+            data = None
+        if not data:
+            raise Http404(f"No {Beer._meta.object_name} matches the given query.")
+        return Response(data[0])
+
+
+class AsyncBeersByNameView(AsyncReadView):
+    """
+    Async version of retrieving beers by (a part of) their name.
+    """
+    endpoint = 'get_beer_by_name'
+
+    def get_count_queryset(self, request, beer_name=None):
+        return Beer.objects.filter(name__icontains=beer_name)
+
+    async def respond(self, request, beer_name=None):
+        rows = BeerValuesSerializer.values(Beer.objects.filter(name__icontains=beer_name))
+        return Response(await BeerValuesSerializer(rows).adata())
+
+
+class AsyncBreweryListView(AsyncReadView):
+    """
+    Async version of listing the breweries.
+    """
+    endpoint = 'list_breweries'
+
+    def get_count_queryset(self, request):
+        return Brewery.objects.all()
+
+    def get_validator_queryset(self):
+        return Beer.objects.all()
+
+    async def respond(self, request):
+        names = Brewery.objects.order_by('name').values_list('name', flat=True)
+        return Response([name async for name in names.aiterator()])
+
+
+class AsyncBreweryCountView(AsyncReadView):
+    """
+    Async version of counting the breweries.
+    """
+    endpoint = 'number_of_breweries'
+
+    async def respond(self, request):
+        return Response({"count": await Brewery.objects.acount()})
+
+
+class AsyncBeersByBreweryView(AsyncReadView):
+    """
+    Async version of retrieving the beers of a brewery.
+    """
+    endpoint = 'get_beers_by_brewery'
+
+    def get_validator_queryset(self, brewery_name=None):
+        return Beer.objects.filter(brewery=brewery_name)
+
+    def get_count_queryset(self, request, brewery_name=None):
+        return Beer.objects.filter(brewery=brewery_name)
+
+    async def respond(self, request, brewery_name=None):
+        rows = BeerValuesSerializer.values(Beer.objects.filter(brewery=brewery_name))
+        return Response(await BeerValuesSerializer(rows).adata())
@@ -0,0 +1,203 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import authentication, exceptions
+from rest_framework.authtoken.models import Token
+
+from .permissions import EDITOR_FLAG, is_beer_editor
+
+
+class TokenAuthentication(authentication.TokenAuthentication):
+    """
+    Token authentication that loads the user together with their groups.
+
+    The token, the user and the groups are fetched with two queries, so the permission
+    checks of the request run without further queries.
+    """
+
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user').prefetch_related('user__groups').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        return token.user, token
+
+
+class TokenCache:
+    """
+    Two-level cache of authenticated tokens.
+
+    The first level is an in-process LRU map with a short TTL
+    (`BEERS_TOKEN_CACHE_LOCAL_TIMEOUT`, at most `BEERS_TOKEN_CACHE_SIZE` tokens). The second
+    level is the Django cache named by `BEERS_CACHE_ALIAS` with `BEERS_TOKEN_CACHE_TIMEOUT`,
+    which is shared across processes. Invalidation drops both levels of the current process
+    and the shared level; other processes may keep a token for up to the local TTL.
+
+    Entries are keyed on a digest of the token, the token itself is never part of a key or an
+    entry. An entry only holds what authentication needs (see `credentials_data`), no
+    password hash or other user fields.
+
+    Every token has a version that invalidation increments. Entries carry the version that
+    was current before the database was read, entries of an older version are ignored, so a
+    request that read the token just before it was deleted cannot cache it again.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+
+    @property
+    def backend(self):
+        return caches[settings.BEERS_CACHE_ALIAS]
+
+    @staticmethod
+    def key(token_key: str) -> str:
+        return f'beers:token:{hashlib.sha256(token_key.encode("utf-8")).hexdigest()}'
+
+    @staticmethod
+    def version_key(key: str) -> str:
+        return f'{key}:version'
+
+    def get(self, token_key: str):
+        """
+        Look up a token.
+
+        Returns:
+            tuple[dict | None, int]: The cached data or None, and the current version of the
+                token, which `set` requires.
+        """
+        key = self.key(token_key)
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                expires, version, data = entry
+                if expires > now:
+                    self.__entries.move_to_end(key)
+                    return data, version
+                del self.__entries[key]
+
+        version_key = self.version_key(key)
+        values = self.backend.get_many([key, version_key])
+        version = values.get(version_key, 0)
+        entry = values.get(key)
+        if entry is None or entry[0] != version:
+            return None, version
+        self.__remember(key, version, entry[1], now)
+        return entry[1], version
+
+    def set(self, token_key: str, version: int, data) -> None:
+        """
+        Cache a token that was read from the database after `get` returned `version`.
+        """
+        key = self.key(token_key)
+        self.backend.set(key, (version, data), settings.BEERS_TOKEN_CACHE_TIMEOUT)
+        if self.backend.get(self.version_key(key), 0) == version:
+            self.__remember(key, version, data, time.monotonic())
+
+    def invalidate(self, token_keys) -> None:
+        """
+        Drop the given tokens, e.g. after logout or when their user changed.
+        """
+        keys = [self.key(token_key) for token_key in token_keys]
+        for key in keys:
+            version_key = self.version_key(key)
+            try:
+                self.backend.incr(version_key)
+            except ValueError:
+                self.backend.set(version_key, 1, timeout=None)
+        with self.__lock:
+            for key in keys:
+                self.__entries.pop(key, None)
+        self.backend.delete_many(keys)
+
+    def invalidate_on_commit(self, token_keys, using=None) -> None:
+        """
+        Drop the given tokens once the current transaction commits (at once outside of one).
+        """
+        token_keys = list(token_keys)
+        transaction.on_commit(lambda: self.invalidate(token_keys), using=using)
+
+    def clear(self) -> None:
+        """
+        Drop the in-process entries.
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def __remember(self, key, version, data, now) -> None:
+        with self.__lock:
+            self.__entries[key] = (now + settings.BEERS_TOKEN_CACHE_LOCAL_TIMEOUT, version, data)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > settings.BEERS_TOKEN_CACHE_SIZE:
+                self.__entries.popitem(last=False)
+
+
+token_cache = TokenCache()
+
+
+def credentials_data(user, token) -> dict:
+    """
+    What the token cache keeps of an authenticated user: the id and the permission flags.
+    """
+    return {
+        'user_id': user.pk,
+        'is_staff': user.is_staff,
+        'is_superuser': user.is_superuser,
+        'is_editor': is_beer_editor(user),
+    }
+
+
+def credentials_from_data(token_key: str, data: dict):
+    """
+    Rebuild the `(user, token)` pair of a cached token.
+
+    The user only has the cached fields loaded, the others are deferred and read from the
+    database on access.
+    """
+    user = loaded_instance(get_user_model(), {'id': data['user_id'], 'is_active': True,
+                                              'is_staff': data['is_staff'], 'is_superuser': data['is_superuser']})
+    setattr(user, EDITOR_FLAG, data['is_editor'])
+    token = loaded_instance(Token, {'key': token_key, 'user_id': data['user_id']})
+    token.user = user
+    return user, token
+
+
+def loaded_instance(model, values: dict):
+    """
+    A model instance as if loaded from the database with only the given fields.
+    """
+    # from_db expects the values in the order of the model's fields
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+    return model.from_db(None, names, [values[name] for name in names])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication served from the token cache.
+
+    Only the first request of a token queries the database. Deleting a token (which is what
+    logging out through `dj_rest_auth` does) and changes to the user or their groups
+    invalidate the cached token once committed (see beers/signals.py).
+    """
+
+    def authenticate_credentials(self, key):
+        data, version = token_cache.get(key)
+        if data is None:
+            user, token = super().authenticate_credentials(key)
+            data = credentials_data(user, token)
+            token_cache.set(key, version, data)
+
+        # every request gets its own instances
+        return credentials_from_data(key, data)
@@ -0,0 +1,162 @@
+import functools
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .replicas import replica_queries
+
+GENERATION_KEY = 'beers:generation'
+INVALIDATED_KEY = 'beers:invalidated'
+CACHE_HEADER = 'X-Cache'
+
+
+class ResponseCache:
+    """
+    Cache for the serialized data of the read endpoints.
+
+    Entries are keyed on host, path and query string and belong to the current cache
+    generation. Every write bumps the generation, which invalidates all cached responses at
+    once, also across processes that share a cache backend.
+
+    The backend is the Django cache named by `BEERS_CACHE_ALIAS` (local memory by default),
+    entries expire after `BEERS_CACHE_TIMEOUT` seconds.
+
+    A response read from a replica within `BEERS_REPLICA_LAG` seconds of the last invalidation
+    is returned but not cached: the replica may not have replayed the write yet, and its state
+    would stay cached under the new generation.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__hits = Counter()
+        self.__misses = Counter()
+
+    @property
+    def backend(self):
+        return caches[settings.BEERS_CACHE_ALIAS]
+
+    def generation(self) -> int:
+        return self.backend.get_or_set(GENERATION_KEY, 0, timeout=None)
+
+    async def ageneration(self) -> int:
+        return await self.backend.aget_or_set(GENERATION_KEY, 0, timeout=None)
+
+    def invalidate(self) -> None:
+        """
+        Drop all cached responses.
+        """
+        # before the new generation, a response cached under it sees the time of the write
+        self.backend.set(INVALIDATED_KEY, time.time(), timeout=None)
+        try:
+            self.backend.incr(GENERATION_KEY)
+        except ValueError:
+            self.backend.set(GENERATION_KEY, 1, timeout=None)
+
+    def invalidate_on_commit(self, using=None) -> None:
+        """
+        Drop all cached responses once the current transaction commits (at once outside of one).
+
+        Invalidating before the commit would let a concurrent read cache the uncommitted state
+        under the new generation.
+        """
+        transaction.on_commit(self.invalidate, using=using)
+
+    def key(self, request, generation=None) -> str:
+        query = sorted(request.query_params.lists())
+        raw = f'{request.get_host()}{request.path}?{query}'
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        return f'beers:response:{self.generation() if generation is None else generation}:{digest}'
+
+    def fetch(self, endpoint: str, request, compute) -> Response:
+        """
+        Return the cached response for the request or compute and cache it.
+
+        Args:
+            endpoint (str): Name of the endpoint for the hit/miss statistics.
+            request (Request): The incoming HTTP request.
+            compute (Callable[[], Response]): Produces the response on a cache miss.
+
+        Returns:
+            Response: The cached or computed response, marked with an `X-Cache` header.
+        """
+        key = self.key(request)
+        data = self.backend.get(key, self)  # self as sentinel, cached data may be falsy
+        if data is not self:
+            self.__count(self.__hits, endpoint)
+            return Response(data, status=status.HTTP_200_OK, headers={CACHE_HEADER: 'HIT'})
+
+        self.__count(self.__misses, endpoint)
+        replica_queries_before = replica_queries()
+        response = compute()
+        if response.status_code == status.HTTP_200_OK and (
+                replica_queries() == replica_queries_before
+                or self.__replicas_caught_up(self.backend.get(INVALIDATED_KEY, 0))):
+            self.backend.set(key, response.data, settings.BEERS_CACHE_TIMEOUT)
+        response[CACHE_HEADER] = 'MISS'
+        return response
+
+    async def afetch(self, endpoint: str, request, compute) -> Response:
+        """
+        Async version of `fetch`, `compute` is a coroutine function.
+        """
+        key = self.key(request, await self.ageneration())
+        data = await self.backend.aget(key, self)
+        if data is not self:
+            self.__count(self.__hits, endpoint)
+            return Response(data, status=status.HTTP_200_OK, headers={CACHE_HEADER: 'HIT'})
+
+        self.__count(self.__misses, endpoint)
+        replica_queries_before = replica_queries()
+        response = await compute()
+        if response.status_code == status.HTTP_200_OK and (
+                replica_queries() == replica_queries_before
+                or self.__replicas_caught_up(await self.backend.aget(INVALIDATED_KEY, 0))):
+            await self.backend.aset(key, response.data, settings.BEERS_CACHE_TIMEOUT)
+        response[CACHE_HEADER] = 'MISS'
+        return response
+
+    def stats(self) -> dict:
+        """
+        Hit and miss counters per endpoint since process start.
+        """
+        with self.__lock:
+            endpoints = set(self.__hits) | set(self.__misses)
+            return {endpoint: {'hits': self.__hits[endpoint], 'misses': self.__misses[endpoint]}
+                    for endpoint in sorted(endpoints)}
+
+    def reset_stats(self) -> None:
+        with self.__lock:
+            self.__hits.clear()
+            self.__misses.clear()
+
+    @staticmethod
+    def __replicas_caught_up(invalidated: float) -> bool:
+        return time.time() - invalidated >= settings.BEERS_REPLICA_LAG
+
+    def __count(self, counter: Counter, endpoint: str) -> None:
+        with self.__lock:
+            counter[endpoint] += 1
+
+
+response_cache = ResponseCache()
+
+
+def cache_response(method):
+    """
+    Serve a read action of a ViewSet from the response cache.
+
+    The action runs after authentication and permission checks, so only authorized requests
+    are answered from the cache.
+    """
+    @functools.wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        return response_cache.fetch(view.action or method.__name__, request,
+                                    lambda: method(view, request, *args, **kwargs))
+    return wrapper
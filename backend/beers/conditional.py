@@ -0,0 +1,84 @@
+import functools
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+VALIDATOR_AGGREGATES = {'count': Count('id'), 'last_modified': Max('updated_at')}
+
+
+def compute_validators(request, queryset):
+    """
+    Compute the ETag and Last-Modified validators of the beers in a queryset.
+
+    Costs a single aggregate query. The ETag covers the number of beers as well as the latest
+    `updated_at`, so deletes change it too, while Last-Modified only moves with saved beers.
+    Clients should therefore prefer `If-None-Match`, which takes precedence over
+    `If-Modified-Since`.
+
+    Args:
+        request (Request): The incoming HTTP request, the ETag is specific to its path and query.
+        queryset (QuerySet): The beers that make up the response.
+
+    Returns:
+        tuple[str, int | None]: The weak ETag and the Last-Modified timestamp.
+    """
+    return validators_from_aggregate(request, queryset.aggregate(**VALIDATOR_AGGREGATES))
+
+
+async def acompute_validators(request, queryset):
+    """
+    Async version of `compute_validators`.
+    """
+    return validators_from_aggregate(request, await queryset.aaggregate(**VALIDATOR_AGGREGATES))
+
+
+def validators_from_aggregate(request, aggregate):
+    last_modified = aggregate['last_modified']
+    query = sorted(request.query_params.lists())
+    raw = f"{request.path}?{query}|{aggregate['count']}|{last_modified.isoformat() if last_modified else ''}"
+    etag = 'W/' + quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+    return etag, int(last_modified.timestamp()) if last_modified else None
+
+
+def conditional_response(get_queryset):
+    """
+    Answer conditional GET requests of a read action with `304 Not Modified`.
+
+    Args:
+        get_queryset (Callable): Called with the view and the action arguments, returns
+            the beers that make up the response.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            try:
+                etag, last_modified = compute_validators(request, get_queryset(view, *args, **kwargs))
+            except (ValueError, ValidationError):
+                # invalid lookup values, e.g. a non-numeric id; the action answers with an error
+                return method(view, request, *args, **kwargs)
+
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+
+            return set_validators(method(view, request, *args, **kwargs), etag, last_modified)
+        return wrapper
+    return decorator
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Return the `304 Not Modified` response if the client's validators match, None otherwise.
+    """
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified):
+    if 200 <= response.status_code < 300:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+    return response
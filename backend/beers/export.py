@@ -0,0 +1,48 @@
+import csv
+import json
+
+from django.conf import settings
+from django.utils import timezone
+
+from .serializers import BeerValuesSerializer
+
+EXPORT_FIELDS = BeerValuesSerializer.fields
+
+
+class Echo:
+    """
+    File-like object that hands written lines back instead of buffering them.
+    """
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """
+    Stream the beers of a queryset as dicts, formatted like the REST API formats them.
+
+    Rows are read as plain values in chunks of `BEERS_EXPORT_CHUNK_SIZE`, so memory stays
+    flat regardless of the number of beers.
+
+    Args:
+        queryset (QuerySet): The beers to export.
+
+    Returns:
+        Iterator[dict]: One dict per beer.
+    """
+    time_zone = timezone.get_current_timezone() if settings.USE_TZ else None
+    rows = BeerValuesSerializer.values(queryset.order_by('id')).iterator(chunk_size=settings.BEERS_EXPORT_CHUNK_SIZE)
+    for row in rows:
+        yield BeerValuesSerializer.to_representation(row, time_zone)
+
+
+def stream_ndjson(queryset):
+    for row in export_rows(queryset):
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def stream_csv(queryset):
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+    for row in export_rows(queryset):
+        yield writer.writerow(row)
@@ -0,0 +1,101 @@
+import decimal
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+# Orderings of the beer list: query value -> order_by fields, unique through the id
+BEER_ORDERINGS = {
+    'id': ('id',),
+    'created_at': ('created_at', 'id'),
+    'name': ('name', 'id'),
+    'alcohol_content': ('alcohol_content', 'id'),
+    '-alcohol_content': ('-alcohol_content', '-id'),
+}
+ORDERING_PARAM = 'ordering'
+
+
+def get_ordering(request, default='id'):
+    """
+    Resolve the `ordering` query parameter of a beer list request.
+
+    Returns:
+        tuple[str, ...]: The order_by fields.
+    """
+    ordering = request.query_params.get(ORDERING_PARAM, default)
+    if ordering not in BEER_ORDERINGS:
+        allowed = ", ".join(BEER_ORDERINGS)
+        raise ValidationError({ORDERING_PARAM: f"Ordering must be one of the following: {allowed}."})
+    return BEER_ORDERINGS[ordering]
+
+
+def parse_decimal(request, param):
+    value = request.query_params.get(param)
+    if value is None:
+        return None
+    try:
+        parsed = decimal.Decimal(value.strip())
+    except decimal.InvalidOperation:
+        parsed = None
+    if parsed is None or not parsed.is_finite():
+        raise ValidationError({param: "A valid number is required."})
+    return parsed
+
+
+class BeerFilterBackend(BaseFilterBackend):
+    """
+    Filters and orders the beer list by query parameters.
+
+    - `abv_min`, `abv_max`: inclusive range of the alcohol content.
+    - `beer_type`, `brewery`: exact matches.
+    - `ordering`: one of `BEER_ORDERINGS`, the list is ordered by id by default.
+
+    Every filter and ordering is backed by an index of the beers table.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        abv_min = parse_decimal(request, 'abv_min')
+        if abv_min is not None:
+            queryset = queryset.filter(alcohol_content__gte=abv_min)
+
+        abv_max = parse_decimal(request, 'abv_max')
+        if abv_max is not None:
+            queryset = queryset.filter(alcohol_content__lte=abv_max)
+
+        for field in ('beer_type', 'brewery'):
+            value = request.query_params.get(field)
+            if value is not None:
+                queryset = queryset.filter(**{field: value})
+
+        return queryset.order_by(*get_ordering(request))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': 'abv_min',
+                'required': False,
+                'in': 'query',
+                'description': 'Minimum alcohol content (inclusive).',
+                'schema': {'type': 'number'},
+            },
+            {
+                'name': 'abv_max',
+                'required': False,
+                'in': 'query',
+                'description': 'Maximum alcohol content (inclusive).',
+                'schema': {'type': 'number'},
+            },
+            {
+                'name': 'beer_type',
+                'required': False,
+                'in': 'query',
+                'description': 'Only beers of this type.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': 'brewery',
+                'required': False,
+                'in': 'query',
+                'description': 'Only beers of this brewery.',
+                'schema': {'type': 'string'},
+            },
+        ]
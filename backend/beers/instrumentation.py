@@ -0,0 +1,279 @@
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = 'Server-Timing'
+UNMATCHED_ENDPOINT = 'unmatched'
+
+# Measurements of the request being handled, also visible in the threads of sync_to_async
+current_metrics = contextvars.ContextVar('beers_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Measurements of a single request: database queries and time, serialization time.
+
+    Queries are counted per SQL statement, parameters are not part of the statement, so the
+    same query repeated with different values (an N+1 pattern) shows up as one statement.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+        self.statements = Counter()
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        The queries executed at least `threshold` times, most frequent first.
+
+        Only reads count, batched writes (e.g. `bulk_create`) legitimately repeat a statement.
+        """
+        return [(sql, count) for sql, count in self.statements.most_common()
+                if count >= threshold and sql.lstrip()[:6].upper() == 'SELECT']
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper that adds every query to the metrics of the current request.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.query_count += 1
+        metrics.db_time += time.perf_counter() - started
+        metrics.statements[sql] += 1
+
+
+def install_query_recorder(connection) -> None:
+    """
+    Register `record_query` on a database connection, once.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextlib.contextmanager
+def measure_serialization():
+    """
+    Add the time spent in the block to the serialization time of the current request.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialization_time += time.perf_counter() - started
+
+
+# Exported totals per endpoint: field -> (metric name, help text)
+ENDPOINT_METRICS = {
+    'requests': ('beers_http_requests_total', 'Handled requests.'),
+    'duration': ('beers_http_request_duration_seconds_total', 'Wall time spent handling requests.'),
+    'db_queries': ('beers_db_queries_total', 'Database queries.'),
+    'db_duration': ('beers_db_query_duration_seconds_total', 'Time spent in database queries.'),
+    'serialization_duration': ('beers_serialization_duration_seconds_total', 'Time spent rendering responses.'),
+    'response_bytes': ('beers_http_response_bytes_total', 'Size of the response bodies.'),
+    'nplusone': ('beers_nplusone_detections_total', 'Requests with a repeated query (N+1 pattern).'),
+}
+
+
+class EndpointMetrics:
+    """
+    Totals of the request measurements per endpoint and method since process start.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__totals = defaultdict(Counter)
+
+    def record(self, endpoint: str, method: str, values: dict) -> None:
+        with self.__lock:
+            self.__totals[(endpoint, method)].update(values)
+
+    def snapshot(self) -> dict:
+        with self.__lock:
+            return {key: dict(totals) for key, totals in self.__totals.items()}
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.__totals.clear()
+
+
+endpoint_metrics = EndpointMetrics()
+
+
+def prometheus_text() -> str:
+    """
+    The endpoint metrics and the response cache statistics in the Prometheus text format.
+    """
+    lines = []
+    snapshot = sorted(endpoint_metrics.snapshot().items())
+    for field, (name, description) in ENDPOINT_METRICS.items():
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} counter']
+        for (endpoint, method), totals in snapshot:
+            lines.append(f'{name}{{endpoint="{escape_label(endpoint)}",method="{method}"}} {totals.get(field, 0)}')
+
+    cache_stats = response_cache.stats()
+    for field in ('hits', 'misses'):
+        name = f'beers_response_cache_{field}_total'
+        lines += [f'# HELP {name} Response cache {field}.', f'# TYPE {name} counter']
+        for endpoint, counts in cache_stats.items():
+            lines.append(f'{name}{{endpoint="{escape_label(endpoint)}"}} {counts[field]}')
+    return '\n'.join(lines) + '\n'
+
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class InstrumentationMiddleware:
+    """
+    Measure every request and report where the time went.
+
+    Records wall time, number and duration of the database queries, serialization time and
+    response size. The measurements of a request are sent in the `Server-Timing` header
+    (`BEERS_SERVER_TIMING`), totals per endpoint are exported in the Prometheus format (see
+    `MetricsView`). Queries executed `BEERS_NPLUSONE_THRESHOLD` times or more within a request
+    are logged as N+1 patterns.
+
+    Streamed responses (e.g. the export) run their queries while the body is sent, after the
+    headers. They are measured until the stream ends or is closed and carry no `Server-Timing`
+    header, which could only report the time before the first row.
+
+    Place it first in `MIDDLEWARE` to measure the other middleware as well.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.ameasure_stream(request, response.streaming_content, metrics)
+            else:
+                response.streaming_content = self.measure_stream(request, response.streaming_content, metrics)
+            return response
+
+        duration = self.record(request, metrics, len(response.content))
+        if settings.BEERS_SERVER_TIMING:
+            response[SERVER_TIMING_HEADER] = (
+                f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.query_count} queries", '
+                f'serialize;dur={metrics.serialization_time * 1000:.2f}, '
+                f'total;dur={duration * 1000:.2f}'
+            )
+        return response
+
+    def measure_stream(self, request, content, metrics):
+        """
+        Pass the chunks of a streamed response through, measuring their production.
+        """
+        content = iter(content)
+        size = 0
+        try:
+            while True:
+                token = current_metrics.set(metrics)
+                try:
+                    chunk = next(content, None)
+                finally:
+                    current_metrics.reset(token)
+                if chunk is None:
+                    return
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.record(request, metrics, size)
+
+    async def ameasure_stream(self, request, content, metrics):
+        """
+        Async version of `measure_stream`.
+        """
+        content = aiter(content)
+        size = 0
+        try:
+            while True:
+                token = current_metrics.set(metrics)
+                try:
+                    chunk = await anext(content, None)
+                finally:
+                    current_metrics.reset(token)
+                if chunk is None:
+                    return
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.record(request, metrics, size)
+
+    def record(self, request, metrics, size: int) -> float:
+        """
+        Add the measurements of a handled request to the endpoint totals.
+
+        Returns:
+            float: The wall time of the request in seconds.
+        """
+        duration = time.perf_counter() - metrics.started
+        endpoint = request.resolver_match.view_name if request.resolver_match else UNMATCHED_ENDPOINT
+
+        repeated = metrics.repeated_statements(settings.BEERS_NPLUSONE_THRESHOLD) \
+            if settings.BEERS_NPLUSONE_THRESHOLD else []
+        for sql, count in repeated:
+            logger.warning("N+1 query pattern in %s %s (%s): %d executions of %s",
+                           request.method, request.path, endpoint, count, sql)
+
+        endpoint_metrics.record(endpoint, request.method, {
+            'requests': 1,
+            'duration': duration,
+            'db_queries': metrics.query_count,
+            'db_duration': metrics.db_time,
+            'serialization_duration': metrics.serialization_time,
+            'response_bytes': size,
+            'nplusone': 1 if repeated else 0,
+        })
+        return duration
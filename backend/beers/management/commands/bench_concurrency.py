@@ -0,0 +1,130 @@
+import random
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection, connections
+
+from beers.cache import response_cache
+from beers.models import Beer, Brewery
+from beers.serializers import BeerValuesSerializer
+
+BENCHMARK_BREWERY = 'Concurrency Benchmark Brewery'
+
+
+class Command(BaseCommand):
+    help = (
+        "Run mixed reads and writes from several threads against the configured database and "
+        "report the throughput and latencies. The benchmark beers are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help="Number of concurrent clients.")
+        parser.add_argument('--seconds', type=float, default=10.0, help="Duration of the benchmark.")
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help="Share of the operations that write, between 0 and 1.")
+
+    def handle(self, *args, **options):
+        if options['threads'] < 1 or options['seconds'] <= 0 or not 0 <= options['write_ratio'] <= 1:
+            raise CommandError("--threads and --seconds must be positive, --write-ratio between 0 and 1.")
+
+        settings_dict = connection.settings_dict
+        self.stdout.write(f"Database: {settings_dict['ENGINE']} {settings_dict['NAME']}, "
+                          f"CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']}, OPTIONS={settings_dict['OPTIONS']}")
+
+        stop = time.perf_counter() + options['seconds']
+        latencies = {'read': [], 'write': []}
+        errors = Counter()
+        lock = threading.Lock()
+
+        def client(number):
+            rng = random.Random(number)
+            sequence = 0
+            try:
+                while time.perf_counter() < stop:
+                    kind = 'write' if rng.random() < options['write_ratio'] else 'read'
+                    started = time.perf_counter()
+                    try:
+                        if kind == 'write':
+                            sequence += 1
+                            write(number, sequence, rng)
+                        else:
+                            read(rng)
+                    except OperationalError as e:
+                        with lock:
+                            errors[str(e)] += 1
+                        continue
+                    with lock:
+                        latencies[kind].append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=client, args=(number,)) for number in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        try:
+            self.report(latencies, errors, elapsed, options['threads'])
+        finally:
+            Beer.objects.filter(brewery=BENCHMARK_BREWERY).delete()
+            Brewery.objects.recount([BENCHMARK_BREWERY])
+            response_cache.invalidate_on_commit()
+
+    def report(self, latencies, errors, elapsed, threads):
+        total = sum(len(values) for values in latencies.values())
+        self.stdout.write(f"{total} operations from {threads} threads in {elapsed:.1f}s "
+                          f"({total / elapsed:.0f} ops/s)")
+        for kind, values in latencies.items():
+            if not values:
+                continue
+            values.sort()
+            self.stdout.write(
+                f"  {kind:<5} {len(values):7d} ops  "
+                f"p50 {percentile(values, 50) * 1000:7.2f} ms  "
+                f"p95 {percentile(values, 95) * 1000:7.2f} ms  "
+                f"p99 {percentile(values, 99) * 1000:7.2f} ms"
+            )
+        for message, count in errors.most_common():
+            self.stdout.write(self.style.WARNING(f"  {count} failed: {message}"))
+
+
+def read(rng):
+    close_old_connections()
+    queryset = Beer.objects.all()
+    if rng.random() < 0.5:
+        queryset = queryset.filter(brewery=BENCHMARK_BREWERY)
+    rows = BeerValuesSerializer.values(queryset.order_by('-id')[:50])
+    return BeerValuesSerializer(rows).data
+
+
+def write(number, sequence, rng):
+    close_old_connections()
+    beer = Beer(name=f'Benchmark Beer {letters(number)} {letters(sequence)}', brewery=BENCHMARK_BREWERY,
+                description='Written by the concurrency benchmark.',
+                alcohol_content=rng.randint(0, 120) / 10, beer_type='Pale Lager')
+    beer.save()
+    if rng.random() < 0.5:
+        beer.description = 'Updated by the concurrency benchmark.'
+        beer.save()
+
+
+def letters(number: int) -> str:
+    """
+    Spell a number with capital letters, beer names must not contain digits.
+    """
+    result = ''
+    while True:
+        number, remainder = divmod(number, 26)
+        result = chr(ord('A') + remainder) + result
+        if number == 0:
+            return result
+
+
+def percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
@@ -0,0 +1,61 @@
+import decimal
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from beers.models import Beer
+from beers.renderers import FastJSONRenderer, orjson
+from beers.serializers import BeerSerializer, BeerValuesSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the beer list serializer with the values fast path. "
+        "The benchmark beers are inserted in a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--beers', type=int, default=5000, help="Number of beers to serialize.")
+        parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs, the best run counts.")
+
+    def handle(self, *args, **options):
+        if options['beers'] < 1 or options['repeat'] < 1:
+            raise CommandError("--beers and --repeat must be positive.")
+
+        try:
+            with transaction.atomic():
+                Beer.objects.bulk_create(
+                    Beer(name=f'Benchmark Beer {i}', brewery=f'Benchmark Brewery {i % 50}',
+                         description='Crisp and refreshing with a hint of citrus.',
+                         alcohol_content=decimal.Decimal(i % 150) / 10, beer_type='Lager')
+                    for i in range(options['beers'])
+                )
+                self.run_benchmark(Beer.objects.filter(name__startswith='Benchmark Beer '), options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run_benchmark(self, queryset, repeat):
+        def serializer():
+            return JSONRenderer().render(BeerSerializer(queryset.all(), many=True).data)
+
+        def fast_path():
+            return FastJSONRenderer().render(BeerValuesSerializer(BeerValuesSerializer.values(queryset.all())).data)
+
+        if serializer() != fast_path():
+            raise CommandError("The fast path output differs from the serializer output.")
+
+        count = queryset.count()
+        baseline = min(timeit.repeat(serializer, number=1, repeat=repeat))
+        fast = min(timeit.repeat(fast_path, number=1, repeat=repeat))
+        self.stdout.write(f"Serialized {count} beers, best of {repeat} runs"
+                          f" ({'orjson' if orjson else 'json'} encoder):")
+        self.stdout.write(f"  BeerSerializer + JSONRenderer:           {baseline * 1000:8.1f} ms")
+        self.stdout.write(f"  BeerValuesSerializer + FastJSONRenderer: {fast * 1000:8.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Speedup: {baseline / fast:.1f}x"))
@@ -0,0 +1,74 @@
+import timeit
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from beers.models import Beer
+from beers.validation.validators import (
+    validate_many,
+    validate_title,
+    validate_brewery,
+    validate_description,
+    validate_alcohol_content,
+    validate_beer_type,
+    to_decimal,
+)
+
+BENCHMARK_ROWS = [
+    {'name': 'Benchmark Lager', 'brewery': 'Benchmark Brewery',
+     'description': 'Crisp and refreshing, with a hint of citrus; brewed since 1888!',
+     'alcohol_content': '5.20', 'beer_type': 'Pale Lager'},
+    {'name': 'Benchmark Zero', 'brewery': 'Benchmark Brewery', 'description': 'Alcohol-free.',
+     'alcohol_content': '0.00', 'beer_type': 'Alcohol-Free Lager'},
+    {'name': 'benchmark invalid', 'brewery': 'Benchmark Brewery', 'description': '<b>Invalid</b>',
+     'alcohol_content': '80', 'beer_type': 'Unknown'},
+]
+
+
+def validate_instances(rows):
+    """
+    The per instance validation of the Beer model, as used before `validate_many`.
+    """
+    for row in rows:
+        beer = Beer(**row)
+        try:
+            beer.clean_fields()
+            beer.clean()
+        except ValidationError:
+            pass
+
+
+class Command(BaseCommand):
+    help = "Measure the per-row cost of validating beers with the rule table and with model instances."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=30000, help="Number of rows validated per run.")
+        parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs, the best run counts.")
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+
+        rows = (BENCHMARK_ROWS * (options['rows'] // len(BENCHMARK_ROWS) + 1))[:options['rows']]
+        row = BENCHMARK_ROWS[0]
+        single = {
+            'validate_title': lambda: validate_title(row['name']),
+            'validate_brewery': lambda: validate_brewery(row['brewery']),
+            'validate_description': lambda: validate_description(row['description']),
+            'validate_alcohol_content': lambda: validate_alcohol_content(to_decimal(row['alcohol_content'])),
+            'validate_beer_type': lambda: validate_beer_type(row['beer_type']),
+        }
+
+        self.stdout.write(f"Per-row cost, best of {options['repeat']} runs:")
+        for label, function in single.items():
+            self.report(label, lambda: [function() for _ in rows], len(rows), options['repeat'])
+
+        baseline = self.report('Beer.clean_fields + Beer.clean', lambda: validate_instances(rows),
+                               len(rows), options['repeat'])
+        fast = self.report('validate_many', lambda: validate_many(rows), len(rows), options['repeat'])
+        self.stdout.write(self.style.SUCCESS(f"Speedup of validate_many: {baseline / fast:.1f}x"))
+
+    def report(self, label, function, count, repeat):
+        per_row = min(timeit.repeat(function, number=1, repeat=repeat)) / count
+        self.stdout.write(f"  {label:<32} {per_row * 1e6:8.2f} µs")
+        return per_row
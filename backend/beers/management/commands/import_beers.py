@@ -0,0 +1,162 @@
+import csv
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+
+from beers.cache import response_cache
+from beers.models import Beer, Brewery
+from beers.validation.validators import validate_many
+
+DUPLICATE_ERROR = "The fields name, brewery, beer_type must make a unique set."
+
+
+class Command(BaseCommand):
+    help = (
+        "Import beers from a CSV or NDJSON file (e.g. an export of /api/v1/beers/export/). "
+        "Rows are validated and inserted in batches, invalid and duplicate rows are rejected."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, '-' reads standard input.")
+        parser.add_argument('--format', choices=['csv', 'ndjson'],
+                            help="Input format, derived from the file extension by default.")
+        parser.add_argument('--batch-size', type=int, default=settings.BEERS_BULK_BATCH_SIZE,
+                            help="Number of rows validated and inserted together.")
+        parser.add_argument('--rejects',
+                            help="Write the rejected rows with their errors to this NDJSON file.")
+
+    def handle(self, *args, **options):
+        input_format = options['format'] or Path(options['path']).suffix.lstrip('.').lower()
+        if input_format not in ('csv', 'ndjson'):
+            raise CommandError("Cannot derive the input format, use --format csv|ndjson.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        self.verbosity = options['verbosity']
+        rejects_file = open(options['rejects'], 'w', encoding='utf-8') if options['rejects'] else None
+        source = sys.stdin if options['path'] == '-' else open(options['path'], encoding='utf-8', newline='')
+
+        imported = rejected = 0
+        started = time.perf_counter()
+        try:
+            rows = read_csv(source) if input_format == 'csv' else read_ndjson(source)
+            while batch := list(itertools.islice(rows, options['batch_size'])):
+                # every batch commits with its brewery counts, readers never see them out of sync
+                with transaction.atomic():
+                    beers, rejects = insert_batch(batch, options['batch_size'])
+                    if beers:
+                        Brewery.objects.recount({beer.brewery for beer in beers})
+                        response_cache.invalidate_on_commit()
+
+                imported += len(beers)
+                rejected += len(rejects)
+                for reject in rejects:
+                    self.report_reject(reject, rejects_file)
+                if self.verbosity >= 2:
+                    self.stdout.write(f"{imported + rejected} rows processed")
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if rejects_file:
+                rejects_file.close()
+
+        elapsed = time.perf_counter() - started
+        rate = (imported + rejected) / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} beers, rejected {rejected} rows in {elapsed:.2f}s ({rate:.0f} rows/s)."
+        ))
+
+    def report_reject(self, reject, rejects_file):
+        if rejects_file:
+            rejects_file.write(json.dumps(reject, ensure_ascii=False, default=str) + '\n')
+        if self.verbosity >= 2:
+            self.stderr.write(f"Line {reject['line']}: {reject['errors']}")
+
+
+def read_csv(source):
+    """
+    Yield (line, row) pairs of a CSV file with a header row.
+    """
+    reader = csv.DictReader(source)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson(source):
+    """
+    Yield (line, row) pairs of a newline delimited JSON file, undecodable lines as None.
+    """
+    for line, text in enumerate(source, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except json.JSONDecodeError:
+            row = None
+        yield line, row if isinstance(row, dict) else None
+
+
+def insert_batch(batch, batch_size):
+    """
+    Validate a batch of rows and insert the valid beers.
+
+    A beer that another writer inserts between the duplicate check and the insert fails the
+    insert on the unique constraint. The batch is then checked again, which rejects the rows
+    that conflict as duplicates, and inserted without them.
+
+    Returns:
+        tuple[list[Beer], list[dict]]: The inserted beers and the rejected rows with their errors.
+    """
+    while True:
+        beers, rejects = validate_batch(batch)
+        try:
+            with transaction.atomic():
+                Beer.objects.bulk_create(beers, batch_size=batch_size)
+            return beers, rejects
+        except IntegrityError:
+            if not Beer.objects.existing_keys([(beer.name, beer.brewery, beer.beer_type) for beer in beers]):
+                raise
+
+
+def validate_batch(batch):
+    """
+    Validate a batch of rows with the rules of the Beer model.
+
+    Checks the rows with the rule table of the beer fields (`validate_many`) and rejects rows
+    that duplicate another row of the batch or an existing beer, using one query per batch.
+
+    Args:
+        batch (list[tuple[int, dict | None]]): (line, row) pairs.
+
+    Returns:
+        tuple[list[Beer], list[dict]]: The valid beers and the rejected rows with their errors.
+    """
+    rows = [(line, row) for line, row in batch if row is not None]
+    rejects = [{'line': line, 'row': None, 'errors': {'__all__': ["Not a JSON object."]}}
+               for line, row in batch if row is None]
+    candidates = []
+    for (line, row), (values, errors) in zip(rows, validate_many(row for _, row in rows)):
+        if errors:
+            rejects.append({'line': line, 'row': row, 'errors': errors})
+        else:
+            candidates.append((line, row, Beer(**values)))
+
+    keys = [(beer.name, beer.brewery, beer.beer_type) for _, _, beer in candidates]
+    existing = Beer.objects.existing_keys(keys)
+    seen = set()
+    beers = []
+    for key, (line, row, beer) in zip(keys, candidates):
+        if key in existing or key in seen:
+            rejects.append({'line': line, 'row': row, 'errors': {'__all__': [DUPLICATE_ERROR]}})
+        else:
+            beers.append(beer)
+        seen.add(key)
+
+    rejects.sort(key=lambda reject: reject['line'])
+    return beers, rejects
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:27
+
+import beers.validation.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Beer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='The name of the beer (capitalized)', max_length=100, validators=[beers.validation.validators.validate_title])),
+                ('brewery', models.CharField(help_text='Name of the brewery', max_length=100, validators=[beers.validation.validators.validate_brewery])),
+                ('description', models.TextField(help_text='A description of the beer', validators=[beers.validation.validators.validate_description])),
+                ('alcohol_content', models.DecimalField(decimal_places=2, help_text='Alcohol by volume percentage (0.00 to 75.00).', max_digits=5, validators=[beers.validation.validators.validate_alcohol_content])),
+                ('beer_type', models.CharField(help_text='Type of the beer', max_length=100, validators=[beers.validation.validators.validate_beer_type])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('name', 'brewery', 'beer_type'), name='unique_beer_constraint')],
+            },
+        ),
+    ]
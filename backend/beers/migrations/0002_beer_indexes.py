@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:27
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='beer',
+            index=models.Index(fields=['brewery'], name='beer_brewery_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='beer',
+            index=models.Index(fields=['brewery', 'name'], name='beer_brewery_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='beer',
+            index=models.Index(fields=['beer_type'], name='beer_beer_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='beer',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='beer_lower_name_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+# External-content FTS5 index over beers_beer(name, description), kept in sync by triggers
+# so that every write path (ORM saves, bulk inserts, raw SQL) updates the index.
+CREATE_SEARCH_INDEX = [
+    """
+    CREATE VIRTUAL TABLE beers_beer_fts USING fts5(
+        name, description,
+        content='beers_beer', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER beers_beer_fts_insert AFTER INSERT ON beers_beer BEGIN
+        INSERT INTO beers_beer_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER beers_beer_fts_delete AFTER DELETE ON beers_beer BEGIN
+        INSERT INTO beers_beer_fts(beers_beer_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER beers_beer_fts_update AFTER UPDATE OF name, description ON beers_beer BEGIN
+        INSERT INTO beers_beer_fts(beers_beer_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO beers_beer_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO beers_beer_fts(beers_beer_fts) VALUES ('rebuild')",
+]
+
+DROP_SEARCH_INDEX = [
+    "DROP TRIGGER IF EXISTS beers_beer_fts_update",
+    "DROP TRIGGER IF EXISTS beers_beer_fts_delete",
+    "DROP TRIGGER IF EXISTS beers_beer_fts_insert",
+    "DROP TABLE IF EXISTS beers_beer_fts",
+]
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0002_beer_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_sqlite(CREATE_SEARCH_INDEX), run_on_sqlite(DROP_SEARCH_INDEX)),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:29
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_breweries(apps, schema_editor):
+    Beer = apps.get_model('beers', 'Beer')
+    Brewery = apps.get_model('beers', 'Brewery')
+    counts = Beer.objects.values('brewery').annotate(beer_count=Count('id')).order_by()
+    Brewery.objects.bulk_create(Brewery(name=row['brewery'], beer_count=row['beer_count']) for row in counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0003_beer_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Brewery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('beer_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'breweries',
+            },
+        ),
+        migrations.RunPython(populate_breweries, migrations.RunPython.noop),
+    ]
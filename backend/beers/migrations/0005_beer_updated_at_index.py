@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0004_brewery'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='beer',
+            index=models.Index(fields=['updated_at'], name='beer_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beers', '0005_beer_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='beer',
+            index=models.Index(fields=['alcohol_content'], name='beer_alcohol_content_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='beer',
+            index=models.Index(fields=['name'], name='beer_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='beer',
+            index=models.Index(fields=['created_at'], name='beer_created_at_idx'),
+        ),
+    ]
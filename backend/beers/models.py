@@ -1,14 +1,45 @@
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Lower
+from .validation.validation_constants import ALCOHOL_CONTENT_MAX_DIGITS, ALCOHOL_CONTENT_DECIMAL_PLACES
 from .validation.validators import (
     validate_title,
     validate_brewery,
     validate_description,
     validate_alcohol_content,
-    validate_beer_type
+    validate_beer_type,
+    validate_row,
 )
 
 
+class BeerQuerySet(models.QuerySet):
+    def existing_keys(self, keys, exclude_ids=()) -> set:
+        """
+        Look up which keys of the unique beer constraint are already taken.
+
+        Runs one query per `BEERS_BULK_BATCH_SIZE` keys instead of one per beer.
+
+        Args:
+            keys (Sequence[tuple[str, str, str]]): (name, brewery, beer_type) keys to look up.
+            exclude_ids (Iterable[int]): Beers to ignore, e.g. the ones being updated.
+
+        Returns:
+            set[tuple[str, str, str]]: The keys that already exist.
+        """
+        existing = set()
+        for start in range(0, len(keys), settings.BEERS_BULK_BATCH_SIZE):
+            chunk = set(keys[start:start + settings.BEERS_BULK_BATCH_SIZE])
+            candidates = self.filter(
+                name__in={key[0] for key in chunk},
+                brewery__in={key[1] for key in chunk},
+                beer_type__in={key[2] for key in chunk},
+            ).exclude(id__in=exclude_ids).values_list('name', 'brewery', 'beer_type')
+            existing.update(candidate for candidate in candidates if candidate in chunk)
+        return existing
+
+
 class Beer(models.Model):
     name = models.CharField(
         max_length=100,
@@ -25,8 +56,8 @@ class Beer(models.Model):
         help_text="A description of the beer"
     )
     alcohol_content = models.DecimalField(
-        max_digits=5,
-        decimal_places=2,
+        max_digits=ALCOHOL_CONTENT_MAX_DIGITS,
+        decimal_places=ALCOHOL_CONTENT_DECIMAL_PLACES,
         validators=[validate_alcohol_content],
         help_text="Alcohol by volume percentage (0.00 to 75.00)."
     )
@@ -39,19 +70,37 @@ class Beer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BeerQuerySet.as_manager()
+
 
     def clean(self):
         super().clean()
 
-        if self.beer_type.startswith("Non-Alcoholic") and self.alcohol_content > 0.5:
-            raise ValidationError({
-                'alcohol_content': "Non-Alcoholic beer must not have more than 0.5% alcohol content."
-            })
+        errors = validate_row({'beer_type': self.beer_type, 'alcohol_content': self.alcohol_content})
+        if errors:
+            raise ValidationError(errors)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember the stored brewery to move the beer between breweries on update
+        instance._loaded_brewery = instance.__dict__.get('brewery')
+        return instance
 
-        if self.beer_type.startswith("Alcohol-Free") and self.alcohol_content > 0.0:
-            raise ValidationError({
-                'alcohol_content': "Alcohol-Free beers must have 0.0% alcohol content."
-            })
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'brewery' not in update_fields:
+            # the stored brewery does not change
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic(using=kwargs.get('using')):
+            previous_brewery = None if self._state.adding else getattr(self, '_loaded_brewery', None)
+            super().save(*args, **kwargs)
+            if previous_brewery != self.brewery:
+                if previous_brewery is not None:
+                    Brewery.objects.remove_beer(previous_brewery)
+                Brewery.objects.add_beer(self.brewery)
+            self._loaded_brewery = self.brewery
 
     def __str__(self):
         return self.name
@@ -63,3 +112,70 @@ class Beer(models.Model):
                 name='unique_beer_constraint'
             )
         ]
+        indexes = [
+            # filter by brewery and DISTINCT over breweries
+            models.Index(fields=['brewery'], name='beer_brewery_idx'),
+            # beers of a brewery in name order
+            models.Index(fields=['brewery', 'name'], name='beer_brewery_name_idx'),
+            models.Index(fields=['beer_type'], name='beer_beer_type_idx'),
+            # case-insensitive name lookups
+            models.Index(Lower('name'), name='beer_lower_name_idx'),
+            # latest change for ETag / Last-Modified
+            models.Index(fields=['updated_at'], name='beer_updated_at_idx'),
+            # orderings and range filters of the beer list, ties are broken by the id
+            models.Index(fields=['alcohol_content'], name='beer_alcohol_content_idx'),
+            models.Index(fields=['name'], name='beer_name_idx'),
+            models.Index(fields=['created_at'], name='beer_created_at_idx'),
+        ]
+
+
+class BreweryManager(models.Manager):
+    def add_beer(self, name: str) -> None:
+        brewery, created = self.get_or_create(name=name, defaults={'beer_count': 1})
+        if not created:
+            self.filter(pk=brewery.pk).update(beer_count=F('beer_count') + 1)
+
+    def remove_beer(self, name: str) -> None:
+        self.filter(name=name).update(beer_count=F('beer_count') - 1)
+        self.filter(name=name, beer_count__lte=0).delete()
+
+    def recount(self, names=None) -> None:
+        """
+        Recompute the aggregate from the beers table.
+
+        Required after writes that bypass `Beer.save` and `Beer.delete` (`bulk_create`,
+        `bulk_update`, `QuerySet.update`, fixtures).
+
+        Args:
+            names (Iterable[str] | None): The breweries to recount, all breweries if None.
+        """
+        beers = Beer.objects.all()
+        breweries = self.all()
+        if names is not None:
+            names = set(names)
+            beers = beers.filter(brewery__in=names)
+            breweries = breweries.filter(name__in=names)
+
+        with transaction.atomic():
+            counts = list(beers.values('brewery').annotate(beer_count=Count('id')).order_by())
+            breweries.delete()
+            self.bulk_create(Brewery(name=row['brewery'], beer_count=row['beer_count']) for row in counts)
+
+
+class Brewery(models.Model):
+    """
+    Maintained aggregate of the breweries referenced by beers.
+
+    Rows are created, counted and removed together with the beers of a brewery
+    (see `Beer.save` and `beers.signals`) and must not be edited directly.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    beer_count = models.PositiveIntegerField(default=0)
+
+    objects = BreweryManager()
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name_plural = 'breweries'
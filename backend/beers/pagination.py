@@ -0,0 +1,166 @@
+import functools
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from .filters import BEER_ORDERINGS, ORDERING_PARAM, get_ordering
+
+TOTAL_COUNT_HEADER = 'X-Total-Count'
+
+
+def reverse_ordering(ordering):
+    return tuple(order[1:] if order.startswith('-') else f'-{order}' for order in ordering)
+
+
+def keyset_after(ordering, values) -> Q:
+    """
+    Filter for the rows that follow the row with the given values of the ordering fields.
+
+    `(a, id) > (x, y)` becomes `a >= x AND (a > x OR (a = x AND id > y))`, the leading range
+    on the first field lets the database seek in its index.
+    """
+    if len(values) != len(ordering):
+        raise ValueError('position does not match the ordering')
+    condition = None
+    for order, value in reversed(list(zip(ordering, values))):
+        field = order.lstrip('-')
+        lookup = 'lt' if order.startswith('-') else 'gt'
+        beyond = Q(**{f'{field}__{lookup}': value})
+        condition = beyond if condition is None else beyond | (Q(**{field: value}) & condition)
+    first = ordering[0]
+    lookup = 'lte' if first.startswith('-') else 'gte'
+    return Q(**{f'{first.lstrip("-")}__{lookup}': values[0]}) & condition
+
+
+class BeerCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for the beer list.
+
+    Pages are addressed by an opaque cursor that encodes all fields of the last seen row's
+    ordering key, e.g. `(created_at, id)`. The id makes the key unique, so the next page is
+    selected by a keyset filter on the whole key (see `keyset_after`) and never by an OFFSET,
+    also when the first field has ties.
+
+    Pagination is opt-in: requests that send neither `cursor` nor `page_size` receive
+    the plain list of beers, so existing clients keep working unchanged.
+    """
+
+    page_size = settings.BEERS_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.BEERS_MAX_PAGE_SIZE
+
+    ordering_query_param = ORDERING_PARAM
+    orderings = BEER_ORDERINGS
+    ordering = orderings['id']
+
+    def is_requested(self, request):
+        """
+        Whether the client asked for a paginated response.
+        """
+        return (self.cursor_query_param in request.query_params
+                or self.page_size_query_param in request.query_params)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Read the page after the cursor's position with a keyset filter on all ordering fields.
+
+        The REST framework positions its cursors on the first ordering field only and skips
+        rows with an equal value by an OFFSET. The positions here hold every field of the
+        ordering, which ends with the unique id, so positions never tie and cursors carry no
+        offset. The link building of the REST framework is reused unchanged.
+        """
+        if not self.is_requested(request):
+            return None
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        reverse, position = (False, None) if self.cursor is None else (self.cursor.reverse, self.cursor.position)
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(keyset_after(ordering, json.loads(position)))
+            except (TypeError, ValueError, DjangoValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = self._get_position_from_instance(results[-1], self.ordering) \
+            if len(results) > len(self.page) else None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = position is not None, position
+            self.has_previous, self.previous_position = following_position is not None, following_position
+        else:
+            self.has_next, self.next_position = following_position is not None, following_position
+            self.has_previous, self.previous_position = position is not None, position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        fields = [order.lstrip('-') for order in ordering]
+        values = [instance[field] if isinstance(instance, dict) else getattr(instance, field) for field in fields]
+        return json.dumps([str(value) for value in values])
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Resolve the keyset ordering from the `ordering` query parameter.
+        """
+        return get_ordering(request)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.ordering_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Ordering of the beers, also the keyset of the pages.',
+            'schema': {
+                'type': 'string',
+                'enum': list(self.orderings),
+            },
+        })
+        return parameters
+
+
+def total_count_response(count: int) -> Response:
+    """
+    The bodiless answer to a HEAD request of a list endpoint.
+    """
+    return Response(status=status.HTTP_200_OK, headers={TOTAL_COUNT_HEADER: str(count)})
+
+
+def total_count(get_queryset):
+    """
+    Report the size of a list endpoint in the `X-Total-Count` header.
+
+    HEAD requests are answered with a single COUNT query and no body, without serializing or
+    caching the list. Unpaginated GET responses carry the header as well, counted from the data.
+
+    Args:
+        get_queryset (Callable): Called with the view and the action arguments, returns
+            the rows that make up the list.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method == 'HEAD':
+                return total_count_response(get_queryset(view, *args, **kwargs).count())
+
+            response = method(view, request, *args, **kwargs)
+            if isinstance(getattr(response, 'data', None), list):
+                response[TOTAL_COUNT_HEADER] = str(len(response.data))
+            return response
+        return wrapper
+    return decorator
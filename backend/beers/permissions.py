@@ -1,5 +1,44 @@
+from django.conf import settings
+from django.core.cache import caches
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+EDITOR_GROUP = 'beer_editor'
+# attribute of users rebuilt by the token cache, their cached editor membership
+EDITOR_FLAG = '_is_beer_editor'
+
+
+def editor_cache_key(user_id) -> str:
+    return f'beers:editor:{user_id}'
+
+
+def is_beer_editor(user) -> bool:
+    """
+    Whether the user is a member of the beer editor group.
+
+    Uses the membership of the token cache or the groups prefetched during authentication if
+    available, otherwise the membership is cached per user for `BEERS_PERMISSION_CACHE_TIMEOUT`
+    seconds. Group changes invalidate the cached membership (see beers/signals.py).
+    """
+    if user.pk is None:
+        return False
+    if hasattr(user, EDITOR_FLAG):
+        return getattr(user, EDITOR_FLAG)
+    if 'groups' in getattr(user, '_prefetched_objects_cache', {}):
+        return any(group.name == EDITOR_GROUP for group in user.groups.all())
+
+    cache = caches[settings.BEERS_CACHE_ALIAS]
+    key = editor_cache_key(user.pk)
+    is_editor = cache.get(key)
+    if is_editor is None:
+        is_editor = user.groups.filter(name=EDITOR_GROUP).exists()
+        cache.set(key, is_editor, settings.BEERS_PERMISSION_CACHE_TIMEOUT)
+    return is_editor
+
+
+def invalidate_editor_cache(user_ids) -> None:
+    caches[settings.BEERS_CACHE_ALIAS].delete_many([editor_cache_key(user_id) for user_id in user_ids])
+
+
 class IsBeerViewer(BasePermission):
     """
     Permission class that allows read-only access.
@@ -12,4 +51,4 @@ class IsBeerEditor(BasePermission):
     Permission class that requires user to have write-permissions.
     """
     def has_permission(self, request, view):
-        return request.user.groups.filter(name='beer_editor').exists() or request.user.is_superuser
+        return request.user.is_superuser or is_beer_editor(request.user)
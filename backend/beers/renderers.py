@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .instrumentation import measure_serialization
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline delimited JSON, one object per line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        return ''.join(json.dumps(item, cls=JSONEncoder, ensure_ascii=False) + '\n' for item in items).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Comma separated values with a header row taken from the keys of the first object.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        if not items:
+            return b''
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(items[0]))
+        writer.writeheader()
+        writer.writerows(items)
+        return buffer.getvalue().encode(self.charset)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, with the same output as the REST framework JSONRenderer.
+
+    Falls back to the JSONRenderer if orjson is not installed, for indented output or
+    non-default JSON settings. orjson renders NaN and infinity as null where the strict
+    JSONRenderer (`STRICT_JSON`) raises; the responses hold model values, which have none.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure_serialization():
+            return self.render_json(data, accepted_media_type, renderer_context)
+
+    def render_json(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or not self.compact or self.ensure_ascii
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # datetimes and dataclasses go through the encoder of the REST framework as well
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=options)
+        # same javascript-safe escaping as JSONRenderer
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Prometheus text exposition format, the data is the rendered text; errors are sent as JSON text.
+    """
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            data = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+        return data.encode(self.charset)
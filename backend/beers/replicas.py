@@ -0,0 +1,89 @@
+import contextlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_APPS = {'beers'}
+
+
+class ReplicaReads:
+    """
+    Routing state of a read-only action.
+
+    `pinned` is set by the first write, later reads of the action go to the primary and see it.
+    `replica_queries` counts the reads sent to a replica.
+    """
+
+    def __init__(self):
+        self.pinned = False
+        self.replica_queries = 0
+
+
+_replica_reads = ContextVar('replica_reads', default=None)
+
+
+@contextlib.contextmanager
+def replica_reads():
+    """
+    Serve the reads of the beers app from the replicas while the block runs.
+    """
+    token = _replica_reads.set(ReplicaReads())
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_queries() -> int:
+    """
+    The number of reads of the current action sent to a replica so far.
+    """
+    state = _replica_reads.get()
+    return 0 if state is None else state.replica_queries
+
+
+class ReplicaReadMixin:
+    """
+    ViewSet mixin that runs the actions listed in `replica_actions` with `replica_reads`.
+    """
+    replica_actions = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.action_map.get(request.method.lower()) in self.replica_actions:
+            with replica_reads():
+                return super().dispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaRouter:
+    """
+    Database router that sends the reads of read-only actions to the replicas.
+
+    Reads go to a random replica of `BEERS_REPLICAS` only inside `replica_reads` (the read
+    actions of the beer and brewery views) and only for models of the beers app, users,
+    sessions and tokens are always read from the primary. All writes go to the primary and pin
+    the rest of the action to it, so the action reads its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _replica_reads.get()
+        if state is None or state.pinned or not settings.BEERS_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label not in REPLICA_APPS:
+            return DEFAULT_DB_ALIAS
+        state.replica_queries += 1
+        return random.choice(settings.BEERS_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _replica_reads.get()
+        if state is not None:
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.BEERS_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
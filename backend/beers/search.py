@@ -0,0 +1,65 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Beer
+
+FTS_TABLE = 'beers_beer_fts'
+
+# Relative bm25 weights of the indexed columns (name, description)
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def build_match_expression(query: str) -> str:
+    """
+    Translate free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term, so user input can never be interpreted as
+    FTS5 query syntax and "hop bitt" matches "hoppy, bitter". Terms are combined with AND.
+
+    Args:
+        query (str): The free text entered by the user.
+
+    Returns:
+        str: The MATCH expression, empty if the query contains no words.
+    """
+    return " ".join(f'"{token}"*' for token in TOKEN_PATTERN.findall(query))
+
+
+def search_beers(query: str, limit: int):
+    """
+    Full-text search over beer name and description, best matches first.
+
+    On SQLite the search runs against the FTS5 index maintained by triggers on the beers
+    table (see migration 0003_beer_search). Other databases fall back to a substring match.
+
+    Args:
+        query (str): The free text entered by the user.
+        limit (int): Maximum number of beers to return.
+
+    Returns:
+        Iterable[Beer]: The matching beers.
+    """
+    match = build_match_expression(query)
+    if not match:
+        return Beer.objects.none()
+
+    if connection.vendor != 'sqlite':
+        words = TOKEN_PATTERN.findall(query)
+        condition = Q()
+        for word in words:
+            condition &= Q(name__icontains=word) | Q(description__icontains=word)
+        return Beer.objects.filter(condition)[:limit]
+
+    return Beer.objects.raw(
+        f'SELECT beer.* FROM {FTS_TABLE} '
+        f'JOIN {Beer._meta.db_table} AS beer ON beer.id = {FTS_TABLE}.rowid '
+        f'WHERE {FTS_TABLE} MATCH %s '
+        f'ORDER BY bm25({FTS_TABLE}, %s, %s) '
+        f'LIMIT %s',
+        [match, NAME_WEIGHT, DESCRIPTION_WEIGHT, limit]
+    )
@@ -1,7 +1,16 @@
+import datetime
+import decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from beers.models import Beer
+from beers.cache import response_cache
+from beers.models import Beer, Brewery
+from beers.signals import batched_beer_deletes
+from beers.validation.validators import FIELD_RULES, validate_many
 
 
 class BeerSerializer(serializers.ModelSerializer):
@@ -23,3 +32,236 @@ class BeerSerializer(serializers.ModelSerializer):
         beer = Beer(**attrs)
         beer.clean()
         return attrs
+
+
+class BeerValuesSerializer:
+    """
+    Read-only fast path for beer listings.
+
+    Builds the representation of `BeerSerializer` straight from `.values()` rows instead of
+    model instances and per-field serializer calls. The output is identical: the alcohol
+    content as a decimal string, datetimes as ISO 8601 in the current time zone.
+
+    Usage:
+        rows = BeerValuesSerializer.values(queryset)
+        data = BeerValuesSerializer(rows).data
+
+    A subset of the fields (sparse fieldset) is selected with `fields`, e.g. parsed from a
+    `fields=id,name` query parameter by `parse_fields`.
+    """
+    fields = BeerSerializer.Meta.fields
+    alcohol_content_quantum = decimal.Decimal('.1') ** Beer._meta.get_field('alcohol_content').decimal_places
+    alcohol_content_context = decimal.Context(prec=Beer._meta.get_field('alcohol_content').max_digits)
+
+    def __init__(self, rows, fields=None):
+        self.rows = rows
+        self.selected_fields = fields
+
+    @classmethod
+    def parse_fields(cls, value):
+        """
+        Parse a comma separated list of field names.
+
+        Returns:
+            list[str] | None: The selected fields in representation order, None for all fields.
+        """
+        if value is None:
+            return None
+        requested = {field.strip() for field in value.split(',') if field.strip()}
+        unknown = requested.difference(cls.fields)
+        if unknown or not requested:
+            allowed = ", ".join(cls.fields)
+            raise ValidationError({'fields': f"Fields must be a comma separated list of: {allowed}."})
+        return [field for field in cls.fields if field in requested]
+
+    @classmethod
+    def values(cls, queryset, fields=None, extra=()):
+        """
+        The `.values()` rows for the given fields plus `extra` columns, e.g. a pagination key.
+        """
+        columns = list(fields or cls.fields)
+        columns += [column for column in extra if column not in columns]
+        return queryset.values(*columns)
+
+    @property
+    def data(self):
+        time_zone = timezone.get_current_timezone() if settings.USE_TZ else None
+        if self.selected_fields is None:
+            return [self.to_representation(row, time_zone) for row in self.rows]
+        return [self.to_partial_representation(row, self.selected_fields, time_zone) for row in self.rows]
+
+    async def adata(self):
+        """
+        The representation of a `.values()` queryset, fetched with the async ORM.
+        """
+        time_zone = timezone.get_current_timezone() if settings.USE_TZ else None
+        if self.selected_fields is None:
+            return [self.to_representation(row, time_zone) async for row in self.rows.aiterator()]
+        return [self.to_partial_representation(row, self.selected_fields, time_zone)
+                async for row in self.rows.aiterator()]
+
+    @classmethod
+    def to_representation(cls, row, time_zone):
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'brewery': row['brewery'],
+            'description': row['description'],
+            'alcohol_content': cls.alcohol_content_to_representation(row['alcohol_content']),
+            'beer_type': row['beer_type'],
+            'created_at': cls.datetime_to_representation(row['created_at'], time_zone),
+            'updated_at': cls.datetime_to_representation(row['updated_at'], time_zone),
+        }
+
+    @classmethod
+    def to_partial_representation(cls, row, fields, time_zone):
+        data = {}
+        for field in fields:
+            value = row[field]
+            if field == 'alcohol_content':
+                value = cls.alcohol_content_to_representation(value)
+            elif field in ('created_at', 'updated_at'):
+                value = cls.datetime_to_representation(value, time_zone)
+            data[field] = value
+        return data
+
+    @classmethod
+    def alcohol_content_to_representation(cls, value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return f'{value.quantize(cls.alcohol_content_quantum, context=cls.alcohol_content_context):f}'
+
+    @staticmethod
+    def datetime_to_representation(value, time_zone):
+        if not value:
+            return None
+        if time_zone is not None:
+            value = value.astimezone(time_zone) if timezone.is_aware(value) else timezone.make_aware(value, time_zone)
+        elif timezone.is_aware(value):
+            value = timezone.make_naive(value, datetime.timezone.utc)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+
+class BulkBeerListSerializer(serializers.ListSerializer):
+    """
+    Validates and writes a whole batch of beers.
+
+    The field rules and the unique constraint are checked once for the batch instead of once
+    per beer, and the beers are written with `bulk_create` / `bulk_update`. Errors are reported
+    per item, keyed by the index of the item in the submitted list.
+    """
+
+    def to_internal_value(self, data):
+        try:
+            return super().to_internal_value(data)
+        except ValidationError as exc:
+            # ListSerializer reports the item errors as a list aligned with the items, key them
+            # by index like validate() does
+            if isinstance(exc.detail, list):
+                raise ValidationError({index: errors for index, errors in enumerate(exc.detail) if errors})
+            raise
+
+    def validate(self, attrs):
+        errors = [item_errors for _, item_errors in validate_many(attrs)]
+
+        if self.instance is not None:
+            beers = {beer.id: beer for beer in self.instance}
+            seen = set()
+            for index, item in enumerate(attrs):
+                beer_id = item.get('id')
+                if beer_id is None:
+                    errors[index]['id'] = ["This field is required."]
+                elif beer_id in seen:
+                    errors[index]['id'] = ["Duplicate id in request."]
+                elif beer_id not in beers:
+                    errors[index]['id'] = ["Beer does not exist."]
+                seen.add(beer_id)
+
+        keys = [(item['name'], item['brewery'], item['beer_type']) for item in attrs]
+        updated_ids = [item['id'] for item in attrs if item.get('id') is not None] if self.instance is not None else []
+        existing = Beer.objects.existing_keys(keys, exclude_ids=updated_ids)
+        seen = set()
+        for index, key in enumerate(keys):
+            if key in existing or key in seen:
+                errors[index].setdefault('non_field_errors', []).append(
+                    "The fields name, brewery, beer_type must make a unique set."
+                )
+            seen.add(key)
+
+        if any(errors):
+            raise ValidationError({index: item_errors for index, item_errors in enumerate(errors) if item_errors})
+        return attrs
+
+    def create(self, validated_data):
+        beers = [Beer(**{field: value for field, value in item.items() if field != 'id'})
+                 for item in validated_data]
+        with transaction.atomic():
+            beers = Beer.objects.bulk_create(beers, batch_size=settings.BEERS_BULK_BATCH_SIZE)
+            Brewery.objects.recount({beer.brewery for beer in beers})
+            response_cache.invalidate_on_commit()
+        return beers
+
+    def update(self, instance, validated_data):
+        beers = {beer.id: beer for beer in instance}
+        breweries = {beer.brewery for beer in instance}
+        now = timezone.now()
+
+        updated = []
+        for item in validated_data:
+            beer = beers[item['id']]
+            for field, value in item.items():
+                setattr(beer, field, value)
+            beer.updated_at = now  # bulk_update skips auto_now
+            breweries.add(beer.brewery)
+            updated.append(beer)
+
+        fields = ['name', 'brewery', 'description', 'alcohol_content', 'beer_type', 'updated_at']
+        with transaction.atomic():
+            Beer.objects.bulk_update(updated, fields, batch_size=settings.BEERS_BULK_BATCH_SIZE)
+            Brewery.objects.recount(breweries)
+            response_cache.invalidate_on_commit()
+        return updated
+
+
+class BulkBeerSerializer(BeerSerializer):
+    """
+    A single beer of a bulk request; `id` selects the beer to update.
+    """
+    id = serializers.IntegerField(required=False, min_value=1)
+
+    class Meta(BeerSerializer.Meta):
+        list_serializer_class = BulkBeerListSerializer
+        # checked once per batch by BulkBeerListSerializer
+        validators = []
+        extra_kwargs = {field: {'validators': []} for field in FIELD_RULES}
+
+    def validate(self, attrs):
+        # Beer.clean runs as part of validate_many in BulkBeerListSerializer
+        return attrs
+
+
+class BulkDeleteSerializer(serializers.Serializer):
+    """
+    The ids of the beers to delete in a bulk request.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False,
+                                max_length=settings.BEERS_BULK_MAX_ITEMS)
+
+    def create(self, validated_data):
+        """
+        Delete the beers, all or none of them.
+
+        The ids are checked in the transaction of the delete, with the rows locked, so a beer
+        deleted concurrently is reported as well. The per-beer delete signals are batched.
+        """
+        ids = validated_data['ids']
+        with transaction.atomic(), batched_beer_deletes():
+            existing = set(Beer.objects.select_for_update().filter(id__in=ids).values_list('id', flat=True))
+            errors = {index: ["Beer does not exist."] for index, beer_id in enumerate(ids) if beer_id not in existing}
+            if errors:
+                raise ValidationError({'ids': errors})
+            Beer.objects.filter(id__in=ids).delete()
+        return ids
@@ -0,0 +1,148 @@
+import contextlib
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .cache import response_cache
+from .instrumentation import install_query_recorder
+from .models import Beer, Brewery
+from .permissions import invalidate_editor_cache
+
+# The breweries of the beers deleted in a `batched_beer_deletes` block, None outside of one
+_deleted_breweries = ContextVar('deleted_breweries', default=None)
+
+
+@contextlib.contextmanager
+def batched_beer_deletes():
+    """
+    Do the signal work of the beers deleted in the block once for all of them.
+
+    Inside the block deletes only collect the breweries of the deleted beers; when it completes
+    they are recounted and the response cache is invalidated once the transaction commits.
+    """
+    breweries = set()
+    token = _deleted_breweries.set(breweries)
+    try:
+        yield
+    finally:
+        _deleted_breweries.reset(token)
+    Brewery.objects.recount(breweries)
+    response_cache.invalidate_on_commit()
+
+
+@receiver(post_save, sender=Beer)
+def recount_brewery_of_raw_beer(sender, instance, raw, **kwargs):
+    """
+    Keep the brewery aggregate in sync when fixtures are loaded.
+
+    Raw saves (`loaddata`) bypass `Beer.save`, which maintains the aggregate otherwise.
+    """
+    if raw:
+        Brewery.objects.recount([instance.brewery])
+
+
+@receiver(post_delete, sender=Beer)
+def remove_beer_from_brewery(sender, instance, **kwargs):
+    """
+    Keep the brewery aggregate in sync when beers are deleted.
+
+    Runs inside the transaction of the delete, for single and queryset deletes alike. The
+    beer is removed from its stored brewery, which an unsaved change of `brewery` does not move.
+    """
+    brewery = getattr(instance, '_loaded_brewery', None) or instance.brewery
+    breweries = _deleted_breweries.get()
+    if breweries is not None:
+        breweries.add(brewery)
+    else:
+        Brewery.objects.remove_beer(brewery)
+
+
+@receiver(post_save, sender=Beer)
+@receiver(post_delete, sender=Beer)
+def invalidate_response_cache(sender, using=None, **kwargs):
+    """
+    Drop the cached read responses on every beer write, once it is committed.
+    """
+    if _deleted_breweries.get() is None:
+        response_cache.invalidate_on_commit(using=using)
+
+
+def invalidate_users(user_ids) -> None:
+    """
+    Drop the cached editor membership and the cached tokens of the given users.
+
+    Runs once the transaction commits; a request that reads the user before the commit
+    would otherwise cache the old state again.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    transaction.on_commit(lambda: invalidate_editor_cache(user_ids))
+    token_cache.invalidate_on_commit(Token.objects.filter(user_id__in=user_ids).values_list('key', flat=True))
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_editor_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drop the cached editor membership and tokens of users whose groups change.
+
+    Changes from the group side (`group.user_set`) carry the affected user ids in `pk_set`,
+    except for clears, where the members are collected before the clear.
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_users([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        invalidate_users(pk_set)
+    elif action == 'pre_clear':
+        invalidate_users(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_group_members(sender, instance, **kwargs):
+    """
+    Drop the cached editor membership and tokens of all members when a group is renamed or deleted.
+    """
+    if instance.pk is not None:
+        invalidate_users(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_user(sender, instance, raw=False, **kwargs):
+    """
+    Drop the cached tokens of a changed user, e.g. when they are deactivated.
+    """
+    if not raw:
+        invalidate_users([instance.pk])
+
+
+@receiver(user_logged_out)
+def invalidate_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_users([user.pk])
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    """
+    Drop a deleted token from the token cache, `dj_rest_auth` deletes the token on logout.
+    """
+    token_cache.invalidate_on_commit([instance.key], using=kwargs.get('using'))
+
+
+@receiver(connection_created)
+def record_queries(sender, connection, **kwargs):
+    """
+    Measure the queries of every database connection for the instrumentation middleware.
+    """
+    install_query_recorder(connection)
@@ -0,0 +1,67 @@
+from django.db.models import Count
+
+from .models import Beer, Brewery
+from .serializers import BeerValuesSerializer
+
+# Percentiles of the alcohol content reported by the statistics endpoint
+PERCENTILES = (25, 50, 75, 90)
+
+
+def beer_statistics() -> dict:
+    """
+    Aggregate statistics of the beer catalogue, computed in the database.
+
+    Costs three grouped queries, each a single pass: the number of beers per alcohol content
+    (the distribution, read from the alcohol content index), the number of beers per type and
+    the maintained `Brewery` aggregate. Count, minimum, maximum, average and percentiles of the
+    alcohol content all derive from the distribution, which has at most one row per distinct
+    value, so no beer rows are transferred.
+
+    Returns:
+        dict: The total count, counts per beer type and brewery, and the alcohol content summary.
+    """
+    distribution = list(
+        Beer.objects.values_list('alcohol_content').annotate(count=Count('id')).order_by('alcohol_content')
+    )
+    by_beer_type = Beer.objects.values_list('beer_type').annotate(count=Count('id')).order_by('beer_type')
+    by_brewery = Brewery.objects.order_by('name').values_list('name', 'beer_count')
+
+    return {
+        'count': sum(count for _, count in distribution),
+        'by_beer_type': dict(by_beer_type),
+        'by_brewery': dict(by_brewery),
+        'alcohol_content': alcohol_content_summary(distribution),
+    }
+
+
+def alcohol_content_summary(distribution) -> dict:
+    """
+    Summarize a sorted distribution of `(alcohol content, number of beers)` pairs.
+
+    Percentiles use the nearest-rank method, so every reported value is the alcohol content
+    of an actual beer. All values are None without beers.
+    """
+    total = sum(count for _, count in distribution)
+    if not total:
+        return {'min': None, 'max': None, 'avg': None,
+                'percentiles': {str(percent): None for percent in PERCENTILES}}
+
+    represent = BeerValuesSerializer.alcohol_content_to_representation
+    average = sum(value * count for value, count in distribution) / total
+    return {
+        'min': represent(distribution[0][0]),
+        'max': represent(distribution[-1][0]),
+        'avg': represent(average),
+        'percentiles': {str(percent): represent(percentile(distribution, total, percent))
+                        for percent in PERCENTILES},
+    }
+
+
+def percentile(distribution, total, percent):
+    rank = max(1, -(-total * percent // 100))  # ceil without floats
+    seen = 0
+    for value, count in distribution:
+        seen += count
+        if seen >= rank:
+            return value
+    return distribution[-1][0]
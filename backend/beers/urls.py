@@ -1,6 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BeerViewSet, BreweryViewSet
+from .views import BeerViewSet, BreweryViewSet, MetricsView, StatisticsViewSet
+from .async_views import (
+    AsyncBeerListView, AsyncBeerDetailView, AsyncBeersByNameView,
+    AsyncBreweryListView, AsyncBreweryCountView, AsyncBeersByBreweryView,
+)
 
 # Router for BeerViewSet
 router = DefaultRouter()
@@ -16,8 +20,21 @@ brewery_urls = [
 # Manual path for get_beer_by_name
 get_beer_by_name_url = [path('<str:beer_name>/', BeerViewSet.as_view({'get': 'get_beer_by_name'}), name='get-beer-by-name-path')]
 
+# Native async versions of the read endpoints for ASGI deployments
+async_urls = [
+    path('beers/', AsyncBeerListView.as_view(), name='beer-list'),
+    path('beers/name/<str:beer_name>/', AsyncBeersByNameView.as_view(), name='get-beer-by-name-path'),
+    path('beers/<str:pk>/', AsyncBeerDetailView.as_view(), name='beer-detail'),
+    path('breweries/', AsyncBreweryListView.as_view(), name='list-breweries'),
+    path('breweries/count/', AsyncBreweryCountView.as_view(), name='number-of-breweries'),
+    path('breweries/<str:brewery_name>/beers/', AsyncBeersByBreweryView.as_view(), name='get-beers-by-brewery'),
+]
+
 urlpatterns = [
     path('', include(router.urls)),
     path('beers/name/', include((get_beer_by_name_url, 'beers'))),
     path('breweries/', include((brewery_urls, 'breweries'))),
+    path('stats/', StatisticsViewSet.as_view({'get': 'statistics'}), name='statistics'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('async/', include((async_urls, 'async'))),
 ]
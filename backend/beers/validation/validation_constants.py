@@ -41,6 +41,8 @@ ALLOWED_BEER_TYPES = [
 
 MAX_ALCOHOL_CONTENT = 75.0
 MIN_ALCOHOL_CONTENT = 0.00
+ALCOHOL_CONTENT_MAX_DIGITS = 5
+ALCOHOL_CONTENT_DECIMAL_PLACES = 2
 MAX_NAME_LENGTH = 100
 MAX_BREWERY_LENGTH = 100
 MAX_DESCRIPTION_LENGTH = 1000
@@ -1,14 +1,98 @@
 # validators.py
+import decimal
 import re
+from typing import Any, Callable, Iterable, Mapping, NamedTuple
+
 from django.core.exceptions import ValidationError
 
 from .validation_constants import (
     ALLOWED_BEER_TYPES,
     MAX_ALCOHOL_CONTENT, MIN_ALCOHOL_CONTENT,
     MAX_NAME_LENGTH, MAX_BREWERY_LENGTH, MAX_DESCRIPTION_LENGTH,
-    ALLOWED_DESCRIPTION_PUNCTUATION
+    ALLOWED_DESCRIPTION_PUNCTUATION,
+    ALCOHOL_CONTENT_MAX_DIGITS, ALCOHOL_CONTENT_DECIMAL_PLACES,
+)
+
+# Compiled once at import, the rules below only call the bound match methods
+NAME_PATTERN = re.compile(r'[a-zA-ZÖöÄäÜüß\s]*')
+DESCRIPTION_PATTERN = re.compile(fr'[\w\s{ALLOWED_DESCRIPTION_PUNCTUATION}]*')
+
+BEER_TYPES = frozenset(ALLOWED_BEER_TYPES)
+MIN_ALCOHOL = decimal.Decimal(str(MIN_ALCOHOL_CONTENT))
+MAX_ALCOHOL = decimal.Decimal(str(MAX_ALCOHOL_CONTENT))
+
+
+class Rule(NamedTuple):
+    """
+    A single check of a rule table.
+
+    `check` returns whether the value passes, `message` is the error otherwise and may
+    refer to the checked value as `{value}`.
+    """
+    check: Callable[[Any], bool]
+    message: str
+
+
+def digits_and_decimals(value: decimal.Decimal) -> tuple[int, int]:
+    """
+    Count the digits in total and after the decimal point, like Django's DecimalValidator.
+    """
+    _, digit_tuple, exponent = value.as_tuple()
+    if exponent >= 0:
+        return (len(digit_tuple) + exponent if digit_tuple != (0,) else 1), 0
+    if -exponent > len(digit_tuple):
+        return -exponent, -exponent
+    return len(digit_tuple), -exponent
+
+
+TITLE_RULES = (
+    Rule(lambda value: bool(value.strip()), "Name must not be empty."),
+    Rule(lambda value: value[0].isupper(), "Name must start with a capital letter."),
+    Rule(lambda value: len(value) <= MAX_NAME_LENGTH, f"Name must not exceed {MAX_NAME_LENGTH} characters."),
+    # only allow letters and spaces
+    Rule(NAME_PATTERN.fullmatch, "Name must not contain special characters."),
 )
 
+BREWERY_RULES = (
+    Rule(lambda value: bool(value.strip()), "Brewery name must not be empty."),
+    Rule(lambda value: value[0].isupper(), "Brewery name must start with a capital letter."),
+    Rule(lambda value: len(value) <= MAX_BREWERY_LENGTH,
+         f"Brewery name must not exceed {MAX_BREWERY_LENGTH} characters."),
+    # only allow letters and spaces
+    Rule(NAME_PATTERN.fullmatch, "Name must not contain special characters."),
+)
+
+DESCRIPTION_RULES = (
+    Rule(lambda value: len(value) <= MAX_DESCRIPTION_LENGTH,
+         f"Description must not exceed {MAX_DESCRIPTION_LENGTH} characters."),
+    Rule(DESCRIPTION_PATTERN.fullmatch, "Description contains invalid characters: {value}"),
+)
+
+ALCOHOL_CONTENT_RULES = (
+    Rule(lambda value: MIN_ALCOHOL <= value <= MAX_ALCOHOL,
+         f"Alcohol content must be between {MIN_ALCOHOL_CONTENT} and {MAX_ALCOHOL_CONTENT} % ABV."),
+)
+
+BEER_TYPE_RULES = (
+    Rule(BEER_TYPES.__contains__, f"Beer type must be one of the following: {', '.join(ALLOWED_BEER_TYPES)}."),
+)
+
+
+def check(rules, value):
+    """
+    Return the message of the first rule the value fails, None if it passes all rules.
+    """
+    for rule in rules:
+        if not rule.check(value):
+            return rule.message.format(value=value)
+    return None
+
+
+def run(rules, value) -> None:
+    message = check(rules, value)
+    if message is not None:
+        raise ValidationError(message)
+
 
 def validate_title(value: str) -> None:
     """
@@ -17,19 +101,7 @@ def validate_title(value: str) -> None:
     - Must not exceed MAX_NAME_LENGTH.
     - Should not contain disallowed characters.
     """
-
-    if len(value.strip()) == 0:
-        raise ValidationError("Name must not be empty.")
-
-    if not value[0].isupper():
-        raise ValidationError("Name must start with a capital letter.")
-
-    if len(value) > MAX_NAME_LENGTH:
-        raise ValidationError(f"Name must not exceed {MAX_NAME_LENGTH} characters.")
-
-    #only allow letters and spaces
-    if not re.match(r'^[a-zA-ZÖöÄäÜüß\s]*$', value):
-        raise ValidationError("Name must not contain special characters.")
+    run(TITLE_RULES, value)
 
 
 def validate_brewery(value: str) -> None:
@@ -39,18 +111,7 @@ def validate_brewery(value: str) -> None:
     - Length limit enforced.
     - No HTML tags.
     """
-    if len(value.strip()) == 0:
-        raise ValidationError("Brewery name must not be empty.")
-
-    if not value[0].isupper():
-        raise ValidationError("Brewery name must start with a capital letter.")
-
-    if len(value) > MAX_BREWERY_LENGTH:
-        raise ValidationError(f"Brewery name must not exceed {MAX_BREWERY_LENGTH} characters.")
-
-    # only allow letters and spaces
-    if not re.match(r'^[a-zA-ZÖöÄäÜüß\s]*$', value):
-        raise ValidationError("Name must not contain special characters.")
+    run(BREWERY_RULES, value)
 
 
 def validate_description(value: str) -> None:
@@ -58,14 +119,7 @@ def validate_description(value: str) -> None:
     - Length limit enforced.
     - Allowed characters include word chars, spaces, and selected punctuation.
     """
-    if len(value) > MAX_DESCRIPTION_LENGTH:
-        raise ValidationError(f"Description must not exceed {MAX_DESCRIPTION_LENGTH} characters.")
-
-    # Use the character set from ALLOWED_DESCRIPTION_PUNCTUATION directly
-    # The inner [] are removed because ALLOWED_DESCRIPTION_PUNCTUATION already defines a valid character set
-    pattern = fr'^[\w\s{ALLOWED_DESCRIPTION_PUNCTUATION}]*$'
-    if not re.match(pattern, value):
-        raise ValidationError(f"Description contains invalid characters: {value}")
+    run(DESCRIPTION_RULES, value)
 
 
 def validate_alcohol_content(value):
@@ -73,16 +127,114 @@ def validate_alcohol_content(value):
     - Must not be under MIN_ALCOHOL_CONTENT.
     - Must not exceed MAX_ALCOHOL_CONTENT.
     """
-    if value < MIN_ALCOHOL_CONTENT or value > MAX_ALCOHOL_CONTENT:
-        raise ValidationError(
-            f"Alcohol content must be between {MIN_ALCOHOL_CONTENT} and {MAX_ALCOHOL_CONTENT} % ABV."
-        )
+    run(ALCOHOL_CONTENT_RULES, value)
 
 
 def validate_beer_type(value: str) -> None:
     """
     - beer type is within the allowed domain constants.
     """
-    if value not in ALLOWED_BEER_TYPES:
-        allowed = ", ".join(ALLOWED_BEER_TYPES)
-        raise ValidationError(f"Beer type must be one of the following: {allowed}.")
+    run(BEER_TYPE_RULES, value)
+
+
+# Rules that combine several fields of a beer: (field the error belongs to, rule on the row)
+ROW_RULES = (
+    ('alcohol_content', Rule(
+        lambda row: not (row['beer_type'].startswith("Non-Alcoholic") and row['alcohol_content'] > 0.5),
+        "Non-Alcoholic beer must not have more than 0.5% alcohol content.")),
+    ('alcohol_content', Rule(
+        lambda row: not (row['beer_type'].startswith("Alcohol-Free") and row['alcohol_content'] > 0.0),
+        "Alcohol-Free beers must have 0.0% alcohol content.")),
+)
+
+
+def validate_row(row: Mapping) -> dict:
+    """
+    Apply the rules that combine several fields to a beer with valid fields.
+
+    Returns:
+        dict[str, str]: The first error of a failed rule, keyed by field; empty if valid.
+    """
+    for field, rule in ROW_RULES:
+        if not rule.check(row):
+            return {field: rule.message}
+    return {}
+
+
+def to_text(value) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def to_decimal(value) -> decimal.Decimal:
+    if isinstance(value, decimal.Decimal):
+        result = value
+    elif isinstance(value, float):
+        result = decimal.Decimal(repr(value))
+    else:
+        try:
+            result = decimal.Decimal(str(value).strip() if isinstance(value, str) else value)
+        except (decimal.InvalidOperation, TypeError, ValueError):
+            result = None
+    if result is None or not result.is_finite():
+        raise ValueError(f"“{value}” value must be a decimal number.")
+    return result
+
+
+DECIMAL_RULES = (
+    Rule(lambda value: digits_and_decimals(value)[0] <= ALCOHOL_CONTENT_MAX_DIGITS,
+         f"Ensure that there are no more than {ALCOHOL_CONTENT_MAX_DIGITS} digits in total."),
+    Rule(lambda value: digits_and_decimals(value)[1] <= ALCOHOL_CONTENT_DECIMAL_PLACES,
+         f"Ensure that there are no more than {ALCOHOL_CONTENT_DECIMAL_PLACES} decimal places."),
+)
+
+# The rule table of a beer: field -> (conversion of the raw value, rules of the converted value)
+FIELD_RULES = {
+    'name': (to_text, TITLE_RULES),
+    'brewery': (to_text, BREWERY_RULES),
+    'description': (to_text, DESCRIPTION_RULES),
+    'alcohol_content': (to_decimal, DECIMAL_RULES + ALCOHOL_CONTENT_RULES),
+    'beer_type': (to_text, BEER_TYPE_RULES),
+}
+
+
+def validate_many(rows: Iterable[Mapping]) -> list[tuple[dict, dict]]:
+    """
+    Validate a batch of beers with the rule table.
+
+    Every row is converted field by field (text, decimal alcohol content) and checked with the
+    precompiled field rules, then with the rules that combine several fields, the same rules the
+    Beer model applies one instance at a time. Missing and blank values are errors.
+
+    Args:
+        rows (Iterable[Mapping]): Raw beer fields, e.g. parsed CSV or JSON rows.
+
+    Returns:
+        list[tuple[dict, dict[str, list[str]]]]: Per row the converted values and the errors by
+            field, the errors are empty for valid rows.
+    """
+    results = []
+    for row in rows:
+        values = {}
+        errors = {}
+        for field, (convert, rules) in FIELD_RULES.items():
+            raw = row.get(field)
+            if raw is None:
+                errors[field] = ["This field cannot be null."]
+                continue
+            if raw == '':
+                errors[field] = ["This field cannot be blank."]
+                continue
+            try:
+                value = convert(raw)
+            except ValueError as e:
+                errors[field] = [str(e)]
+                continue
+            message = check(rules, value)
+            if message is not None:
+                errors[field] = [message]
+            values[field] = value
+
+        if not errors:
+            errors = {field: [message] for field, message in validate_row(values).items()}
+        results.append((values, errors))
+    return results
@@ -1,21 +1,48 @@
 from rest_framework import viewsets, status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_list_or_404
-from .models import Beer
-from .serializers import BeerSerializer
+from .cache import cache_response
+from .conditional import conditional_response
+from .export import stream_csv, stream_ndjson
+from .filters import BeerFilterBackend, get_ordering
+from .instrumentation import prometheus_text
+from .models import Beer, Brewery
+from .pagination import BeerCursorPagination, total_count
+from .search import search_beers
+from .stats import beer_statistics
+from .serializers import BeerSerializer, BeerValuesSerializer, BulkBeerSerializer, BulkDeleteSerializer
 from .permissions import IsBeerViewer, IsBeerEditor
+from .replicas import ReplicaReadMixin
+from .renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer, PrometheusRenderer
 
 # Permissions
 read_permissions = [IsBeerViewer, IsAuthenticated]
 write_permissions = [IsBeerEditor, IsAuthenticated]
 
-class BeerViewSet(viewsets.ModelViewSet):
+class BeerViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     Basic CRUD methods.
 
     - Provides list, get, create, update, delete actions and allows retrieving beers by name.
+    - The list action supports opt-in cursor pagination (`cursor`, `page_size`, `ordering`),
+      filters, server-side ordering and sparse fieldsets (`fields`).
+    - Counts the (filtered) beers with a single COUNT query, list actions answer HEAD
+      requests with the `X-Total-Count` header.
+    - Provides ranked full-text search over name and description.
+    - Read actions are served from the response cache, which every write invalidates.
+    - List and retrieve answer conditional requests (`If-None-Match`, `If-Modified-Since`).
+    - Creates, updates and deletes batches of beers in a single transaction.
+    - Streams the whole catalogue as NDJSON or CSV.
+    - Listings are serialized from plain values and rendered with a fast JSON renderer.
+    - Read actions are served by the read replicas, if configured.
 
     Permissions:
         - Read operations: Require `IsBeerViewer` permission.
@@ -24,15 +51,47 @@ class BeerViewSet(viewsets.ModelViewSet):
 
     queryset = Beer.objects.all()
     serializer_class = BeerSerializer
+    pagination_class = BeerCursorPagination
+    filter_backends = [BeerFilterBackend]
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    replica_actions = ['list', 'retrieve', 'get_beer_by_name', 'search', 'count']
 
     def get_permissions(self):
         """
         Set the permissions based on the action.
         """
-        if self.action in ['list', 'retrieve', 'get_beer_by_name']:
+        if self.action in ['list', 'retrieve', 'get_beer_by_name', 'search', 'export', 'count']:
             return [permission() for permission in read_permissions]
         return [permission() for permission in write_permissions]
 
+    @total_count(lambda view: view.filter_queryset(view.get_queryset()))
+    @conditional_response(lambda view: view.filter_queryset(view.get_queryset()))
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        """
+        List the beers.
+
+        Query parameters:
+            - `abv_min`, `abv_max`, `beer_type`, `brewery`: filters, see `BeerFilterBackend`.
+            - `ordering`: `id` (default), `created_at`, `name`, `alcohol_content`, `-alcohol_content`.
+            - `fields`: comma separated fields to return, all fields by default.
+            - `cursor`, `page_size`: opt-in cursor pagination.
+        """
+        fields = BeerValuesSerializer.parse_fields(request.query_params.get('fields'))
+        ordering_fields = [field.lstrip('-') for field in get_ordering(request)]
+        rows = BeerValuesSerializer.values(self.filter_queryset(self.get_queryset()), fields, extra=ordering_fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(BeerValuesSerializer(page, fields).data)
+        return Response(BeerValuesSerializer(rows, fields).data)
+
+    @conditional_response(lambda view, pk=None: view.get_queryset().filter(pk=pk))
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @total_count(lambda view, beer_name=None: view.queryset.filter(name__icontains=beer_name))
+    @cache_response
     def get_beer_by_name(self, request, beer_name=None):
         """
         Retrieve beers by their name.
@@ -44,12 +103,142 @@ class BeerViewSet(viewsets.ModelViewSet):
         Returns:
             Response: HTTP 200 status with Beer Data
         """
-        beers = self.queryset.filter(name__icontains=beer_name)
-        serializer = self.get_serializer(beers, many=True)
+        beers = BeerValuesSerializer.values(self.queryset.filter(name__icontains=beer_name))
+        return Response(BeerValuesSerializer(beers).data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='count')
+    @cache_response
+    def count(self, request):
+        """
+        Count the beers, optionally filtered like the list (`abv_min`, `abv_max`, `beer_type`, `brewery`).
+
+        Args:
+            request (Request): The incoming HTTP request.
+
+        Returns:
+            Response: HTTP 200 status with the number of beers.
+        """
+        count = self.filter_queryset(self.get_queryset()).count()
+        return Response({"count": count}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='search')
+    @cache_response
+    def search(self, request):
+        """
+        Full-text search over beer name and description.
+
+        Every word of the query is matched as a prefix, results are ranked by relevance.
+
+        Args:
+            request (Request): The incoming HTTP request with query parameter `q`
+                and optional `limit`.
+
+        Returns:
+            Response: HTTP 200 status with the matching beers, best match first.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': "Search query must not be empty."})
+
+        try:
+            limit = int(request.query_params.get('limit', settings.BEERS_SEARCH_MAX_RESULTS))
+        except ValueError:
+            raise ValidationError({'limit': "Limit must be an integer."})
+        limit = max(1, min(limit, settings.BEERS_SEARCH_MAX_RESULTS))
+
+        serializer = self.get_serializer(search_beers(query, limit), many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class BreweryViewSet(viewsets.ViewSet):
+    @action(detail=False, methods=['get'], url_path='export', renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Stream all beers as NDJSON or CSV.
+
+        The format is negotiated through the `Accept` header or the `format` query parameter
+        (`ndjson`, `csv`). Beers are streamed in id order without building the list in memory.
+
+        Args:
+            request (Request): The incoming HTTP request.
+
+        Returns:
+            StreamingHttpResponse: HTTP 200 status with one beer per line.
+        """
+        renderer = request.accepted_renderer
+        stream = stream_csv if renderer.format == CSVRenderer.format else stream_ndjson
+        response = StreamingHttpResponse(stream(self.get_queryset()),
+                                         content_type=f'{renderer.media_type}; charset={renderer.charset}')
+        response['Content-Disposition'] = f'attachment; filename="beers.{renderer.format}"'
+        return response
+
+    @action(detail=False, methods=['post', 'put', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Create, update or delete many beers at once.
+
+        - POST: list of beers to create.
+        - PUT: list of beers to update, each with its `id`.
+        - DELETE: `{"ids": [...]}` of the beers to delete.
+
+        The whole batch is validated first and written in one transaction, nothing is written
+        if any beer is invalid.
+
+        Args:
+            request (Request): The incoming HTTP request.
+
+        Returns:
+            Response: Per-item results aligned with the request: the created (HTTP 201) or
+                updated (HTTP 200) beers and the deleted ids (HTTP 200). Otherwise HTTP 400
+                with the errors of the invalid items, keyed by their index.
+        """
+        try:
+            if request.method == 'DELETE':
+                return self.__bulk_delete(request)
+
+            if request.method == 'PUT':
+                instance = list(Beer.objects.filter(id__in=self.__requested_ids(request.data)))
+                serializer = BulkBeerSerializer(instance, data=request.data, many=True,
+                                                max_length=settings.BEERS_BULK_MAX_ITEMS)
+                response_status = status.HTTP_200_OK
+            else:
+                serializer = BulkBeerSerializer(data=request.data, many=True,
+                                                max_length=settings.BEERS_BULK_MAX_ITEMS)
+                response_status = status.HTTP_201_CREATED
+
+            serializer.is_valid(raise_exception=True)
+            beers = serializer.save()
+        except IntegrityError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(BeerSerializer(beers, many=True).data, status=response_status)
+
+    @staticmethod
+    def __requested_ids(data) -> list:
+        """
+        The valid ids of a bulk update, coerced like the `id` field does (e.g. `"5"`).
+
+        Invalid ids are reported by the validation of the items.
+        """
+        if not isinstance(data, list):
+            return []
+        id_field = BulkBeerSerializer().fields['id']
+        ids = []
+        for item in data:
+            if isinstance(item, dict) and item.get('id') is not None:
+                try:
+                    ids.append(id_field.run_validation(item['id']))
+                except ValidationError:
+                    pass
+        return ids
+
+    @staticmethod
+    def __bulk_delete(request):
+        serializer = BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.save()
+        return Response([{'id': beer_id, 'deleted': True} for beer_id in ids], status=status.HTTP_200_OK)
+
+class BreweryViewSet(ReplicaReadMixin, viewsets.ViewSet):
     """
     A ViewSet to manage Brewery-related actions.
 
@@ -58,10 +247,18 @@ class BreweryViewSet(viewsets.ViewSet):
     - Count the total number of unique breweries.
     - Retrieve beers associated with a specific brewery.
 
+    Listings answer HEAD requests with the `X-Total-Count` header.
+    Breweries are read from the maintained `Brewery` aggregate instead of scanning the beers.
+    All actions are served from the response cache and the read replicas, if configured.
+    Listing breweries and their beers answers conditional requests.
+
     Permissions:
         - Requires `IsBeerViewer` permission for all actions.
     """
 
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    replica_actions = ['list_breweries', 'number_of_breweries', 'get_beers_by_brewery']
+
     def get_permissions(self):
         """
         Set permissions.
@@ -70,6 +267,9 @@ class BreweryViewSet(viewsets.ViewSet):
 
 
     @action(detail=False, methods=['get'], url_path='')
+    @total_count(lambda view: Brewery.objects.all())
+    @conditional_response(lambda view: Beer.objects.all())
+    @cache_response
     def list_breweries(self, request):
         """
         List all distinct breweries.
@@ -80,11 +280,12 @@ class BreweryViewSet(viewsets.ViewSet):
         Returns:
             Response: HTTP 200 status with list of unique brewery names.
         """
-        breweries = Beer.objects.values_list('brewery', flat=True).distinct()
+        breweries = Brewery.objects.order_by('name').values_list('name', flat=True)
         return Response(list(breweries), status=status.HTTP_200_OK)
 
 
     @action(detail=False, methods=['get'], url_path='count')
+    @cache_response
     def number_of_breweries(self, request):
         """
         Count the total number of unique breweries.
@@ -95,11 +296,14 @@ class BreweryViewSet(viewsets.ViewSet):
         Returns:
             Response: HTTP 200 status with the count of unique breweries.
         """
-        count = Beer.objects.values('brewery').distinct().count()
+        count = Brewery.objects.count()
         return Response({"count": count}, status=status.HTTP_200_OK)
 
 
     @action(detail=True, methods=['get'], url_path='beers')
+    @total_count(lambda view, brewery_name=None: Beer.objects.filter(brewery=brewery_name))
+    @conditional_response(lambda view, brewery_name=None: Beer.objects.filter(brewery=brewery_name))
+    @cache_response
     def get_beers_by_brewery(self, request, brewery_name=None):
         """
         Retrieve all beers associated with a specific brewery.
@@ -111,6 +315,60 @@ class BreweryViewSet(viewsets.ViewSet):
         Returns:
             Response: HTTP 200 status with all beers for the specified brewery.
         """
-        beers = Beer.objects.filter(brewery=brewery_name)
-        serializer = BeerSerializer(beers, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        beers = BeerValuesSerializer.values(Beer.objects.filter(brewery=brewery_name))
+        return Response(BeerValuesSerializer(beers).data, status=status.HTTP_200_OK)
+
+
+class StatisticsViewSet(ReplicaReadMixin, viewsets.ViewSet):
+    """
+    Aggregate statistics of the beer catalogue.
+
+    The statistics are computed in the database (see `beers.stats`), served from the response
+    cache, which every write invalidates, and answer conditional requests.
+
+    Permissions:
+        - Requires `IsBeerViewer` permission.
+    """
+
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+    replica_actions = ['statistics']
+
+    def get_permissions(self):
+        """
+        Set permissions.
+        """
+        return [permission() for permission in read_permissions]
+
+
+    @conditional_response(lambda view: Beer.objects.all())
+    @cache_response
+    def statistics(self, request):
+        """
+        Count the beers in total, per beer type and per brewery, and summarize their alcohol content.
+
+        Args:
+            request (Request): The incoming HTTP request.
+
+        Returns:
+            Response: HTTP 200 status with the statistics.
+        """
+        return Response(beer_statistics(), status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    """
+    Request metrics per endpoint in the Prometheus text format.
+
+    Collected by `InstrumentationMiddleware`: requests, wall time, database queries and time,
+    serialization time, response sizes and detected N+1 patterns, plus the response cache
+    statistics. Totals are per process since its start.
+
+    Permissions:
+        - Requires a staff user.
+    """
+
+    permission_classes = [IsAdminUser]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        return Response(prometheus_text(), status=status.HTTP_200_OK)
@@ -0,0 +1,99 @@
+import pytest
+from django.contrib.auth import get_user_model
+from mixer.backend.django import mixer
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED, HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, \
+    HTTP_404_NOT_FOUND
+from rest_framework.test import APIClient
+
+from beers.async_views import AsyncBeerListView
+
+
+@pytest.fixture
+def client_with_user(db):
+    client = APIClient()
+    client.force_login(get_user_model().objects.create_user(username="testuser", password="testpass"))
+    return client
+
+
+@pytest.fixture
+def beers(db):
+    return [
+        mixer.blend("beers.Beer", name="Beer One", brewery="Brewery One"),
+        mixer.blend("beers.Beer", name="Beer Two", brewery="Brewery One"),
+        mixer.blend("beers.Beer", name="Other", brewery="Brewery Two"),
+    ]
+
+
+def url_pairs(beers):
+    return [
+        (reverse('beer-list'), reverse('async:beer-list')),
+        (reverse('beer-list') + '?ordering=-alcohol_content&brewery=Brewery+One&fields=id,name',
+         reverse('async:beer-list') + '?ordering=-alcohol_content&brewery=Brewery+One&fields=id,name'),
+        (reverse('beer-detail', args=[beers[0].id]), reverse('async:beer-detail', args=[beers[0].id])),
+        (reverse('beers:get-beer-by-name-path', args=['Beer']), reverse('async:get-beer-by-name-path', args=['Beer'])),
+        (reverse('breweries:list-breweries'), reverse('async:list-breweries')),
+        (reverse('breweries:number-of-breweries'), reverse('async:number-of-breweries')),
+        (reverse('breweries:get-beers-by-brewery', args=['Brewery One']),
+         reverse('async:get-beers-by-brewery', args=['Brewery One'])),
+    ]
+
+
+class TestAsyncReadEndpoints:
+    def test_views_are_async(self):
+        assert AsyncBeerListView.view_is_async
+
+    def test_responses_equal_sync_endpoints(self, client_with_user, beers):
+        for sync_url, async_url in url_pairs(beers):
+            sync_response = client_with_user.get(sync_url)
+            async_response = client_with_user.get(async_url)
+            assert async_response.status_code == HTTP_200_OK, async_url
+            assert async_response.content == sync_response.content, async_url
+            assert async_response['Content-Type'] == sync_response['Content-Type']
+
+    def test_unauthenticated(self, client, beers):
+        for _, async_url in url_pairs(beers):
+            assert client.get(async_url).status_code == HTTP_403_FORBIDDEN
+
+    def test_retrieve_unknown_or_invalid_id(self, client_with_user, beers):
+        for beer_id in ['0', 'invalidId']:
+            response = client_with_user.get(reverse('async:beer-detail', args=[beer_id]))
+            assert response.status_code == HTTP_404_NOT_FOUND
+            assert response.json() == {'detail': 'No Beer matches the given query.'}
+
+    def test_list_with_pagination(self, client_with_user, beers):
+        response = client_with_user.get(reverse('async:beer-list'), {'page_size': 2})
+        assert response.status_code == HTTP_200_OK
+        assert [beer['id'] for beer in response.json()['results']] == [beers[0].id, beers[1].id]
+
+        response = client_with_user.get(response.json()['next'])
+        assert [beer['id'] for beer in response.json()['results']] == [beers[2].id]
+
+    def test_list_with_invalid_ordering(self, client_with_user, beers):
+        response = client_with_user.get(reverse('async:beer-list'), {'page_size': 2, 'ordering': 'brewery'})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    def test_head_list_reports_total_count(self, client_with_user, beers):
+        response = client_with_user.head(reverse('async:beer-list'), {'brewery': 'Brewery One'})
+        assert response.status_code == HTTP_200_OK
+        assert response['X-Total-Count'] == '2'
+        assert client_with_user.get(reverse('async:beer-list'))['X-Total-Count'] == '3'
+
+    def test_head_and_count_headers_equal_sync_endpoints(self, client_with_user, beers):
+        for sync_url, async_url in url_pairs(beers):
+            for method in (client_with_user.get, client_with_user.head):
+                sync_response, async_response = method(sync_url), method(async_url)
+                assert async_response.status_code == sync_response.status_code, async_url
+                assert async_response.get('X-Total-Count') == sync_response.get('X-Total-Count'), async_url
+        assert client_with_user.head(reverse('async:list-breweries'))['X-Total-Count'] == '2'
+
+    def test_repeated_read_is_served_from_cache(self, client_with_user, beers):
+        url = reverse('async:beer-list')
+        assert client_with_user.get(url)['X-Cache'] == 'MISS'
+        assert client_with_user.get(url)['X-Cache'] == 'HIT'
+
+    def test_list_not_modified(self, client_with_user, beers):
+        url = reverse('async:beer-list')
+        etag = client_with_user.get(url)['ETag']
+        response = client_with_user.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
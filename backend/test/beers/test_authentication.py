@@ -0,0 +1,143 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import mixer
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_403_FORBIDDEN
+from rest_framework.test import APIClient
+
+from beers.authentication import CachedTokenAuthentication, TokenCache, token_cache
+from beers.permissions import EDITOR_GROUP
+
+
+@pytest.fixture
+def editor_group(db):
+    return mixer.blend('auth.Group', name=EDITOR_GROUP)
+
+
+@pytest.fixture
+def user(editor_group):
+    user = get_user_model().objects.create_user(username="editor", password="editorpass")
+    user.groups.add(editor_group)
+    return user
+
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user)
+
+
+@pytest.fixture
+def token_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+def token_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTP_200_OK
+    return [query for query in context.captured_queries if 'authtoken_token' in query['sql']]
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+    def test_repeated_requests_skip_token_query(self, token_client):
+        url = reverse('beer-list')
+        assert len(token_queries(token_client, url)) == 1
+        assert token_queries(token_client, url) == []
+
+    def test_shared_cache_serves_other_processes(self, token_client):
+        url = reverse('beer-list')
+        token_queries(token_client, url)
+        token_cache.clear()  # as if the next request hit another process
+        assert token_queries(token_client, url) == []
+
+    def test_unknown_token_fails(self, db):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token unknown')
+        assert client.get(reverse('beer-list')).status_code == HTTP_403_FORBIDDEN
+
+    def test_logout_invalidates_token(self, token_client, django_capture_on_commit_callbacks):
+        assert token_client.get(reverse('beer-list')).status_code == HTTP_200_OK
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert token_client.post(reverse('rest_logout')).status_code == HTTP_200_OK
+
+        assert token_client.get(reverse('beer-list')).status_code == HTTP_403_FORBIDDEN
+
+    def test_deleted_token_is_invalidated(self, token_client, token, django_capture_on_commit_callbacks):
+        assert token_client.get(reverse('beer-list')).status_code == HTTP_200_OK
+        with django_capture_on_commit_callbacks(execute=True):
+            token.delete()
+        assert token_client.get(reverse('beer-list')).status_code == HTTP_403_FORBIDDEN
+
+    def test_deactivated_user_is_invalidated(self, token_client, user, django_capture_on_commit_callbacks):
+        assert token_client.get(reverse('beer-list')).status_code == HTTP_200_OK
+        user.is_active = False
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+        assert token_client.get(reverse('beer-list')).status_code == HTTP_403_FORBIDDEN
+
+    def test_group_change_is_invalidated(self, token_client, user, editor_group, django_capture_on_commit_callbacks):
+        beer = {'name': 'Valid Beer Name', 'brewery': 'Valid Brewery', 'description': 'A valid description.',
+                'alcohol_content': '5.0', 'beer_type': 'Pale Lager'}
+        assert token_client.post(reverse('beer-list'), beer, format='json').status_code == HTTP_201_CREATED
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.groups.remove(editor_group)
+
+        beer['name'] = 'Another Beer Name'
+        assert token_client.post(reverse('beer-list'), beer, format='json').status_code == HTTP_403_FORBIDDEN
+
+    def test_cache_holds_no_user_secrets(self, token_client, token, user):
+        token_client.get(reverse('beer-list'))
+        version, data = token_cache.backend.get(TokenCache.key(token.key))
+        assert data == {'user_id': user.pk, 'is_staff': False, 'is_superuser': False, 'is_editor': True}
+
+    def test_cached_user_loads_other_fields_on_access(self, token, user):
+        token_cache.set(token.key, 0, {'user_id': user.pk, 'is_staff': False, 'is_superuser': False,
+                                       'is_editor': True})
+        cached_user, cached_token = CachedTokenAuthentication().authenticate_credentials(token.key)
+        assert cached_user.pk == user.pk and cached_token.user is cached_user
+        assert cached_user.username == "editor"
+
+
+class TestTokenCache:
+    @override_settings(BEERS_TOKEN_CACHE_SIZE=2, BEERS_CACHE_ALIAS='dummy',
+                       CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                               'dummy': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def test_least_recently_used_token_is_evicted(self):
+        cache = TokenCache()
+        cache.set('first', 0, 1)
+        cache.set('second', 0, 2)
+        assert cache.get('first') == (1, 0)
+        cache.set('third', 0, 3)
+
+        assert cache.get('second') == (None, 0)
+        assert cache.get('first') == (1, 0)
+        assert cache.get('third') == (3, 0)
+
+    @override_settings(BEERS_TOKEN_CACHE_LOCAL_TIMEOUT=0, BEERS_CACHE_ALIAS='dummy',
+                       CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                               'dummy': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def test_expired_token_is_dropped(self):
+        cache = TokenCache()
+        cache.set('first', 0, 1)
+        assert cache.get('first') == (None, 0)
+
+    def test_set_after_invalidation_is_ignored(self):
+        cache = TokenCache()
+        _, version = cache.get('first')
+        # the token is deleted while its credentials are being loaded
+        cache.invalidate(['first'])
+        cache.set('first', version, 1)
+
+        data, current = cache.get('first')
+        assert data is None and current != version
+        cache.set('first', current, 2)
+        assert cache.get('first') == (2, current)
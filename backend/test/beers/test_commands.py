@@ -0,0 +1,128 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from mixer.backend.django import mixer
+
+from beers.models import Beer, Brewery
+
+
+@pytest.fixture
+def beer_rows():
+    return [
+        {'name': 'First Beer', 'brewery': 'Import Brewery', 'description': 'A valid description.',
+         'alcohol_content': '5.0', 'beer_type': 'Pale Lager'},
+        {'name': 'Second Beer', 'brewery': 'Import Brewery', 'description': 'Another description.',
+         'alcohol_content': '4.2', 'beer_type': 'Pilsner'},
+    ]
+
+
+def write_csv(path, rows):
+    header = list(rows[0])
+    lines = [",".join(header)] + [",".join(f'"{row[field]}"' for field in header) for row in rows]
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return path
+
+
+def write_ndjson(path, lines):
+    path.write_text("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n",
+                    encoding='utf-8')
+    return path
+
+
+def import_beers(*args, **options):
+    out = io.StringIO()
+    call_command('import_beers', *args, stdout=out, stderr=io.StringIO(), **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestImportBeers:
+    def test_import_csv(self, tmp_path, beer_rows):
+        output = import_beers(str(write_csv(tmp_path / 'beers.csv', beer_rows)))
+        assert 'Imported 2 beers, rejected 0 rows' in output
+        assert list(Beer.objects.order_by('id').values_list('name', flat=True)) == ['First Beer', 'Second Beer']
+        assert Brewery.objects.get(name='Import Brewery').beer_count == 2
+
+    def test_import_ndjson_rejects_invalid_rows(self, tmp_path, beer_rows):
+        invalid = dict(beer_rows[1], name='lowercase name')
+        non_alcoholic = dict(beer_rows[1], name='Strong Free', beer_type='Non-Alcoholic Beer', alcohol_content='4.0')
+        path = write_ndjson(tmp_path / 'beers.ndjson', [beer_rows[0], invalid, '{broken', non_alcoholic])
+        rejects_path = tmp_path / 'rejects.ndjson'
+
+        output = import_beers(str(path), rejects=str(rejects_path))
+
+        assert 'Imported 1 beers, rejected 3 rows' in output
+        rejects = [json.loads(line) for line in rejects_path.read_text(encoding='utf-8').splitlines()]
+        assert [reject['line'] for reject in rejects] == [2, 3, 4]
+        assert 'name' in rejects[0]['errors']
+        assert 'alcohol_content' in rejects[2]['errors']
+
+    def test_import_rejects_duplicates(self, tmp_path, beer_rows):
+        mixer.blend('beers.Beer', **beer_rows[0])
+        path = write_ndjson(tmp_path / 'beers.ndjson', [beer_rows[0], beer_rows[1], beer_rows[1]])
+
+        output = import_beers(str(path), batch_size=1)
+
+        assert 'Imported 1 beers, rejected 2 rows' in output
+        assert Beer.objects.count() == 2
+
+    def test_import_rejects_concurrent_duplicates(self, tmp_path, beer_rows, monkeypatch):
+        # inserted by another writer after the duplicate check of the batch
+        mixer.blend('beers.Beer', **beer_rows[0])
+        existing_keys = Beer.objects.existing_keys
+        checks = []
+
+        def stale_existing_keys(keys, *args, **kwargs):
+            checks.append(keys)
+            return set() if len(checks) == 1 else existing_keys(keys, *args, **kwargs)
+
+        monkeypatch.setattr(Beer.objects, 'existing_keys', stale_existing_keys)
+        output = import_beers(str(write_ndjson(tmp_path / 'beers.ndjson', beer_rows)))
+
+        assert 'Imported 1 beers, rejected 1 rows' in output
+        assert Brewery.objects.get(name='Import Brewery').beer_count == 2
+
+    def test_import_recounts_and_invalidates_per_batch(self, tmp_path, beer_rows,
+                                                       django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            import_beers(str(write_ndjson(tmp_path / 'beers.ndjson', beer_rows)), batch_size=1)
+        assert len(callbacks) == 2
+
+    def test_import_requires_known_format(self, tmp_path, beer_rows):
+        with pytest.raises(CommandError):
+            import_beers(str(write_csv(tmp_path / 'beers.txt', beer_rows)))
+
+
+@pytest.mark.django_db
+class TestBenchSerializers:
+    def test_benchmark_rolls_back_its_beers(self):
+        stdout = io.StringIO()
+
+        call_command('bench_serializers', beers=20, repeat=1, stdout=stdout)
+
+        assert 'Serialized 20 beers' in stdout.getvalue()
+        assert Beer.objects.count() == 0
+
+
+class TestBenchValidators:
+    def test_benchmark_reports_per_row_cost(self):
+        stdout = io.StringIO()
+
+        call_command('bench_validators', rows=30, repeat=1, stdout=stdout)
+
+        assert 'validate_many' in stdout.getvalue()
+        assert 'Speedup' in stdout.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBenchConcurrency:
+    def test_benchmark_removes_its_beers(self):
+        stdout = io.StringIO()
+
+        call_command('bench_concurrency', threads=2, seconds=0.3, write_ratio=0.5, stdout=stdout)
+
+        assert 'operations from 2 threads' in stdout.getvalue()
+        assert Beer.objects.count() == 0
@@ -0,0 +1,137 @@
+import logging
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from mixer.backend.django import mixer
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_403_FORBIDDEN
+from rest_framework.test import APIClient
+
+from beers.instrumentation import InstrumentationMiddleware, RequestMetrics, endpoint_metrics
+from beers.models import Beer
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    endpoint_metrics.reset()
+
+
+@pytest.fixture
+def client_with_user(db):
+    client = APIClient()
+    client.force_login(get_user_model().objects.create_user(username="testuser", password="testpass"))
+    return client
+
+
+@pytest.fixture
+def client_with_staff(db):
+    client = APIClient()
+    client.force_login(get_user_model().objects.create_user(username="staff", password="staffpass", is_staff=True))
+    return client
+
+
+@pytest.fixture
+def beers(db):
+    return [mixer.blend("beers.Beer", name=f"Beer {letter}", brewery="Brewery") for letter in "ABCDEF"]
+
+
+def server_timing(response):
+    return dict(entry.strip().split(';', 1) for entry in response["Server-Timing"].split(','))
+
+
+class TestServerTiming:
+    def test_header_reports_queries_and_phases(self, client_with_user, beers):
+        response = client_with_user.get(reverse("beer-list"))
+        assert response.status_code == HTTP_200_OK
+        timing = server_timing(response)
+        assert set(timing) == {"db", "serialize", "total"}
+        assert 'queries"' in timing["db"]
+        assert not timing["db"].endswith('desc="0 queries"')
+
+    def test_async_views_are_measured(self, client_with_user, beers):
+        response = client_with_user.get(reverse("async:beer-list"))
+        assert not server_timing(response)["db"].endswith('desc="0 queries"')
+
+    def test_header_can_be_disabled(self, client_with_user, beers, settings):
+        settings.BEERS_SERVER_TIMING = False
+        response = client_with_user.get(reverse("beer-list"))
+        assert "Server-Timing" not in response
+
+
+class TestEndpointMetrics:
+    def test_totals_per_endpoint(self, client_with_user, beers):
+        client_with_user.get(reverse("beer-list"))
+        response = client_with_user.get(reverse("beer-list"))
+        totals = endpoint_metrics.snapshot()[("beer-list", "GET")]
+        assert totals["requests"] == 2
+        assert totals["db_queries"] > 0
+        assert totals["serialization_duration"] > 0
+        assert totals["response_bytes"] == 2 * len(response.content)
+
+    def test_streamed_export_is_measured_when_consumed(self, client_with_user, beers):
+        response = client_with_user.get(reverse("beer-export"), {"format": "ndjson"})
+        assert "Server-Timing" not in response
+        assert ("beer-export", "GET") not in endpoint_metrics.snapshot()
+
+        content = b"".join(response.streaming_content)
+        totals = endpoint_metrics.snapshot()[("beer-export", "GET")]
+        assert totals["requests"] == 1
+        assert totals["db_queries"] > 0
+        assert totals["response_bytes"] == len(content)
+
+    def test_closed_stream_is_measured(self, beers):
+        def streaming_view(request):
+            return StreamingHttpResponse(beer.name for beer in Beer.objects.all())
+
+        response = InstrumentationMiddleware(streaming_view)(RequestFactory().get("/stream/"))
+        chunks = iter(response.streaming_content)
+        next(chunks)
+        response.close()
+        totals = endpoint_metrics.snapshot()[("unmatched", "GET")]
+        assert totals["db_queries"] == 1
+        assert totals["response_bytes"] == len("Beer A")
+
+    def test_prometheus_endpoint(self, client_with_staff, beers):
+        client_with_staff.get(reverse("beer-list"))
+        response = client_with_staff.get(reverse("metrics"))
+        assert response.status_code == HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain")
+        text = response.content.decode()
+        assert "# TYPE beers_http_requests_total counter" in text
+        assert 'beers_http_requests_total{endpoint="beer-list",method="GET"} 1' in text
+        assert 'beers_response_cache_misses_total{endpoint="list"}' in text
+
+    def test_prometheus_endpoint_requires_staff(self, client_with_user):
+        response = client_with_user.get(reverse("metrics"))
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+
+def n_plus_one_view(request):
+    for beer in Beer.objects.all():
+        Beer.objects.get(pk=beer.pk)
+    return HttpResponse("ok")
+
+
+class TestNPlusOneDetection:
+    def test_repeated_query_is_logged(self, beers, caplog):
+        middleware = InstrumentationMiddleware(n_plus_one_view)
+        with caplog.at_level(logging.WARNING, logger="beers.instrumentation"):
+            middleware(RequestFactory().get("/n-plus-one/"))
+
+        assert len(caplog.records) == 1
+        assert f"{len(beers)} executions of SELECT" in caplog.records[0].getMessage()
+        assert endpoint_metrics.snapshot()[("unmatched", "GET")]["nplusone"] == 1
+
+    def test_below_threshold_is_not_logged(self, beers, caplog, settings):
+        settings.BEERS_NPLUSONE_THRESHOLD = len(beers) + 1
+        with caplog.at_level(logging.WARNING, logger="beers.instrumentation"):
+            InstrumentationMiddleware(n_plus_one_view)(RequestFactory().get("/n-plus-one/"))
+        assert not caplog.records
+
+    def test_repeated_writes_are_not_reported(self):
+        metrics = RequestMetrics()
+        metrics.statements['INSERT INTO "beers_beer" VALUES (%s)'] = 10
+        metrics.statements['SELECT 1'] = 2
+        assert metrics.repeated_statements(2) == [('SELECT 1', 2)]
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from mixer.backend.django import mixer
 
+from beers.models import Beer, Brewery
 from beers.validation.validation_constants import MAX_NAME_LENGTH, MAX_DESCRIPTION_LENGTH, MAX_BREWERY_LENGTH
 
 @pytest.fixture
@@ -248,4 +249,63 @@ class TestBeerUniqueConstraint:
 @pytest.mark.django_db
 def test_beer_str_method(beer_args):
     beer = mixer.blend('beers.Beer', **beer_args)
-    assert str(beer) == beer_args['name']
\ No newline at end of file
+    assert str(beer) == beer_args['name']
+
+
+def brewery_counts():
+    return dict(Brewery.objects.values_list('name', 'beer_count'))
+
+
+@pytest.mark.django_db
+class TestBreweryAggregate:
+    def test_creating_beers_counts_breweries(self):
+        mixer.blend('beers.Beer', brewery='Brewery 1')
+        mixer.blend('beers.Beer', brewery='Brewery 1')
+        mixer.blend('beers.Beer', brewery='Brewery 2')
+        assert brewery_counts() == {'Brewery 1': 2, 'Brewery 2': 1}
+
+    def test_updating_brewery_moves_beer(self):
+        beer = mixer.blend('beers.Beer', brewery='Brewery 1')
+        mixer.blend('beers.Beer', brewery='Brewery 2')
+        beer = Beer.objects.get(pk=beer.pk)
+        beer.brewery = 'Brewery 2'
+        beer.save()
+        assert brewery_counts() == {'Brewery 2': 2}
+
+    def test_updating_other_fields_keeps_counts(self):
+        beer = mixer.blend('beers.Beer', brewery='Brewery 1')
+        beer.name = 'Renamed Beer'
+        beer.save()
+        assert brewery_counts() == {'Brewery 1': 1}
+
+    def test_saving_other_fields_ignores_unsaved_brewery(self):
+        beer = Beer.objects.get(pk=mixer.blend('beers.Beer', brewery='Brewery 1').pk)
+        beer.brewery = 'Brewery 2'
+        beer.name = 'Renamed Beer'
+        beer.save(update_fields=['name'])
+        assert brewery_counts() == {'Brewery 1': 1}
+
+        beer.save(update_fields=['brewery'])
+        assert brewery_counts() == {'Brewery 2': 1}
+
+    def test_deleting_removes_beer_from_stored_brewery(self):
+        mixer.blend('beers.Beer', brewery='Brewery 2')
+        beer = Beer.objects.get(pk=mixer.blend('beers.Beer', brewery='Brewery 1').pk)
+        beer.brewery = 'Brewery 2'
+        beer.delete()
+        assert brewery_counts() == {'Brewery 2': 1}
+
+    def test_deleting_beers_removes_empty_breweries(self):
+        beer = mixer.blend('beers.Beer', brewery='Brewery 1')
+        mixer.blend('beers.Beer', brewery='Brewery 2')
+        mixer.blend('beers.Beer', brewery='Brewery 2')
+        beer.delete()
+        Beer.objects.filter(brewery='Brewery 2').delete()
+        assert brewery_counts() == {}
+
+    def test_recount_after_bulk_create(self, beer_args):
+        Beer.objects.bulk_create([Beer(**beer_args)])
+        assert brewery_counts() == {}
+        Brewery.objects.recount()
+        assert brewery_counts() == {beer_args['brewery']: 1}
+
@@ -0,0 +1,100 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import mixer
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+from rest_framework.status import HTTP_201_CREATED, HTTP_403_FORBIDDEN
+from rest_framework.test import APIClient
+
+from beers.permissions import EDITOR_GROUP, is_beer_editor
+
+
+@pytest.fixture
+def editor_group(db):
+    return mixer.blend('auth.Group', name=EDITOR_GROUP)
+
+
+@pytest.fixture
+def editor(editor_group):
+    user = get_user_model().objects.create_user(username="editor", password="editorpass")
+    user.groups.add(editor_group)
+    return get_user_model().objects.get(pk=user.pk)
+
+
+@pytest.fixture
+def token_client(editor):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=editor).key}')
+    return client
+
+
+@pytest.fixture
+def valid_beer_args():
+    return {
+        'name': 'Valid Beer Name',
+        'brewery': 'Valid Brewery',
+        'description': 'A valid description.',
+        'alcohol_content': '5.0',
+        'beer_type': 'Pale Lager'
+    }
+
+
+@pytest.mark.django_db
+class TestEditorPermissionCache:
+    def test_membership_is_cached(self, editor, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            assert is_beer_editor(editor)
+        with django_assert_num_queries(0):
+            assert is_beer_editor(editor)
+
+    def test_anonymous_user_is_no_editor(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert not is_beer_editor(AnonymousUser())
+
+    def test_removing_user_from_group_invalidates(self, editor, editor_group, django_capture_on_commit_callbacks):
+        assert is_beer_editor(editor)
+        with django_capture_on_commit_callbacks(execute=True):
+            editor.groups.remove(editor_group)
+        assert not is_beer_editor(editor)
+
+    def test_adding_user_on_group_side_invalidates(self, editor_group, django_capture_on_commit_callbacks):
+        user = get_user_model().objects.create_user(username="newbie", password="newbiepass")
+        assert not is_beer_editor(user)
+        with django_capture_on_commit_callbacks(execute=True):
+            editor_group.user_set.add(user)
+        assert is_beer_editor(user)
+
+    def test_clearing_group_invalidates(self, editor, editor_group, django_capture_on_commit_callbacks):
+        assert is_beer_editor(editor)
+        with django_capture_on_commit_callbacks(execute=True):
+            editor_group.user_set.clear()
+        assert not is_beer_editor(editor)
+
+    def test_renaming_group_invalidates(self, editor, editor_group, django_capture_on_commit_callbacks):
+        assert is_beer_editor(editor)
+        editor_group.name = 'former_editors'
+        with django_capture_on_commit_callbacks(execute=True):
+            editor_group.save()
+        assert not is_beer_editor(editor)
+
+
+@pytest.mark.django_db
+class TestTokenAuthentication:
+    def test_write_with_token_checks_prefetched_groups(self, token_client, valid_beer_args):
+        with CaptureQueriesContext(connection) as context:
+            response = token_client.post(reverse('beer-list'), valid_beer_args, format='json')
+
+        assert response.status_code == HTTP_201_CREATED
+        assert not [query for query in context.captured_queries if EDITOR_GROUP in query['sql']]
+
+    def test_write_with_token_as_standard_user(self, db, valid_beer_args):
+        user = get_user_model().objects.create_user(username="testuser", password="testpass")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+
+        response = client.post(reverse('beer-list'), valid_beer_args, format='json')
+
+        assert response.status_code == HTTP_403_FORBIDDEN
@@ -0,0 +1,144 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from beers.models import Beer
+from beers.cache import response_cache
+from beers.replicas import ReplicaRouter, replica_queries, replica_reads
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Runs in a separate process configured with a primary and a replica SQLite file
+REPLICATION_SCRIPT = """
+import json, sqlite3
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework.request import Request
+from rest_framework.response import Response
+from django.test import Client
+from beers.models import Beer
+
+user = get_user_model().objects.create_user(username='reader', password='readerpass')
+Beer.objects.create(name='Replicated Beer', brewery='Replica Brewery', description='Old.',
+                    alcohol_content='5.0', beer_type='Pale Lager')
+
+# replicate the current state, then write to the primary only
+with sqlite3.connect(settings.DATABASES['default']['NAME']) as primary, \\
+        sqlite3.connect(settings.DATABASES['replica1']['NAME']) as replica:
+    primary.backup(replica)
+Beer.objects.create(name='Fresh Beer', brewery='Primary Brewery', description='New.',
+                    alcohol_content='5.0', beer_type='Pale Lager')
+
+client = Client(HTTP_HOST='localhost')
+client.force_login(user)
+print(json.dumps({
+    'list': [beer['name'] for beer in client.get('/api/v1/beers/').json()],
+    'async_list': [beer['name'] for beer in client.get('/api/v1/async/beers/').json()],
+    'breweries': client.get('/api/v1/breweries/').json(),
+    'repeated_list_cache': client.get('/api/v1/beers/')['X-Cache'],
+    'outside_request': sorted(Beer.objects.values_list('name', flat=True)),
+}))
+"""
+
+
+class TestReplicaRouter:
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        settings.BEERS_REPLICAS = ['replica1']
+
+    def test_reads_outside_read_actions_use_primary(self):
+        assert ReplicaRouter().db_for_read(Beer) == 'default'
+
+    def test_reads_of_read_actions_use_replica(self):
+        with replica_reads():
+            assert ReplicaRouter().db_for_read(Beer) == 'replica1'
+
+    def test_other_apps_use_primary(self):
+        with replica_reads():
+            assert ReplicaRouter().db_for_read(get_user_model()) == 'default'
+
+    def test_reads_after_write_use_primary(self):
+        router = ReplicaRouter()
+        with replica_reads():
+            assert router.db_for_write(Beer) == 'default'
+            assert router.db_for_read(Beer) == 'default'
+        with replica_reads():
+            assert router.db_for_read(Beer) == 'replica1'
+
+    def test_replica_queries_are_counted(self):
+        with replica_reads():
+            ReplicaRouter().db_for_read(Beer)
+            ReplicaRouter().db_for_read(get_user_model())
+            assert replica_queries() == 1
+        assert replica_queries() == 0
+
+    def test_without_replicas(self, settings):
+        settings.BEERS_REPLICAS = []
+        with replica_reads():
+            assert ReplicaRouter().db_for_read(Beer) == 'default'
+
+
+class TestReplicaResponseCache:
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        settings.BEERS_REPLICAS = ['replica1']
+        settings.BEERS_REPLICA_LAG = 5
+
+    @pytest.fixture
+    def request_(self, rf):
+        return Request(rf.get('/api/v1/beers/'))
+
+    def read(self, request, database):
+        def compute():
+            if database == 'replica':
+                ReplicaRouter().db_for_read(Beer)
+            return Response(database)
+
+        with replica_reads():
+            return response_cache.fetch('list', request, compute)
+
+    def test_replica_response_right_after_write_is_not_cached(self, request_):
+        response_cache.invalidate()
+        assert self.read(request_, 'replica').data == 'replica'
+        assert response_cache.backend.get(response_cache.key(request_)) is None
+
+    def test_replica_response_is_cached_once_replicas_caught_up(self, request_, monkeypatch):
+        response_cache.invalidate()
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + 5)
+        self.read(request_, 'replica')
+        assert response_cache.backend.get(response_cache.key(request_)) == 'replica'
+
+    def test_primary_response_right_after_write_is_cached(self, request_):
+        response_cache.invalidate()
+        self.read(request_, 'primary')
+        assert response_cache.backend.get(response_cache.key(request_)) == 'primary'
+
+
+class TestReplicaDeployment:
+    def manage(self, env, *args):
+        return subprocess.run([sys.executable, 'manage.py', *args], cwd=BACKEND_DIR, env=env,
+                              capture_output=True, text=True, check=True).stdout
+
+    def test_read_actions_are_served_by_replica(self, tmp_path):
+        env = {**os.environ, 'DB_NAME': str(tmp_path / 'primary.sqlite3'),
+               'DB_REPLICAS': str(tmp_path / 'replica.sqlite3'), 'DJANGO_SETTINGS_MODULE': 'backend.settings'}
+        self.manage(env, 'migrate', '--verbosity', '0')
+
+        output = self.manage(env, 'shell', '--command', REPLICATION_SCRIPT)
+        result = json.loads(output.strip().splitlines()[-1])
+
+        assert result['list'] == ['Replicated Beer']
+        assert result['async_list'] == ['Replicated Beer']
+        assert result['breweries'] == ['Replica Brewery']
+        # the replica lags behind the write, its response is not cached
+        assert result['repeated_list_cache'] == 'MISS'
+        assert result['outside_request'] == ['Fresh Beer', 'Replicated Beer']
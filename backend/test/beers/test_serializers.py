@@ -0,0 +1,83 @@
+import datetime
+import decimal
+from unittest.mock import patch
+
+import orjson
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+from mixer.backend.django import mixer
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from beers.models import Beer
+from beers.renderers import FastJSONRenderer
+from beers.serializers import BeerSerializer, BeerValuesSerializer, BulkDeleteSerializer
+
+
+@pytest.fixture
+def beers(db):
+    return [
+        mixer.blend('beers.Beer', name='Gösser Märzen', description='Smooth, malty: "classic"!',
+                    alcohol_content=decimal.Decimal('5.2')),
+        mixer.blend('beers.Beer', name='Zero', beer_type='Alcohol-Free Lager',
+                    alcohol_content=decimal.Decimal('0')),
+        mixer.blend('beers.Beer', name='Strong', alcohol_content=decimal.Decimal('74.99')),
+    ]
+
+
+def serialize_both(queryset):
+    expected = BeerSerializer(queryset, many=True).data
+    actual = BeerValuesSerializer(BeerValuesSerializer.values(queryset)).data
+    return expected, actual
+
+
+class TestBeerValuesSerializer:
+    def test_output_equals_beer_serializer(self, beers):
+        expected, actual = serialize_both(Beer.objects.order_by('id'))
+        assert actual == expected
+
+    @override_settings(TIME_ZONE='UTC')
+    def test_output_equals_beer_serializer_in_utc(self, beers):
+        expected, actual = serialize_both(Beer.objects.order_by('id'))
+        assert actual == expected
+        assert actual[0]['created_at'].endswith('Z')
+
+    def test_output_equals_beer_serializer_in_active_time_zone(self, beers):
+        with timezone.override(datetime.timezone(datetime.timedelta(hours=-5))):
+            expected, actual = serialize_both(Beer.objects.order_by('id'))
+        assert actual == expected
+
+
+class TestFastJSONRenderer:
+    def test_output_equals_json_renderer(self):
+        data = {
+            'text': 'Märzen   "quoted" \\ \n',
+            'decimal': decimal.Decimal('5.20'),
+            'datetime': datetime.datetime(2024, 12, 12, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'nested': [{'id': 1, 'none': None, 'flag': True}],
+            1: 'integer key',
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_renders_with_orjson(self):
+        with patch('beers.renderers.orjson.dumps', wraps=orjson.dumps) as dumps:
+            assert FastJSONRenderer().render([{'id': 1}]) == b'[{"id":1}]'
+        dumps.assert_called_once()
+
+    def test_indented_output_equals_json_renderer(self):
+        data = [{'id': 1, 'name': 'Beer'}]
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+
+
+class TestBulkDeleteSerializer:
+    def test_beer_deleted_after_validation_is_reported(self, beers):
+        serializer = BulkDeleteSerializer(data={'ids': [beer.id for beer in beers]})
+        assert serializer.is_valid()
+        beers[1].delete()
+
+        with pytest.raises(ValidationError) as error:
+            serializer.save()
+        assert list(error.value.detail['ids']) == [1]
+        assert Beer.objects.count() == 2
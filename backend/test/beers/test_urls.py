@@ -1,12 +1,20 @@
+import csv
+import io
 import pytest
 import json
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models.functions import Lower
+from django.test.utils import CaptureQueriesContext
 from rest_framework.reverse import reverse
 from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT, HTTP_403_FORBIDDEN, \
-    HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+    HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_304_NOT_MODIFIED
 from mixer.backend.django import mixer
 from rest_framework.test import APIClient
 
+from beers.cache import response_cache
+from beers.models import Beer, Brewery
+
 def get_client(user=None):
     client = APIClient()
     if user is not None:
@@ -145,6 +153,171 @@ class TestBeerRetrieval:
         assert len(response.data) == len(beers)
 
 
+class TestBeerPagination:
+    def test_list_without_pagination_parameters_returns_plain_list(self, client_with_user, beers):
+        url = reverse("beer-list")
+        response = client_with_user.get(url)
+        assert response.status_code == HTTP_200_OK
+        assert isinstance(response.data, list)
+
+    def test_list_with_page_size_returns_first_page(self, client_with_user, beers):
+        url = reverse("beer-list")
+        response = client_with_user.get(url, {"page_size": 1})
+        assert response.status_code == HTTP_200_OK
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["id"] == beers[0].id
+        assert response.data["previous"] is None
+        assert response.data["next"] is not None
+
+    def test_list_follows_cursor_to_next_page(self, client_with_user, beers):
+        url = reverse("beer-list")
+        first_page = client_with_user.get(url, {"page_size": 1})
+        response = client_with_user.get(first_page.data["next"])
+        assert response.status_code == HTTP_200_OK
+        assert [beer["id"] for beer in response.data["results"]] == [beers[1].id]
+        assert response.data["next"] is None
+
+    def test_list_ordered_by_created_at(self, client_with_user, beers):
+        url = reverse("beer-list")
+        response = client_with_user.get(url, {"page_size": 10, "ordering": "created_at"})
+        assert response.status_code == HTTP_200_OK
+        assert [beer["id"] for beer in response.data["results"]] == [beer.id for beer in beers]
+
+    @pytest.mark.parametrize("ordering", ["alcohol_content", "-alcohol_content", "name"])
+    def test_tied_orderings_are_paged_by_keyset(self, client_with_user, db, ordering):
+        for index in range(7):
+            mixer.blend("beers.Beer", name=f"Beer {index % 2}", alcohol_content=f"{index % 2 + 5}.00")
+        expected = [beer["id"] for beer in client_with_user.get(reverse("beer-list"), {"ordering": ordering}).data]
+
+        ids, pages = [], []
+        url, params = reverse("beer-list"), {"page_size": 2, "ordering": ordering}
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                response = client_with_user.get(url, params)
+                pages.append(response.data)
+                ids += [beer["id"] for beer in response.data["results"]]
+                url, params = response.data["next"], None
+        assert ids == expected
+        assert not any("OFFSET" in query["sql"] for query in context.captured_queries)
+
+        # and back from the last page
+        response = client_with_user.get(pages[-1]["previous"])
+        assert response.data["results"] == pages[-2]["results"]
+
+    def test_invalid_cursor_fails(self, client_with_user, beers):
+        response = client_with_user.get(reverse("beer-list"), {"page_size": 1, "cursor": "cD1ub3Rqc29u"})
+        assert response.status_code == HTTP_404_NOT_FOUND
+
+    def test_list_with_invalid_ordering_fails(self, client_with_user, beers):
+        url = reverse("beer-list")
+        response = client_with_user.get(url, {"page_size": 1, "ordering": "description"})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+@pytest.fixture
+def filterable_beers(db):
+    return [
+        mixer.blend("beers.Beer", name="Bravo", brewery="North", beer_type="Pilsner", alcohol_content="4.80"),
+        mixer.blend("beers.Beer", name="Alpha", brewery="South", beer_type="Bock", alcohol_content="7.20"),
+        mixer.blend("beers.Beer", name="Charlie", brewery="North", beer_type="Bock", alcohol_content="6.50"),
+        mixer.blend("beers.Beer", name="Delta", brewery="North", beer_type="Pilsner", alcohol_content="0.00"),
+    ]
+
+
+class TestBeerFiltering:
+    def names(self, client, **params):
+        response = client.get(reverse("beer-list"), params)
+        assert response.status_code == HTTP_200_OK
+        return [beer["name"] for beer in response.data]
+
+    def test_order_by_alcohol_content(self, client_with_user, filterable_beers):
+        assert self.names(client_with_user, ordering="alcohol_content") == ["Delta", "Bravo", "Charlie", "Alpha"]
+        assert self.names(client_with_user, ordering="-alcohol_content") == ["Alpha", "Charlie", "Bravo", "Delta"]
+
+    def test_order_by_name(self, client_with_user, filterable_beers):
+        assert self.names(client_with_user, ordering="name") == ["Alpha", "Bravo", "Charlie", "Delta"]
+
+    def test_alcohol_content_range(self, client_with_user, filterable_beers):
+        assert self.names(client_with_user, abv_min="4.8", abv_max="6.5") == ["Bravo", "Charlie"]
+
+    def test_filter_by_beer_type_and_brewery(self, client_with_user, filterable_beers):
+        assert self.names(client_with_user, beer_type="Bock", brewery="North") == ["Charlie"]
+
+    def test_invalid_range_fails(self, client_with_user, filterable_beers):
+        response = client_with_user.get(reverse("beer-list"), {"abv_min": "strong"})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert "abv_min" in response.data
+
+    def test_sparse_fields(self, client_with_user, filterable_beers):
+        response = client_with_user.get(reverse("beer-list"), {"fields": "name,alcohol_content", "ordering": "name"})
+        assert response.status_code == HTTP_200_OK
+        assert response.data[0] == {"name": "Alpha", "alcohol_content": "7.20"}
+
+    def test_unknown_field_fails(self, client_with_user, filterable_beers):
+        response = client_with_user.get(reverse("beer-list"), {"fields": "name,password"})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert "fields" in response.data
+
+    def test_paginated_ordering_and_sparse_fields(self, client_with_user, filterable_beers):
+        url = reverse("beer-list")
+        response = client_with_user.get(url, {"page_size": 2, "ordering": "-alcohol_content", "fields": "name"})
+        assert [beer for beer in response.data["results"]] == [{"name": "Alpha"}, {"name": "Charlie"}]
+
+        response = client_with_user.get(response.data["next"])
+        assert [beer["name"] for beer in response.data["results"]] == ["Bravo", "Delta"]
+
+    def test_filters_are_part_of_the_etag(self, client_with_user, filterable_beers):
+        url = reverse("beer-list")
+        etag = client_with_user.get(url, {"brewery": "North"})["ETag"]
+        assert client_with_user.get(url, {"brewery": "South"})["ETag"] != etag
+
+
+class TestBeerCount:
+    def test_count(self, client_with_user, filterable_beers):
+        response = client_with_user.get(reverse("beer-count"))
+        assert response.status_code == HTTP_200_OK
+        assert response.data == {"count": 4}
+
+    def test_count_with_filters(self, client_with_user, filterable_beers):
+        response = client_with_user.get(reverse("beer-count"), {"brewery": "North", "abv_min": "1"})
+        assert response.data == {"count": 2}
+
+    def test_count_is_a_single_count_query(self, client_with_user, filterable_beers):
+        client_with_user.get(reverse("beer-list"))  # session and permission lookups
+        with CaptureQueriesContext(connection) as context:
+            client_with_user.get(reverse("beer-count"))
+        beer_queries = [query["sql"] for query in context.captured_queries if "beers_beer" in query["sql"]]
+        assert len(beer_queries) == 1
+        assert "COUNT(*)" in beer_queries[0]
+
+    def test_head_list_reports_total_count(self, client_with_user, filterable_beers):
+        response = client_with_user.head(reverse("beer-list"), {"beer_type": "Bock"})
+        assert response.status_code == HTTP_200_OK
+        assert response["X-Total-Count"] == "2"
+        assert response.content == b""
+
+    def test_get_list_reports_total_count(self, client_with_user, filterable_beers):
+        response = client_with_user.get(reverse("beer-list"))
+        assert response["X-Total-Count"] == "4"
+        assert len(response.data) == 4
+
+    def test_head_does_not_poison_the_cache(self, client_with_user, filterable_beers):
+        client_with_user.head(reverse("beer-list"))
+        response = client_with_user.get(reverse("beer-list"))
+        assert response["X-Cache"] == "MISS"
+        assert len(response.data) == 4
+
+    def test_head_brewery_listings(self, client_with_user, filterable_beers):
+        response = client_with_user.head(reverse("breweries:list-breweries"))
+        assert response["X-Total-Count"] == "2"
+        url = reverse("breweries:get-beers-by-brewery", kwargs={"brewery_name": "North"})
+        assert client_with_user.head(url)["X-Total-Count"] == "3"
+
+    def test_count_unauthenticated(self, client, filterable_beers):
+        assert client.get(reverse("beer-count")).status_code == HTTP_403_FORBIDDEN
+        assert client.head(reverse("beer-list")).status_code == HTTP_403_FORBIDDEN
+
+
 class TestBeerRetrievalByName:
     def test_get_beer_by_exact_name(self, client_with_user, beer):
         url = reverse("beers:get-beer-by-name-path", kwargs={"beer_name": beer.name})
@@ -175,6 +348,329 @@ class TestBeerRetrievalByName:
         assert response.status_code == HTTP_403_FORBIDDEN
 
 
+@pytest.fixture
+def searchable_beers(db):
+    return [
+        mixer.blend("beers.Beer", name="Hoppy Lager", brewery="Brewery 1",
+                    description="A crisp lager."),
+        mixer.blend("beers.Beer", name="Dark Bock", brewery="Brewery 1",
+                    description="Malty and slightly hoppy."),
+        mixer.blend("beers.Beer", name="Wheat Beer", brewery="Brewery 2",
+                    description="Cloudy with notes of banana."),
+    ]
+
+
+class TestBeerSearch:
+    def test_search_matches_name_and_description_ranked_by_name(self, client_with_user, searchable_beers):
+        url = reverse("beer-search")
+        response = client_with_user.get(url, {"q": "hoppy"})
+        assert response.status_code == HTTP_200_OK
+        assert [beer["name"] for beer in response.data] == ["Hoppy Lager", "Dark Bock"]
+
+    def test_search_matches_word_prefixes(self, client_with_user, searchable_beers):
+        url = reverse("beer-search")
+        response = client_with_user.get(url, {"q": "banan clou"})
+        assert response.status_code == HTTP_200_OK
+        assert [beer["name"] for beer in response.data] == ["Wheat Beer"]
+
+    def test_search_ignores_query_syntax(self, client_with_user, searchable_beers):
+        url = reverse("beer-search")
+        response = client_with_user.get(url, {"q": 'lager" OR NEAR(*'})
+        assert response.status_code == HTTP_200_OK
+
+    def test_search_follows_updates_and_deletes(self, client_with_user, searchable_beers):
+        url = reverse("beer-search")
+        searchable_beers[0].name = "Crisp Pils"
+        searchable_beers[0].save()
+        searchable_beers[1].delete()
+        response = client_with_user.get(url, {"q": "hoppy"})
+        assert response.data == []
+
+    def test_search_respects_limit(self, client_with_user, searchable_beers):
+        url = reverse("beer-search")
+        response = client_with_user.get(url, {"q": "hoppy", "limit": 1})
+        assert len(response.data) == 1
+
+    def test_search_without_query_fails(self, client_with_user, searchable_beers):
+        url = reverse("beer-search")
+        response = client_with_user.get(url, {"q": " "})
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+    def test_search_unauthenticated(self, client, searchable_beers):
+        url = reverse("beer-search")
+        response = client.get(url, {"q": "hoppy"})
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+
+class TestResponseCache:
+    def test_repeated_read_is_served_from_cache(self, client_with_user, beers):
+        url = reverse("beer-list")
+        first = client_with_user.get(url)
+        second = client_with_user.get(url)
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+
+    def test_query_string_is_part_of_the_key(self, client_with_user, beers):
+        url = reverse("beer-list")
+        client_with_user.get(url)
+        response = client_with_user.get(url, {"page_size": 1})
+        assert response["X-Cache"] == "MISS"
+        assert len(response.data["results"]) == 1
+
+    def test_write_invalidates_cached_reads(self, client_with_admin, beers, valid_beer_args,
+                                            django_capture_on_commit_callbacks):
+        url = reverse("beer-list")
+        client_with_admin.get(url)
+        with django_capture_on_commit_callbacks(execute=True):
+            client_with_admin.post(url, valid_beer_args, format="json")
+        response = client_with_admin.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert len(response.data) == len(beers) + 1
+
+    def test_invalidation_waits_for_commit(self, client_with_admin, beers, valid_beer_args,
+                                           django_capture_on_commit_callbacks):
+        url = reverse("beer-list")
+        client_with_admin.get(url)
+        with django_capture_on_commit_callbacks() as callbacks:
+            client_with_admin.post(url, valid_beer_args, format="json")
+        # not committed yet, a read must not cache the write under a new generation
+        assert client_with_admin.get(url)["X-Cache"] == "HIT"
+
+        for callback in callbacks:
+            callback()
+        assert client_with_admin.get(url)["X-Cache"] == "MISS"
+
+    def test_delete_invalidates_cached_breweries(self, client_with_admin, breweries,
+                                                 django_capture_on_commit_callbacks):
+        url = reverse("breweries:number-of-breweries")
+        client_with_admin.get(url)
+        with django_capture_on_commit_callbacks(execute=True):
+            client_with_admin.delete(reverse("beer-detail", args=[breweries[1].id]))
+        response = client_with_admin.get(url)
+        assert response.data["count"] == 1
+
+    def test_permissions_are_checked_before_cache(self, client, client_with_user, beers):
+        url = reverse("beer-list")
+        client_with_user.get(url)
+        response = client.get(url)
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+    def test_hits_and_misses_are_counted(self, client_with_user, beers):
+        response_cache.reset_stats()
+        url = reverse("breweries:list-breweries")
+        client_with_user.get(url)
+        client_with_user.get(url)
+        client_with_user.get(url)
+        assert response_cache.stats() == {"list_breweries": {"hits": 2, "misses": 1}}
+
+
+class TestConditionalRequests:
+    def test_list_sends_validators(self, client_with_user, beers):
+        response = client_with_user.get(reverse("beer-list"))
+        assert response.status_code == HTTP_200_OK
+        assert response["ETag"].startswith('W/"')
+        assert "Last-Modified" in response
+
+    def test_list_not_modified_costs_one_query(self, client_with_user, beers):
+        url = reverse("beer-list")
+        etag = client_with_user.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as context:
+            response = client_with_user.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+        assert not response.content
+        assert len([query for query in context.captured_queries if '"beers_beer"' in query["sql"]]) == 1
+
+    def test_list_modified_after_update(self, client_with_admin, beers, valid_beer_args):
+        url = reverse("beer-list")
+        etag = client_with_admin.get(url)["ETag"]
+        client_with_admin.put(reverse("beer-detail", args=[beers[0].id]), valid_beer_args, format="json")
+        response = client_with_admin.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_list_modified_after_delete(self, client_with_admin, beers, django_capture_on_commit_callbacks):
+        url = reverse("beer-list")
+        etag = client_with_admin.get(url)["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            client_with_admin.delete(reverse("beer-detail", args=[beers[0].id]))
+        response = client_with_admin.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_200_OK
+        assert len(response.data) == 1
+
+    def test_list_not_modified_since(self, client_with_user, beers):
+        url = reverse("beer-list")
+        last_modified = client_with_user.get(url)["Last-Modified"]
+        response = client_with_user.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    def test_retrieve_not_modified(self, client_with_user, beer):
+        url = reverse("beer-detail", args=[beer.id])
+        etag = client_with_user.get(url)["ETag"]
+        response = client_with_user.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    def test_retrieve_invalid_id_with_etag(self, client_with_user):
+        url = reverse("beer-detail", args=["invalidId"])
+        response = client_with_user.get(url, HTTP_IF_NONE_MATCH='W/"stale"')
+        assert response.status_code == HTTP_404_NOT_FOUND
+
+    def test_breweries_not_modified(self, client_with_user, breweries):
+        url = reverse("breweries:list-breweries")
+        etag = client_with_user.get(url)["ETag"]
+        response = client_with_user.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    def test_beers_by_brewery_not_modified(self, client_with_user, breweries):
+        url = reverse("breweries:get-beers-by-brewery", kwargs={"brewery_name": "Brewery 1"})
+        etag = client_with_user.get(url)["ETag"]
+        response = client_with_user.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+    def test_conditional_request_unauthenticated(self, client, client_with_user, beers):
+        url = reverse("beer-list")
+        etag = client_with_user.get(url)["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+
+def bulk_beer_args(count, brewery="Bulk Brewery"):
+    names = ["Alpha", "Bravo", "Charlie", "Delta", "Echo", "Foxtrot", "Golf", "Hotel", "India", "Juliett"]
+    return [{
+        'name': f'{names[index % len(names)]} Beer {"I" * (index // len(names) + 1)}',
+        'brewery': brewery,
+        'description': 'A valid description.',
+        'alcohol_content': '5.0',
+        'beer_type': 'Pale Lager'
+    } for index in range(count)]
+
+
+class TestBulkOperations:
+    def test_bulk_create(self, client_with_admin):
+        url = reverse("beer-bulk")
+        response = client_with_admin.post(url, bulk_beer_args(3), format="json")
+        assert response.status_code == HTTP_201_CREATED
+        assert [beer["name"] for beer in response.data] == [beer["name"] for beer in bulk_beer_args(3)]
+        assert all(beer["id"] for beer in response.data)
+        assert Brewery.objects.get(name="Bulk Brewery").beer_count == 3
+
+    def test_bulk_create_query_count_does_not_grow_with_batch(self, client_with_admin):
+        url = reverse("beer-bulk")
+        with CaptureQueriesContext(connection) as context:
+            response = client_with_admin.post(url, bulk_beer_args(50), format="json")
+        assert response.status_code == HTTP_201_CREATED
+        assert len(context.captured_queries) < 20
+
+    def test_bulk_create_reports_errors_per_item(self, client_with_admin):
+        url = reverse("beer-bulk")
+        beers = bulk_beer_args(3)
+        beers[1]["beer_type"] = "InvalidType"
+        response = client_with_admin.post(url, beers, format="json")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert list(response.data) == [1]
+        assert "beer_type" in response.data[1]
+        assert Beer.objects.count() == 0
+
+    def test_bulk_create_rejects_duplicates_in_batch_and_database(self, client_with_admin):
+        url = reverse("beer-bulk")
+        client_with_admin.post(url, bulk_beer_args(1), format="json")
+        response = client_with_admin.post(url, bulk_beer_args(2) + bulk_beer_args(2)[1:], format="json")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert sorted(response.data) == [0, 2]
+        assert Beer.objects.count() == 1
+
+    def test_bulk_update(self, client_with_admin, beers):
+        url = reverse("beer-bulk")
+        updates = bulk_beer_args(2, brewery="Moved Brewery")
+        for update, beer in zip(updates, beers):
+            update["id"] = beer.id
+        response = client_with_admin.put(url, updates, format="json")
+        assert response.status_code == HTTP_200_OK
+        assert [beer["brewery"] for beer in response.data] == ["Moved Brewery", "Moved Brewery"]
+        assert list(Brewery.objects.values_list("name", "beer_count")) == [("Moved Brewery", 2)]
+
+    def test_bulk_update_accepts_numeric_string_ids(self, client_with_admin, beers):
+        url = reverse("beer-bulk")
+        updates = bulk_beer_args(2, brewery="Moved Brewery")
+        for update, beer in zip(updates, beers):
+            update["id"] = str(beer.id)
+        response = client_with_admin.put(url, updates, format="json")
+        assert response.status_code == HTTP_200_OK
+        assert [beer["id"] for beer in response.data] == [beer.id for beer in beers[:2]]
+
+    def test_bulk_update_unknown_id_fails(self, client_with_admin, beers):
+        url = reverse("beer-bulk")
+        updates = bulk_beer_args(2)
+        updates[0]["id"] = beers[0].id
+        updates[1]["id"] = 999999
+        response = client_with_admin.put(url, updates, format="json")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert list(response.data) == [1]
+        assert "id" in response.data[1]
+
+    def test_bulk_delete(self, client_with_admin, beers):
+        url = reverse("beer-bulk")
+        ids = [beer.id for beer in beers]
+        response = client_with_admin.delete(url, {"ids": ids}, format="json")
+        assert response.status_code == HTTP_200_OK
+        assert [result["id"] for result in response.data] == ids
+        assert Beer.objects.count() == 0
+        assert Brewery.objects.count() == 0
+
+    def test_bulk_delete_query_count_does_not_grow_with_batch(self, client_with_admin,
+                                                              django_capture_on_commit_callbacks):
+        url = reverse("beer-bulk")
+        query_counts = []
+        for count in (10, 50):
+            beers = Beer.objects.bulk_create(Beer(**beer) for beer in bulk_beer_args(count))
+            with CaptureQueriesContext(connection) as context, django_capture_on_commit_callbacks() as callbacks:
+                response = client_with_admin.delete(url, {"ids": [beer.id for beer in beers]}, format="json")
+            assert response.status_code == HTTP_200_OK
+            query_counts.append(len(context.captured_queries))
+            assert len(callbacks) == 1
+        assert query_counts[0] == query_counts[1]
+        assert Beer.objects.count() == 0
+
+    def test_bulk_delete_unknown_id_deletes_nothing(self, client_with_admin, beers):
+        url = reverse("beer-bulk")
+        response = client_with_admin.delete(url, {"ids": [beers[0].id, 999999]}, format="json")
+        assert response.status_code == HTTP_400_BAD_REQUEST
+        assert list(response.data["ids"]) == [1]
+        assert Beer.objects.count() == len(beers)
+
+    def test_bulk_as_standard_user(self, client_with_user):
+        url = reverse("beer-bulk")
+        response = client_with_user.post(url, bulk_beer_args(1), format="json")
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+
+class TestBeerExport:
+    def test_export_ndjson_matches_list(self, client_with_user, beers):
+        listed = client_with_user.get(reverse("beer-list")).data
+        response = client_with_user.get(reverse("beer-export"), {"format": "ndjson"})
+        assert response.status_code == HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"].startswith("application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == json.loads(json.dumps(listed))
+
+    def test_export_csv(self, client_with_user, beers):
+        response = client_with_user.get(reverse("beer-export"), HTTP_ACCEPT="text/csv")
+        assert response.status_code == HTTP_200_OK
+        assert response["Content-Type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode("utf-8"))))
+        assert [row["name"] for row in rows] == [beer.name for beer in beers]
+        assert rows[0]["alcohol_content"] == str(beers[0].alcohol_content)
+
+    def test_export_defaults_to_ndjson(self, client_with_user, beers):
+        response = client_with_user.get(reverse("beer-export"))
+        assert response["Content-Type"].startswith("application/x-ndjson")
+
+    def test_export_unauthenticated(self, client, beers):
+        response = client.get(reverse("beer-export"), {"format": "csv"})
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+
 class TestUnauthorizedAccess:
     def test_add_beer_unauthenticated(self, client, valid_beer_args):
         url = reverse("beer-list")
@@ -253,4 +749,121 @@ class TestBreweryActions:
     def test_get_beers_by_brewery_unauthenticated(self, client, breweries):
         url = reverse("breweries:get-beers-by-brewery", kwargs={"brewery_name": "Brewery 1"})
         response = client.get(url)
-        assert response.status_code == HTTP_403_FORBIDDEN
\ No newline at end of file
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+
+class TestStatistics:
+    def test_statistics(self, client_with_user, filterable_beers):
+        response = client_with_user.get(reverse("statistics"))
+        assert response.status_code == HTTP_200_OK
+        assert response.data == {
+            "count": 4,
+            "by_beer_type": {"Bock": 2, "Pilsner": 2},
+            "by_brewery": {"North": 3, "South": 1},
+            "alcohol_content": {
+                "min": "0.00",
+                "max": "7.20",
+                "avg": "4.62",
+                "percentiles": {"25": "0.00", "50": "4.80", "75": "6.50", "90": "7.20"},
+            },
+        }
+
+    def test_statistics_without_beers(self, client_with_user):
+        response = client_with_user.get(reverse("statistics"))
+        assert response.status_code == HTTP_200_OK
+        assert response.data["count"] == 0
+        assert response.data["by_beer_type"] == {}
+        assert response.data["alcohol_content"]["avg"] is None
+        assert response.data["alcohol_content"]["percentiles"]["50"] is None
+
+    def test_statistics_use_three_queries(self, client_with_user, filterable_beers):
+        client_with_user.get(reverse("beer-list"))  # session and permission lookups
+        with CaptureQueriesContext(connection) as context:
+            client_with_user.get(reverse("statistics"))
+        statistics_queries = [query for query in context.captured_queries
+                              if "GROUP BY" in query["sql"] or "beers_brewery" in query["sql"]]
+        assert len(statistics_queries) == 3
+
+    def test_write_invalidates_cached_statistics(self, client_with_admin, filterable_beers, valid_beer_args,
+                                                 django_capture_on_commit_callbacks):
+        url = reverse("statistics")
+        client_with_admin.get(url)
+        assert client_with_admin.get(url)["X-Cache"] == "HIT"
+        with django_capture_on_commit_callbacks(execute=True):
+            client_with_admin.post(reverse("beer-list"), valid_beer_args, format="json")
+        response = client_with_admin.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == len(filterable_beers) + 1
+
+    def test_statistics_unauthenticated(self, client, filterable_beers):
+        response = client.get(reverse("statistics"))
+        assert response.status_code == HTTP_403_FORBIDDEN
+
+
+def explain_queries(queries, table="beers_beer"):
+    """
+    Run EXPLAIN QUERY PLAN (SQLite) for every captured query that reads the given table.
+    """
+    plans = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            if f'FROM "{table}"' in query["sql"]:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plans.append(" ".join(row[-1] for row in cursor.fetchall()))
+    return plans
+
+
+def assert_uses_index(plans):
+    assert plans
+    for plan in plans:
+        assert "USING INDEX" in plan or "USING COVERING INDEX" in plan, plan
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN is SQLite specific")
+class TestQueryPlans:
+    def test_get_beers_by_brewery_uses_index(self, client_with_user, breweries):
+        url = reverse("breweries:get-beers-by-brewery", kwargs={"brewery_name": "Brewery 1"})
+        with CaptureQueriesContext(connection) as context:
+            response = client_with_user.get(url)
+        assert response.status_code == HTTP_200_OK
+        assert_uses_index(explain_queries(context.captured_queries))
+
+    def test_list_breweries_uses_index(self, client_with_user, breweries):
+        url = reverse("breweries:list-breweries")
+        with CaptureQueriesContext(connection) as context:
+            response = client_with_user.get(url)
+        assert response.status_code == HTTP_200_OK
+        assert_uses_index(explain_queries(context.captured_queries, table="beers_brewery"))
+
+    def test_number_of_breweries_uses_index(self, client_with_user, breweries):
+        url = reverse("breweries:number-of-breweries")
+        with CaptureQueriesContext(connection) as context:
+            response = client_with_user.get(url)
+        assert response.status_code == HTTP_200_OK
+        assert_uses_index(explain_queries(context.captured_queries, table="beers_brewery"))
+
+    def test_filter_by_beer_type_uses_index(self, breweries):
+        plan = Beer.objects.filter(beer_type="Pale Lager").explain()
+        assert "beer_beer_type_idx" in plan
+
+    @pytest.mark.parametrize("ordering, index", [
+        ("alcohol_content", "beer_alcohol_content_idx"),
+        ("-alcohol_content", "beer_alcohol_content_idx"),
+        ("name", "beer_name_idx"),
+        ("created_at", "beer_created_at_idx"),
+    ])
+    def test_list_ordering_uses_index(self, client_with_user, breweries, ordering, index):
+        with CaptureQueriesContext(connection) as context:
+            response = client_with_user.get(reverse("beer-list"), {"ordering": ordering, "page_size": 10})
+        assert response.status_code == HTTP_200_OK
+        plans = explain_queries(context.captured_queries)
+        assert any(index in plan for plan in plans)
+        assert not any("TEMP B-TREE" in plan for plan in plans)
+
+    def test_alcohol_content_range_uses_index(self, breweries):
+        plan = Beer.objects.filter(alcohol_content__gte=4, alcohol_content__lte=6).explain()
+        assert "beer_alcohol_content_idx" in plan
+
+    def test_case_insensitive_name_lookup_uses_index(self, breweries):
+        plan = Beer.objects.annotate(lower_name=Lower("name")).filter(lower_name="beer 1").explain()
+        assert "beer_lower_name_idx" in plan
@@ -0,0 +1,79 @@
+import decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from beers.models import Beer
+from beers.validation.validation_constants import MAX_NAME_LENGTH
+from beers.validation.validators import validate_many, validate_title, validate_description
+
+
+@pytest.fixture
+def row():
+    return {'name': 'Valid Beer', 'brewery': 'Valid Brewery', 'description': 'A valid description.',
+            'alcohol_content': '5.0', 'beer_type': 'Pale Lager'}
+
+
+def model_errors(row):
+    beer = Beer(**row)
+    try:
+        beer.clean_fields()
+        beer.clean()
+    except ValidationError as e:
+        return e.message_dict
+    return {}
+
+
+class TestValidateMany:
+    def test_valid_row_is_converted(self, row):
+        [(values, errors)] = validate_many([row])
+        assert errors == {}
+        assert values['alcohol_content'] == decimal.Decimal('5.0')
+        assert values['name'] == 'Valid Beer'
+
+    @pytest.mark.parametrize('field, value', [
+        ('name', 'lowercase'),
+        ('name', 'Special!'),
+        ('name', 'A' * (MAX_NAME_LENGTH + 1)),
+        ('brewery', '   '),
+        ('description', '<b>Bold</b>'),
+        ('alcohol_content', '75.01'),
+        ('alcohol_content', '5.123'),
+        ('alcohol_content', 'strong'),
+        ('alcohol_content', None),
+        ('beer_type', 'Unknown'),
+        ('description', ''),
+    ])
+    def test_errors_match_model_validation(self, row, field, value):
+        row[field] = value
+        [(_, errors)] = validate_many([row])
+        expected = model_errors(row)
+        assert set(errors) == set(expected) == {field}
+        assert errors[field][0] in expected[field]
+
+    @pytest.mark.parametrize('beer_type, alcohol_content', [
+        ('Non-Alcoholic Beer', '0.6'),
+        ('Alcohol-Free Lager', '0.1'),
+    ])
+    def test_row_rules_match_model_clean(self, row, beer_type, alcohol_content):
+        row.update(beer_type=beer_type, alcohol_content=alcohol_content)
+        [(_, errors)] = validate_many([row])
+        assert errors == model_errors(row)
+
+    def test_json_numbers_are_accepted(self, row):
+        row['alcohol_content'] = 4.2
+        [(values, errors)] = validate_many([row])
+        assert errors == {}
+        assert values['alcohol_content'] == decimal.Decimal('4.2')
+
+    def test_rows_are_validated_independently(self, row):
+        results = validate_many([row, {**row, 'beer_type': 'Unknown'}, row])
+        assert [bool(errors) for _, errors in results] == [False, True, False]
+
+
+class TestFieldValidators:
+    def test_messages_are_unchanged(self):
+        with pytest.raises(ValidationError, match="Name must start with a capital letter."):
+            validate_title('lowercase')
+        with pytest.raises(ValidationError, match="Description contains invalid characters: <b>"):
+            validate_description('<b>')
@@ -0,0 +1,11 @@
+import pytest
+from django.core.cache import cache
+
+from beers.authentication import token_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # the database is rolled back after each test, cached responses must not outlive it
+    cache.clear()
+    token_cache.clear()
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+from django.db import connection
+
+from backend.database import database_from_env, replicas_from_env
+
+
+class TestDatabaseFromEnv:
+    def test_default_is_tuned_sqlite(self):
+        database = database_from_env({}, Path('/srv/beerhub'))
+        assert database['ENGINE'] == 'django.db.backends.sqlite3'
+        assert database['NAME'] == Path('/srv/beerhub/db.sqlite3')
+        assert database['CONN_MAX_AGE'] == 60
+        assert database['CONN_HEALTH_CHECKS'] is True
+        assert 'journal_mode=WAL' in database['OPTIONS']['init_command']
+        assert 'synchronous=NORMAL' in database['OPTIONS']['init_command']
+        assert database['OPTIONS']['transaction_mode'] == 'IMMEDIATE'
+        assert database['OPTIONS']['timeout'] == 20
+
+    def test_postgresql_with_persistent_connections(self):
+        database = database_from_env({
+            'DB_ENGINE': 'postgresql', 'DB_NAME': 'beers', 'DB_USER': 'brewer', 'DB_PASSWORD': 'secret',
+            'DB_HOST': 'db', 'DB_PORT': '5432', 'DB_CONN_MAX_AGE': '600', 'DB_CONN_HEALTH_CHECKS': 'false',
+        }, Path('.'))
+        assert database['ENGINE'] == 'django.db.backends.postgresql'
+        assert (database['NAME'], database['USER'], database['HOST'], database['PORT']) == ('beers', 'brewer', 'db', '5432')
+        assert database['CONN_MAX_AGE'] == 600
+        assert database['CONN_HEALTH_CHECKS'] is False
+        assert database['OPTIONS'] == {}
+
+    def test_postgresql_pool(self):
+        database = database_from_env({'DB_ENGINE': 'postgresql', 'DB_POOL': '1', 'DB_POOL_MAX_SIZE': '20'}, Path('.'))
+        assert database['CONN_MAX_AGE'] == 0
+        assert database['OPTIONS']['pool'] == {'min_size': 2, 'max_size': 20}
+
+    def test_pool_requires_postgresql(self):
+        with pytest.raises(ValueError):
+            database_from_env({'DB_ENGINE': 'mysql', 'DB_POOL': 'true'}, Path('.'))
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            database_from_env({'DB_ENGINE': 'oracle'}, Path('.'))
+
+    def test_sqlite_replicas_are_files(self):
+        primary = database_from_env({}, Path('/srv/beerhub'))
+        replicas = replicas_from_env({'DB_REPLICAS': '/srv/replica-a.sqlite3, /srv/replica-b.sqlite3'}, primary)
+        assert list(replicas) == ['replica1', 'replica2']
+        assert replicas['replica2']['NAME'] == '/srv/replica-b.sqlite3'
+        assert replicas['replica1']['OPTIONS'] == primary['OPTIONS']
+        assert replicas['replica1']['TEST'] == {'MIRROR': 'default'}
+
+    def test_server_replicas_are_hosts(self):
+        primary = database_from_env({'DB_ENGINE': 'postgresql', 'DB_HOST': 'primary'}, Path('.'))
+        replicas = replicas_from_env({'DB_REPLICAS': 'replica'}, primary)
+        assert replicas['replica1']['HOST'] == 'replica'
+        assert replicas['replica1']['NAME'] == primary['NAME']
+
+    def test_no_replicas(self):
+        assert replicas_from_env({}, database_from_env({}, Path('.'))) == {}
+
+    @pytest.mark.django_db
+    def test_sqlite_connection_is_tuned(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1  # NORMAL
@@ -6,11 +6,13 @@ from beer_hub_client import Client
 from valid8 import validate, ValidationError
 
 from beer_hub import menu
+from beer_hub.cache import CachingBeerHub
 from beer_hub.domain import Beer, Name, Brewery, BeerType, AlcoholContent, ID, Description
-from beer_hub.logic import InMemoryBeerHub, RESTBeerHub, BeerHub
+from beer_hub.logic import InMemoryBeerHub, RESTBeerHub, SQLiteBeerHub, BeerHub
 from beer_hub.menu import Menu, Entry
 
 BASE_URL = "http://localhost:8000/api/v1"
+SQLITE_DATABASE = "beer_hub.sqlite3"
 
 
 class App:
@@ -38,7 +40,10 @@ class App:
                 if authenticated_client is None:
                     print("Invalid Credentials! Try again.")
 
-            self.__selected_hub = RESTBeerHub(authenticated_client)
+            self.__selected_hub = CachingBeerHub(RESTBeerHub(authenticated_client))
+
+        def create_sqlite_hub():
+            self.__selected_hub = SQLiteBeerHub(SQLITE_DATABASE)
 
         hub_selection_menu = Menu.Builder(menu.Description('Select BeerHub Implementation'), auto_select=lambda: None) \
             .with_entry(Entry.create('1', 'InMemory BeerHub',
@@ -47,6 +52,9 @@ class App:
             .with_entry(Entry.create('2', 'REST BeerHub',
                                      on_selected=create_rest_hub,
                                      is_exit=True)) \
+            .with_entry(Entry.create('3', 'SQLite BeerHub',
+                                     on_selected=create_sqlite_hub,
+                                     is_exit=True)) \
             .with_entry(Entry.create('0', 'Exit',
                                      on_selected=lambda: sys.exit(0),
                                      is_exit=True)) \
@@ -129,6 +137,11 @@ class App:
         except:
             print('Panic error!', file=sys.stderr)
             raise
+        finally:
+            # hubs backed by a database file hold their connection until closed
+            close = getattr(self.__beer_hub, 'close', None)
+            if close is not None:
+                close()
 
     @staticmethod
     def __read(prompt: str, builder: Callable) -> Any:
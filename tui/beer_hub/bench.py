@@ -0,0 +1,113 @@
+"""
+Benchmark of the in-memory BeerHub operations at growing catalogue sizes.
+
+    python -m beer_hub.bench --beers 100000 1000000 --operations 10000
+
+Reports the average time per operation. Lookups by id and name stay flat as the catalogue
+grows, listing the beers of a brewery grows with the brewery, and writes grow with the
+catalogue since they shift the entries of the sorted views. The times include the runtime
+type checks the typeguard import hook adds to every call.
+"""
+import argparse
+import random
+import time
+from typing import Callable
+
+from beer_hub.domain import Beer, ID, Name, Description, Brewery, BeerType, AlcoholContent
+from beer_hub.logic import BeerHub, InMemoryBeerHub
+
+# Domain values are validated on construction, the beers share a pool of them
+NAME_POOL_SIZE = 10_000
+BREWERY_POOL_SIZE = 500
+BEER_TYPES = ['Pale Lager', 'Pilsner', 'Helles', 'Dunkel', 'Bock', 'Ale', 'Pale Ale', 'Sour']
+
+
+def letters(number: int) -> str:
+    """
+    Spell a number with capital letters.
+    """
+    result = ''
+    while True:
+        number, remainder = divmod(number, 26)
+        result = chr(ord('A') + remainder) + result
+        if number == 0:
+            return result
+
+
+def create_beers(count: int, rng: random.Random) -> list[Beer]:
+    names = [Name(f'Beer {letters(number)}') for number in range(NAME_POOL_SIZE)]
+    breweries = [Brewery(f'Brewery {letters(number)}') for number in range(BREWERY_POOL_SIZE)]
+    beer_types = [BeerType(beer_type) for beer_type in BEER_TYPES]
+    alcohol_contents = [AlcoholContent(tenths / 10) for tenths in range(0, 121)]
+    description = Description('Brewed for the benchmark.')
+
+    return [Beer(ID(number), rng.choice(names), description, rng.choice(breweries),
+                 rng.choice(beer_types), rng.choice(alcohol_contents))
+            for number in range(count)]
+
+
+def measure(operation: Callable[[int], object], operations: int) -> float:
+    """
+    The average seconds per call of `operation(index)`.
+    """
+    started = time.perf_counter()
+    for index in range(operations):
+        operation(index)
+    return (time.perf_counter() - started) / operations
+
+
+def run(beers: list[Beer], operations: int, rng: random.Random, create_hub: Callable[[], BeerHub] = InMemoryBeerHub):
+    """
+    Fill a hub with the beers and time its operations.
+
+    Returns:
+        dict[str, float]: The average seconds per operation, keyed by operation.
+    """
+    hub = create_hub()
+    results = {'add_beer': measure(lambda index: hub.add_beer(beers[index]), len(beers)) if beers else 0.0}
+
+    ids = [rng.choice(beers).id for _ in range(operations)]
+    names = [rng.choice(beers).name for _ in range(operations)]
+    breweries = [rng.choice(beers).brewery for _ in range(operations)]
+
+    results['get_beer_by_id'] = measure(lambda index: hub.get_beer_by_id(ids[index]), operations)
+    results['get_beer_by_name'] = measure(lambda index: hub.get_beer_by_name(names[index]), operations)
+    results['get_beers_by_brewery'] = measure(lambda index: hub.get_beers_by_brewery(breweries[index]), operations)
+    results['number_of_breweries'] = measure(lambda index: hub.number_of_breweries(), operations)
+
+    # listings copy the maintained sorted views, O(n) per call without sorting
+    listings = max(1, operations // 1000)
+    results['get_beers'] = measure(lambda index: hub.get_beers(), listings)
+    results['get_beers_by_ascending_alcohol_content'] = measure(
+        lambda index: hub.get_beers_by_ascending_alcohol_content(), listings)
+
+    # update and delete distinct beers, every id exists exactly once
+    victims = rng.sample(beers, min(operations, len(beers)))
+    results['update_beer_by_id'] = measure(lambda index: hub.update_beer_by_id(victims[index].id, victims[index]),
+                                           len(victims))
+    results['delete_beer_by_id'] = measure(lambda index: hub.delete_beer_by_id(victims[index].id), len(victims))
+    results['add_beer (new id)'] = measure(lambda index: hub.add_beer(Beer.of(
+        victims[index].name, victims[index].description, victims[index].brewery,
+        victims[index].beer_type, victims[index].alcohol_content)), len(victims))
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the in-memory BeerHub.")
+    parser.add_argument('--beers', type=int, nargs='+', default=[100_000, 1_000_000],
+                        help="Catalogue sizes to benchmark.")
+    parser.add_argument('--operations', type=int, default=10_000, help="Operations timed per size.")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    for count in args.beers:
+        started = time.perf_counter()
+        beers = create_beers(count, rng)
+        print(f"{count} beers (created in {time.perf_counter() - started:.1f}s)")
+        for operation, seconds in run(beers, args.operations, rng).items():
+            print(f"  {operation:<40} {seconds * 1_000_000:9.2f} µs/op")
+
+
+if __name__ == '__main__':
+    main()
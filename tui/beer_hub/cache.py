@@ -0,0 +1,136 @@
+"""
+Client-side cache in front of any BeerHub.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from beer_hub.domain import Beer, Brewery, ID, Name
+from beer_hub.logic import BeerHub, ConditionalBeerHub, NOT_MODIFIED
+
+DEFAULT_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 256
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    etag: Optional[str]
+    expires: float
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0  # expired entries the hub confirmed unchanged (304 Not Modified)
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        requests = self.hits + self.misses + self.revalidations
+        return (self.hits + self.revalidations) / requests if requests else 0.0
+
+
+class CachingBeerHub(BeerHub):
+    """
+    Decorator that caches the reads of another BeerHub, e.g. to spare the REST round trips.
+
+    Results are kept for `ttl` seconds, at most `max_entries` of them, the least recently used
+    is evicted first. Once expired, a result is revalidated with its ETag if the hub supports it
+    (`ConditionalBeerHub`), an unchanged result is then not transferred again. Writes go to the
+    hub and drop the results they may change: everything but the lookups of other existing beers.
+    Changes made by other clients show up once the results expire.
+    """
+
+    def __init__(self, hub: BeerHub, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__hub = hub
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__clock = clock
+        self.__entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self.__counts = dict.fromkeys(('hits', 'misses', 'revalidations', 'evictions'), 0)
+
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(**self.__counts)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def __read(self, operation: str, *args) -> Any:
+        key = (operation, *args)
+        entry = self.__entries.get(key)
+        now = self.__clock()
+        if entry is not None and entry.expires > now:
+            self.__entries.move_to_end(key)
+            self.__counts['hits'] += 1
+            return self.__copy(entry.value)
+
+        if isinstance(self.__hub, ConditionalBeerHub):
+            etag, value = self.__hub.read_if_modified(operation, args, entry.etag if entry is not None else None)
+        else:
+            etag, value = None, getattr(self.__hub, operation)(*args)
+        if value is NOT_MODIFIED:
+            value = entry.value
+            self.__counts['revalidations'] += 1
+        else:
+            self.__counts['misses'] += 1
+
+        self.__entries[key] = CacheEntry(value, etag, now + self.__ttl)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_entries:
+            self.__entries.popitem(last=False)
+            self.__counts['evictions'] += 1
+        return self.__copy(value)
+
+    @staticmethod
+    def __copy(value: Any) -> Any:
+        # callers may change the lists they get
+        return list(value) if isinstance(value, list) else value
+
+    def __invalidate(self, id: ID) -> None:
+        self.__entries = OrderedDict(
+            (key, entry) for key, entry in self.__entries.items()
+            if key[0] == 'get_beer_by_id' and key[1] != id and entry.value is not None
+        )
+
+    def number_of_beers(self) -> int:
+        return self.__read('number_of_beers')
+
+    def get_beers(self) -> list[Beer]:
+        return self.__read('get_beers')
+
+    def get_beer_by_id(self, id: ID) -> Optional[Beer]:
+        return self.__read('get_beer_by_id', id)
+
+    def get_beer_by_name(self, name: Name) -> Optional[Beer]:
+        return self.__read('get_beer_by_name', name)
+
+    def add_beer(self, beer: Beer) -> None:
+        self.__invalidate(beer.id)
+        self.__hub.add_beer(beer)
+
+    def update_beer_by_id(self, id: ID, beer: Beer) -> None:
+        self.__invalidate(id)
+        self.__hub.update_beer_by_id(id, beer)
+
+    def delete_beer_by_id(self, id: ID) -> None:
+        self.__invalidate(id)
+        self.__hub.delete_beer_by_id(id)
+
+    def number_of_breweries(self) -> int:
+        return self.__read('number_of_breweries')
+
+    def get_breweries(self) -> list[Brewery]:
+        return self.__read('get_breweries')
+
+    def get_beers_by_brewery(self, brewery: Brewery) -> list[Beer]:
+        return self.__read('get_beers_by_brewery', brewery)
+
+    def get_beers_by_ascending_alcohol_content(self) -> list[Beer]:
+        return self.__read('get_beers_by_ascending_alcohol_content')
+
+    def get_beers_by_descending_alcohol_content(self) -> list[Beer]:
+        return self.__read('get_beers_by_descending_alcohol_content')
@@ -1,18 +1,26 @@
+import contextlib
 import json
+import os
+import sqlite3
 from abc import ABCMeta, abstractmethod
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
-from typing import Optional
+from http import HTTPStatus
+from typing import Any, Iterable, Iterator, Optional, Union
 
+import httpx
 from beer_hub_client import Client
+from beer_hub_client.types import Response
 from beer_hub_client.api.auth import auth_login_create
-from beer_hub_client.api.beers import beers_create, beers_list, beers_read, beers_get_beer_by_name, \
+from beer_hub_client.api.beers import beers_count, beers_create, beers_list, beers_read, beers_get_beer_by_name, \
     beers_get_beer_by_name_2, beers_update, beers_delete
 from beer_hub_client.api.breweries import breweries_number_of_breweries, breweries_get_beers_by_brewery
 from beer_hub_client.api.list_breweries import list_breweries
 from beer_hub_client.errors import UnexpectedStatus
+from beer_hub_client.models.beers_list_ordering import BeersListOrdering
 from beer_hub_client.models.login import Login
 
-from beer_hub.domain import Beer, Brewery, ID, Name
+from beer_hub.domain import Beer, Brewery, ID, Name, Description, BeerType, AlcoholContent
 from beer_hub.mapper import beer_to_dto, dto_list_to_beer_list, dto_to_beer
 
 
@@ -66,69 +74,270 @@ class BeerHub(metaclass=ABCMeta): # pragma: no cover
         pass
 
 
-@dataclass(frozen=True, order=True)
+# Result of `ConditionalBeerHub.read_if_modified` when the earlier result is still current
+NOT_MODIFIED = object()
+
+
+class ConditionalBeerHub(BeerHub, metaclass=ABCMeta): # pragma: no cover
+    @abstractmethod
+    def read_if_modified(self, operation: str, args: tuple, etag: Optional[str]) -> tuple[Optional[str], Any]:
+        """
+        Run the read `operation` (the name of a BeerHub method) unless `etag` is still current.
+
+        Returns:
+            tuple[Optional[str], Any]: The ETag of the result (None if the operation has none) and
+            the result, or the given ETag and NOT_MODIFIED.
+        """
+        pass
+
+
+@dataclass(eq=False)
 class InMemoryBeerHub(BeerHub):
-    __beers: list[Beer] = field(default_factory=list, init=False, repr=False)
+    """
+    Beers held in memory, indexed so that lookups by id, name and brewery are O(1).
+
+    - id -> beer, in insertion order
+    - name -> the beers of that name (id -> beer), the first one added is found by name
+    - brewery -> the ids of its beers
+    - the highest id ever used, new beers get the next one, ids of deleted beers are not reused
+
+    Sorted views are maintained on every write, so reads never sort; they return a new list,
+    which callers may change without affecting the hub. Writes find their position by bisection
+    in O(log n), but inserting into or deleting from a list moves the following entries, so adds,
+    updates and deletes are O(n) (adding a beer with a new, highest id appends to the id view):
+
+    - `(id, beer)` by id
+    - `(alcohol content, id, beer)` by alcohol content, ties by id
+    """
+    __beers: dict[ID, Beer] = field(default_factory=dict, init=False, repr=False)
+    __beers_by_name: dict[Name, dict[ID, Beer]] = field(default_factory=dict, init=False, repr=False)
+    __ids_by_brewery: dict[Brewery, dict[ID, None]] = field(default_factory=dict, init=False, repr=False)
+    __highest_id: int = field(default=-1, init=False, repr=False)
+    __by_id: list[tuple[int, Beer]] = field(default_factory=list, init=False, repr=False)
+    __by_alcohol_content: list[tuple[float, int, Beer]] = field(default_factory=list, init=False, repr=False)
 
     # only required for in-memory implementation
-    def __get_highest_id(self) -> ID:
-        if not self.__beers:
-            return ID(-1)
+    def __insert(self, beer: Beer) -> None:
+        self.__beers[beer.id] = beer
+        self.__beers_by_name.setdefault(beer.name, {})[beer.id] = beer
+        self.__ids_by_brewery.setdefault(beer.brewery, {})[beer.id] = None
+        self.__highest_id = max(self.__highest_id, int(beer.id))
+
+        entry = (int(beer.id), beer)
+        if not self.__by_id or entry[0] > self.__by_id[-1][0]:
+            self.__by_id.append(entry)  # new ids are the highest, appending keeps the order
+        else:
+            insort(self.__by_id, entry)
+        insort(self.__by_alcohol_content, (beer.alcohol_content.value, int(beer.id), beer))
+
+    def __remove(self, id: ID) -> Beer:
+        beer = self.__beers.pop(id, None)
+        if beer is None:
+            raise ValueError(f'Beer with id {id} does not exist!')
 
-        return max(beer.id for beer in self.__beers)
+        namesakes = self.__beers_by_name[beer.name]
+        del namesakes[id]
+        if not namesakes:
+            del self.__beers_by_name[beer.name]
+
+        brewery_ids = self.__ids_by_brewery[beer.brewery]
+        del brewery_ids[id]
+        if not brewery_ids:
+            del self.__ids_by_brewery[beer.brewery]
+
+        # a key prefix sorts before every entry it starts, the ids make the entries unique
+        del self.__by_id[bisect_left(self.__by_id, (int(id),))]
+        del self.__by_alcohol_content[bisect_left(self.__by_alcohol_content, (beer.alcohol_content.value, int(id)))]
+        return beer
 
     def number_of_beers(self) -> int:
         return len(self.__beers)
 
     def get_beers(self) -> list[Beer]:
-        self.__beers.sort(key=lambda beer: beer.id)
-        return self.__beers
+        return [beer for _, beer in self.__by_id]
 
     def get_beer_by_id(self, id: ID) -> Optional[Beer]:
-        return next((beer for beer in self.__beers if beer.id == id), None)
+        return self.__beers.get(id)
 
     def get_beer_by_name(self, name: Name) -> Optional[Beer]:
-        return next((beer for beer in self.__beers if beer.name == name), None)
+        namesakes = self.__beers_by_name.get(name)
+        return next(iter(namesakes.values())) if namesakes else None
 
     def add_beer(self, beer: Beer) -> None:
         if beer.id == ID(-1):
-            new_id = ID(int(self.__get_highest_id()) + 1)
-            new_beer = Beer(new_id, beer.name, beer.description, beer.brewery, beer.beer_type, beer.alcohol_content)
-            self.__beers.append(new_beer)
-        else:
-            self.__beers.append(beer)
+            new_id = ID(self.__highest_id + 1)
+            beer = Beer(new_id, beer.name, beer.description, beer.brewery, beer.beer_type, beer.alcohol_content)
+        elif beer.id in self.__beers:
+            self.__remove(beer.id)
+        self.__insert(beer)
 
     def update_beer_by_id(self, id: ID, beer: Beer) -> None:
-        self.delete_beer_by_id(id)
+        self.__remove(id)
         new_beer = Beer(id, beer.name, beer.description, beer.brewery, beer.beer_type, beer.alcohol_content)
-        self.__beers.append(new_beer)
+        self.__insert(new_beer)
 
     def delete_beer_by_id(self, id: ID) -> None:
-        self.__beers.remove(self.get_beer_by_id(id))
+        self.__remove(id)
 
     def number_of_breweries(self) -> int:
-        return len(self.get_breweries())
+        return len(self.__ids_by_brewery)
 
     def get_breweries(self) -> list[Brewery]:
-        return list(set({beer.brewery for beer in self.__beers}))
+        return list(self.__ids_by_brewery)
 
     def get_beers_by_brewery(self, brewery: Brewery) -> list[Beer]:
-        return [beer for beer in self.__beers if beer.brewery == brewery]
+        return [self.__beers[id] for id in self.__ids_by_brewery.get(brewery, ())]
 
     def get_beers_by_ascending_alcohol_content(self) -> list[Beer]:
-        self.__beers.sort(key=lambda beer: beer.alcohol_content)
-        return self.__beers
+        return [beer for _, _, beer in self.__by_alcohol_content]
 
     def get_beers_by_descending_alcohol_content(self) -> list[Beer]:
-        self.__beers.sort(key=lambda beer: beer.alcohol_content, reverse=True)
-        return self.__beers
+        return [beer for _, _, beer in reversed(self.__by_alcohol_content)]
+
+
+class SQLiteBeerHub(BeerHub):
+    """
+    Beers in a local SQLite database, every operation is a single indexed query.
+
+    The connection runs in WAL mode, so readers do not block the writer. Statements are
+    parameterized constants, which the sqlite3 module prepares once and caches. Every write is
+    a transaction of its own, `batch` groups writes into one transaction (and one disk sync).
+    Ids of deleted beers are not reused (AUTOINCREMENT).
+    """
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS beer ('
+        ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+        ' name TEXT NOT NULL,'
+        ' description TEXT NOT NULL,'
+        ' brewery TEXT NOT NULL,'
+        ' beer_type TEXT NOT NULL,'
+        ' alcohol_content REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS beer_name ON beer (name, id)',
+        'CREATE INDEX IF NOT EXISTS beer_brewery ON beer (brewery, id)',
+        'CREATE INDEX IF NOT EXISTS beer_alcohol_content ON beer (alcohol_content, id)',
+    ]
+    COLUMNS = 'id, name, description, brewery, beer_type, alcohol_content'
+
+    def __init__(self, database: Union[str, os.PathLike] = ':memory:'):
+        self.__connection = sqlite3.connect(database, isolation_level=None)  # transactions are explicit
+        self.__connection.execute('PRAGMA journal_mode = WAL')
+        self.__connection.execute('PRAGMA synchronous = NORMAL')
+        self.__in_transaction = False
+        with self.batch():
+            for statement in self.SCHEMA:
+                self.__connection.execute(statement)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Run the writes of the block in one transaction, rolled back if the block raises.
+        """
+        if self.__in_transaction:
+            yield
+            return
+
+        self.__connection.execute('BEGIN IMMEDIATE')
+        self.__in_transaction = True
+        try:
+            yield
+        except BaseException:
+            self.__connection.execute('ROLLBACK')
+            raise
+        else:
+            self.__connection.execute('COMMIT')
+        finally:
+            self.__in_transaction = False
+
+    def add_beers(self, beers: Iterable[Beer]) -> None:
+        with self.batch():
+            for beer in beers:
+                self.add_beer(beer)
+
+    def close(self) -> None:
+        self.__connection.close()
+
+    def __enter__(self) -> 'SQLiteBeerHub':
+        return self
 
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
-class RESTBeerHub(BeerHub):
+    def __query(self, sql: str, parameters: tuple = ()) -> list[Beer]:
+        return [self.__to_beer(row) for row in self.__connection.execute(sql, parameters)]
+
+    @staticmethod
+    def __to_beer(row: tuple) -> Beer:
+        id, name, description, brewery, beer_type, alcohol_content = row
+        return Beer(ID(id), Name(name), Description(description), Brewery(brewery), BeerType(beer_type),
+                    AlcoholContent(alcohol_content))
+
+    @staticmethod
+    def __to_row(beer: Beer) -> tuple:
+        return (beer.name.value, beer.description.value, beer.brewery.value, beer.beer_type.value,
+                beer.alcohol_content.value)
+
+    def number_of_beers(self) -> int:
+        return self.__connection.execute('SELECT COUNT(*) FROM beer').fetchone()[0]
+
+    def get_beers(self) -> list[Beer]:
+        return self.__query(f'SELECT {self.COLUMNS} FROM beer ORDER BY id')
+
+    def get_beer_by_id(self, id: ID) -> Optional[Beer]:
+        return next(iter(self.__query(f'SELECT {self.COLUMNS} FROM beer WHERE id = ?', (int(id),))), None)
+
+    def get_beer_by_name(self, name: Name) -> Optional[Beer]:
+        return next(iter(self.__query(f'SELECT {self.COLUMNS} FROM beer WHERE name = ? ORDER BY id LIMIT 1',
+                                      (name.value,))), None)
+
+    def add_beer(self, beer: Beer) -> None:
+        with self.batch():
+            if beer.id == ID(-1):
+                self.__connection.execute(
+                    'INSERT INTO beer (name, description, brewery, beer_type, alcohol_content) VALUES (?, ?, ?, ?, ?)',
+                    self.__to_row(beer))
+            else:
+                self.__connection.execute(f'INSERT OR REPLACE INTO beer ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)',
+                                          (int(beer.id),) + self.__to_row(beer))
+
+    def update_beer_by_id(self, id: ID, beer: Beer) -> None:
+        with self.batch():
+            cursor = self.__connection.execute(
+                'UPDATE beer SET name = ?, description = ?, brewery = ?, beer_type = ?, alcohol_content = ? '
+                'WHERE id = ?', self.__to_row(beer) + (int(id),))
+            if cursor.rowcount == 0:
+                raise ValueError(f'Beer with id {id} does not exist!')
+
+    def delete_beer_by_id(self, id: ID) -> None:
+        with self.batch():
+            if self.__connection.execute('DELETE FROM beer WHERE id = ?', (int(id),)).rowcount == 0:
+                raise ValueError(f'Beer with id {id} does not exist!')
+
+    def number_of_breweries(self) -> int:
+        return self.__connection.execute('SELECT COUNT(DISTINCT brewery) FROM beer').fetchone()[0]
+
+    def get_breweries(self) -> list[Brewery]:
+        rows = self.__connection.execute('SELECT DISTINCT brewery FROM beer ORDER BY brewery')
+        return [Brewery(name) for name, in rows]
+
+    def get_beers_by_brewery(self, brewery: Brewery) -> list[Beer]:
+        return self.__query(f'SELECT {self.COLUMNS} FROM beer WHERE brewery = ? ORDER BY id', (brewery.value,))
+
+    def get_beers_by_ascending_alcohol_content(self) -> list[Beer]:
+        return self.__query(f'SELECT {self.COLUMNS} FROM beer ORDER BY alcohol_content, id')
+
+    def get_beers_by_descending_alcohol_content(self) -> list[Beer]:
+        return self.__query(f'SELECT {self.COLUMNS} FROM beer ORDER BY alcohol_content DESC, id DESC')
+
+
+class RESTBeerHub(ConditionalBeerHub):
     __client = None
+    __etag = None  # sent as If-None-Match with the current request
 
     def __init__(self, client: Client):
         self.__client = client
+        httpx_client = client.get_httpx_client()
+        hooks = httpx_client.event_hooks
+        httpx_client.event_hooks = {**hooks, 'request': [*hooks.get('request', []), self.__send_etag]}
 
     @staticmethod
     def login(client: Client, username: str, password: str) -> Optional[Client]:
@@ -142,7 +351,11 @@ class RESTBeerHub(BeerHub):
             return None
 
     def number_of_beers(self) -> int:
-        return len(self.get_beers())
+        response = beers_count.sync_detailed(client=self.__client)
+        # expected response content: b'{"count":int}'
+        decoded_content = response.content.decode('utf-8')
+        parsed_content = json.loads(decoded_content)
+        return parsed_content["count"]
 
     def get_beers(self) -> list[Beer]:
         response = beers_list.sync(client=self.__client)
@@ -179,12 +392,20 @@ class RESTBeerHub(BeerHub):
 
     def get_breweries(self) -> list[Brewery]:
         response = list_breweries.sync_detailed(client=self.__client)
+        return self.__parse_breweries(response)
+
+    @staticmethod
+    def __parse_breweries(response: Response) -> list[Brewery]:
         decoded_content = response.content.decode('utf-8')
         parsed_content = json.loads(decoded_content)
         return [Brewery(brewery) for brewery in parsed_content]
 
     def get_beers_by_brewery(self, brewery: Brewery) -> list[Beer]:
         response = breweries_get_beers_by_brewery.sync_detailed(client=self.__client, brewery_name=brewery.value)
+        return self.__parse_beers_of_brewery(response)
+
+    @staticmethod
+    def __parse_beers_of_brewery(response: Response) -> list[Beer]:
         decoded_content = response.content.decode('utf-8')
         parsed_content = json.loads(decoded_content)
         return [Beer.parse(id=beer_dict['id'],
@@ -196,11 +417,55 @@ class RESTBeerHub(BeerHub):
                 for beer_dict in parsed_content]
 
     def get_beers_by_ascending_alcohol_content(self) -> list[Beer]:
-        beers = self.get_beers()
-        beers.sort(key=lambda beer: beer.alcohol_content)
-        return beers
+        # sorted by the server, backed by the alcohol content index
+        response = beers_list.sync(client=self.__client, ordering=BeersListOrdering.ALCOHOL_CONTENT)
+        return dto_list_to_beer_list(response)
 
     def get_beers_by_descending_alcohol_content(self) -> list[Beer]:
-        beers = self.get_beers()
-        beers.sort(key=lambda beer: beer.alcohol_content, reverse=True)
-        return beers
+        response = beers_list.sync(client=self.__client, ordering=BeersListOrdering("-alcohol_content"))
+        return dto_list_to_beer_list(response)
+
+    def __send_etag(self, request: httpx.Request) -> None:
+        if self.__etag is not None:
+            request.headers['If-None-Match'] = self.__etag
+
+    @staticmethod
+    def __parse_beer_list(response: Response) -> list[Beer]:
+        return dto_list_to_beer_list(response.parsed)
+
+    @staticmethod
+    def __parse_beer(response: Response) -> Optional[Beer]:
+        return dto_to_beer(response.parsed)
+
+    def read_if_modified(self, operation: str, args: tuple, etag: Optional[str]) -> tuple[Optional[str], Any]:
+        # the endpoints that answer If-None-Match: endpoint module, fixed arguments, names of the
+        # operation's arguments, result from the response
+        conditional_reads = {
+            'get_beers': (beers_list, {}, (), self.__parse_beer_list),
+            'get_beers_by_ascending_alcohol_content':
+                (beers_list, {'ordering': BeersListOrdering.ALCOHOL_CONTENT}, (), self.__parse_beer_list),
+            'get_beers_by_descending_alcohol_content':
+                (beers_list, {'ordering': BeersListOrdering("-alcohol_content")}, (), self.__parse_beer_list),
+            'get_beer_by_id': (beers_read, {}, ('id',), self.__parse_beer),
+            'get_breweries': (list_breweries, {}, (), self.__parse_breweries),
+            'get_beers_by_brewery': (breweries_get_beers_by_brewery, {}, ('brewery_name',),
+                                     self.__parse_beers_of_brewery),
+        }
+        if operation not in conditional_reads:
+            return None, getattr(self, operation)(*args)
+
+        endpoint, kwargs, names, parse = conditional_reads[operation]
+        kwargs = {**kwargs, **{name: arg.value for name, arg in zip(names, args)}}
+        # the generated endpoints take no headers, __send_etag adds If-None-Match to this request
+        self.__etag = etag
+        try:
+            response = endpoint.sync_detailed(client=self.__client, **kwargs)
+        except UnexpectedStatus:
+            if operation == 'get_beer_by_id':
+                return None, None  # like get_beer_by_id, unknown ids are not found
+            raise
+        finally:
+            self.__etag = None
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return etag, NOT_MODIFIED
+        return response.headers.get('ETag'), parse(response)
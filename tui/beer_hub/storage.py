@@ -0,0 +1,396 @@
+"""
+File-backed BeerHub: an append-only log in front of a memory-mapped file of fixed-width records.
+
+A catalogue directory contains three files:
+
+- `beers.dat`: a header and one fixed-width record per beer, in id order.
+- `beers.idx`: the id index, a header and the sorted ids of the records, 8 bytes each; the n-th
+  id belongs to the n-th record.
+- `beers.log`: the writes since the last compaction, each one an operation byte and a record.
+
+Opening maps the data and the index (no parsing, so it is instant for large catalogues) and
+replays the short log into an in-memory overlay. Lookups by id binary search the mapped index
+and decode only the record they need. Writes append to the log. Once the log holds
+`compact_threshold` entries, a background thread merges it into new data and index files,
+which replace the old ones, and then truncates the log.
+
+Every compaction numbers its files with a new generation. An index whose generation or count
+differs from the data file (a crash between the replacements) is rebuilt from the records.
+The log is truncated last and replaying a log entry twice is harmless, so a crash at any point
+leaves a consistent catalogue.
+"""
+import heapq
+import mmap
+import os
+import struct
+import threading
+from typing import Iterator, Optional, Union
+
+from beer_hub.domain import Beer, ID, Name, Description, Brewery, BeerType, AlcoholContent, ValidationConstants
+from beer_hub.logic import BeerHub
+
+DATA_FILE = 'beers.dat'
+INDEX_FILE = 'beers.idx'
+LOG_FILE = 'beers.log'
+
+MAGIC = b'BEERHUB1'
+INDEX_MAGIC = b'BEERIDX1'
+HEADER = struct.Struct('<8sIQqQ')  # magic, record size, number of records, highest id ever used, generation
+INDEX_HEADER = struct.Struct('<8sQQ')  # magic, generation, number of ids
+ID_ENTRY = struct.Struct('<q')
+ALCOHOL_CONTENT = struct.Struct('<d')
+TEXT_LENGTH = struct.Struct('<H')
+
+# UTF-8 needs at most two bytes for the characters of ValidationConstants.ALPHANUMERIC_SPACE_PATTERN
+TEXT_FIELDS = (
+    ('name', 2 * ValidationConstants.NAME_MAX_LENGTH),
+    ('description', 2 * ValidationConstants.DESCRIPTION_MAX_LENGTH),
+    ('brewery', 2 * ValidationConstants.BREWERY_MAX_LENGTH),
+    ('beer_type', 2 * ValidationConstants.BEER_TYPE_MAX_LENGTH),
+)
+# id, alcohol content, then length and bytes of every text field; the id comes first, so the
+# first 8 bytes of a record are its index entry
+RECORD = struct.Struct('<qd' + ''.join(f'H{width}s' for _, width in TEXT_FIELDS))
+
+TEXT_OFFSETS = {}
+_offset = ID_ENTRY.size + ALCOHOL_CONTENT.size
+for _field, _width in TEXT_FIELDS:
+    TEXT_OFFSETS[_field] = _offset
+    _offset += TEXT_LENGTH.size + _width
+
+PUT = b'P'
+DELETE = b'D'
+LOG_ENTRY_SIZE = 1 + RECORD.size
+
+DEFAULT_COMPACT_THRESHOLD = 1000
+
+
+def encode_record(beer: Beer) -> bytes:
+    values = [int(beer.id), beer.alcohol_content.value]
+    for field, _ in TEXT_FIELDS:
+        text = getattr(beer, field).value.encode('utf-8')
+        values += [len(text), text]
+    return RECORD.pack(*values)
+
+
+def decode_record(record: bytes) -> Beer:
+    id, alcohol_content, *texts = RECORD.unpack(record)
+    name, description, brewery, beer_type = (texts[i + 1][:texts[i]].decode('utf-8') for i in range(0, len(texts), 2))
+    return Beer(ID(id), Name(name), Description(description), Brewery(brewery), BeerType(beer_type),
+                AlcoholContent(alcohol_content))
+
+
+def record_id(record: bytes) -> int:
+    return ID_ENTRY.unpack_from(record)[0]
+
+
+def record_alcohol_content(record: bytes) -> float:
+    return ALCOHOL_CONTENT.unpack_from(record, ID_ENTRY.size)[0]
+
+
+def record_text(record: bytes, field: str) -> str:
+    """
+    Decode a single text field of a record, e.g. to filter without building the beer.
+    """
+    offset = TEXT_OFFSETS[field]
+    length = TEXT_LENGTH.unpack_from(record, offset)[0]
+    start = offset + TEXT_LENGTH.size
+    return record[start:start + length].decode('utf-8')
+
+
+class FileBeerHub(BeerHub):
+    """
+    Persistent BeerHub in a catalogue directory, see the module documentation for the format.
+
+    Safe to use from several threads. Call `close` (or use it as a context manager) to wait for
+    a running compaction and release the files.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], compact_threshold: int = DEFAULT_COMPACT_THRESHOLD):
+        os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__compact_threshold = compact_threshold
+        self.__lock = threading.RLock()
+        self.__compaction_lock = threading.Lock()
+        self.__compaction: Optional[threading.Thread] = None
+
+        # id -> (sequence number of the write, record or None if deleted), newer than the data file
+        self.__overlay: dict[int, tuple[int, Optional[bytes]]] = {}
+        self.__sequence = 0
+        self.__highest_id = -1
+
+        self.__open_base()
+        self.__count = self.__base_count
+        self.__log = open(self.__path(LOG_FILE), 'a+b')
+        self.__log_entries = 0
+        self.__replay_log()
+
+    def __path(self, name: str) -> str:
+        return os.path.join(self.__directory, name)
+
+    def __open_base(self) -> None:
+        data_path = self.__path(DATA_FILE)
+        if not os.path.exists(data_path):
+            with open(data_path, 'wb') as data:
+                data.write(HEADER.pack(MAGIC, RECORD.size, 0, -1, 0))
+
+        self.__index_file, self.__index = None, None
+        self.__data_file = open(data_path, 'rb')
+        self.__data = mmap.mmap(self.__data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, record_size, count, highest_id, generation = HEADER.unpack_from(self.__data) \
+            if len(self.__data) >= HEADER.size else (None, None, 0, -1, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            self.__close_base()
+            raise ValueError(f'{data_path} is not a BeerHub data file of this version')
+        self.__base_count = count
+        self.__generation = generation
+        self.__highest_id = max(self.__highest_id, highest_id)
+
+        index_path = self.__path(INDEX_FILE)
+        if not self.__index_matches(index_path):
+            # missing, or an interrupted compaction; the ids are the first bytes of the records
+            index_tmp = index_path + '.tmp'
+            with open(index_tmp, 'wb') as index:
+                index.write(INDEX_HEADER.pack(INDEX_MAGIC, generation, count))
+                index.writelines(self.__base_record(position)[:ID_ENTRY.size] for position in range(count))
+                index.flush()
+                os.fsync(index.fileno())
+            os.replace(index_tmp, index_path)
+            self.__sync_directory()
+        self.__index_file = open(index_path, 'rb')
+        self.__index = mmap.mmap(self.__index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __index_matches(self, index_path: str) -> bool:
+        """
+        Whether the index file belongs to the mapped data file.
+        """
+        if not os.path.exists(index_path):
+            return False
+        with open(index_path, 'rb') as index:
+            header = index.read(INDEX_HEADER.size)
+        return len(header) == INDEX_HEADER.size \
+            and INDEX_HEADER.unpack(header) == (INDEX_MAGIC, self.__generation, self.__base_count) \
+            and os.path.getsize(index_path) == INDEX_HEADER.size + self.__base_count * ID_ENTRY.size
+
+    def __sync_directory(self) -> None:
+        """
+        Persist the replacements of files in the catalogue directory (POSIX only).
+        """
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        descriptor = os.open(self.__directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def __close_base(self) -> None:
+        if self.__index is not None:
+            self.__index.close()
+        self.__data.close()
+        if self.__index_file is not None:
+            self.__index_file.close()
+        self.__data_file.close()
+
+    def __replay_log(self) -> None:
+        self.__log.seek(0)
+        content = self.__log.read()
+        entries = len(content) // LOG_ENTRY_SIZE
+        if len(content) != entries * LOG_ENTRY_SIZE:
+            # the last write was interrupted
+            self.__log.truncate(entries * LOG_ENTRY_SIZE)
+        for entry in range(entries):
+            start = entry * LOG_ENTRY_SIZE
+            record = content[start + 1:start + LOG_ENTRY_SIZE]
+            self.__apply(record_id(record), record if content[start:start + 1] == PUT else None)
+        self.__log_entries = entries
+
+    def __base_id(self, position: int) -> int:
+        return ID_ENTRY.unpack_from(self.__index, INDEX_HEADER.size + position * ID_ENTRY.size)[0]
+
+    def __base_position(self, id: int) -> Optional[int]:
+        low, high = 0, self.__base_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.__base_id(middle) < id:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.__base_count and self.__base_id(low) == id else None
+
+    def __base_record(self, position: int) -> bytes:
+        start = HEADER.size + position * RECORD.size
+        return self.__data[start:start + RECORD.size]
+
+    def __record(self, id: int) -> Optional[bytes]:
+        if id in self.__overlay:
+            return self.__overlay[id][1]
+        position = self.__base_position(id)
+        return None if position is None else self.__base_record(position)
+
+    def __records(self, overlay: dict) -> Iterator[bytes]:
+        """
+        All records in id order, the overlay takes precedence over the data file.
+        """
+        base = (self.__base_record(position) for position in range(self.__base_count)
+                if self.__base_id(position) not in overlay)
+        changed = (record for _, (_, record) in sorted(overlay.items()) if record is not None)
+        return heapq.merge(base, changed, key=record_id)
+
+    def __apply(self, id: int, record: Optional[bytes]) -> None:
+        existed = self.__record(id) is not None
+        self.__sequence += 1
+        self.__overlay[id] = (self.__sequence, record)
+        self.__count += (record is not None) - existed
+        self.__highest_id = max(self.__highest_id, id)
+
+    def __write(self, operation: bytes, record: bytes) -> None:
+        self.__log.write(operation + record)
+        self.__log.flush()
+        self.__log_entries += 1
+        self.__apply(record_id(record), record if operation == PUT else None)
+
+        if self.__log_entries >= self.__compact_threshold and not self.is_compacting():
+            self.__compaction = threading.Thread(target=self.compact, name='beer-hub-compaction', daemon=True)
+            self.__compaction.start()
+
+    def is_compacting(self) -> bool:
+        return self.__compaction is not None and self.__compaction.is_alive()
+
+    def compact(self) -> None:
+        """
+        Merge the log into new data and index files.
+
+        The files are written without holding the lock, reads and writes continue meanwhile;
+        writes that arrive during the compaction stay in the log.
+        """
+        with self.__compaction_lock:
+            with self.__lock:
+                if not self.__log_entries:
+                    return
+                self.__log.flush()
+                overlay = dict(self.__overlay)
+                compacted_entries = self.__log_entries
+                highest_id = self.__highest_id
+                generation = self.__generation + 1
+
+            data_tmp, index_tmp = self.__path(DATA_FILE + '.tmp'), self.__path(INDEX_FILE + '.tmp')
+            with open(data_tmp, 'wb') as data, open(index_tmp, 'wb') as index:
+                data.write(HEADER.pack(MAGIC, RECORD.size, 0, highest_id, generation))
+                index.write(INDEX_HEADER.pack(INDEX_MAGIC, generation, 0))
+                count = 0
+                for record in self.__records(overlay):
+                    data.write(record)
+                    index.write(record[:ID_ENTRY.size])
+                    count += 1
+                data.seek(0)
+                data.write(HEADER.pack(MAGIC, RECORD.size, count, highest_id, generation))
+                index.seek(0)
+                index.write(INDEX_HEADER.pack(INDEX_MAGIC, generation, count))
+                for file in (data, index):
+                    file.flush()
+                    os.fsync(file.fileno())
+
+            with self.__lock:
+                self.__close_base()
+                os.replace(index_tmp, self.__path(INDEX_FILE))
+                os.replace(data_tmp, self.__path(DATA_FILE))
+                self.__sync_directory()
+                self.__open_base()
+
+                # keep the writes that arrived during the compaction
+                self.__log.flush()
+                self.__log.seek(compacted_entries * LOG_ENTRY_SIZE)
+                remaining = self.__log.read()
+                self.__log.close()
+                log_tmp = self.__path(LOG_FILE + '.tmp')
+                with open(log_tmp, 'wb') as log:
+                    log.write(remaining)
+                    # durable before it replaces the log, a crash must not leave it truncated
+                    log.flush()
+                    os.fsync(log.fileno())
+                os.replace(log_tmp, self.__path(LOG_FILE))
+                self.__sync_directory()
+                self.__log = open(self.__path(LOG_FILE), 'a+b')
+                self.__log_entries -= compacted_entries
+
+                for id, (sequence, _) in overlay.items():
+                    if self.__overlay[id][0] == sequence:
+                        del self.__overlay[id]
+
+    def close(self) -> None:
+        compaction = self.__compaction
+        if compaction is not None:
+            compaction.join()
+        with self.__lock:
+            self.__log.close()
+            self.__close_base()
+
+    def __enter__(self) -> 'FileBeerHub':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def number_of_beers(self) -> int:
+        return self.__count
+
+    def get_beers(self) -> list[Beer]:
+        with self.__lock:
+            return [decode_record(record) for record in self.__records(self.__overlay)]
+
+    def get_beer_by_id(self, id: ID) -> Optional[Beer]:
+        with self.__lock:
+            record = self.__record(int(id))
+        return None if record is None else decode_record(record)
+
+    def get_beer_by_name(self, name: Name) -> Optional[Beer]:
+        with self.__lock:
+            record = next((record for record in self.__records(self.__overlay)
+                           if record_text(record, 'name') == name.value), None)
+        return None if record is None else decode_record(record)
+
+    def add_beer(self, beer: Beer) -> None:
+        with self.__lock:
+            if beer.id == ID(-1):
+                new_id = ID(self.__highest_id + 1)
+                beer = Beer(new_id, beer.name, beer.description, beer.brewery, beer.beer_type, beer.alcohol_content)
+            self.__write(PUT, encode_record(beer))
+
+    def update_beer_by_id(self, id: ID, beer: Beer) -> None:
+        with self.__lock:
+            if self.__record(int(id)) is None:
+                raise ValueError(f'Beer with id {id} does not exist!')
+            new_beer = Beer(id, beer.name, beer.description, beer.brewery, beer.beer_type, beer.alcohol_content)
+            self.__write(PUT, encode_record(new_beer))
+
+    def delete_beer_by_id(self, id: ID) -> None:
+        with self.__lock:
+            record = self.__record(int(id))
+            if record is None:
+                raise ValueError(f'Beer with id {id} does not exist!')
+            self.__write(DELETE, record)
+
+    def number_of_breweries(self) -> int:
+        return len(self.get_breweries())
+
+    def get_breweries(self) -> list[Brewery]:
+        with self.__lock:
+            names = dict.fromkeys(record_text(record, 'brewery') for record in self.__records(self.__overlay))
+        return [Brewery(name) for name in names]
+
+    def get_beers_by_brewery(self, brewery: Brewery) -> list[Beer]:
+        with self.__lock:
+            return [decode_record(record) for record in self.__records(self.__overlay)
+                    if record_text(record, 'brewery') == brewery.value]
+
+    def get_beers_by_ascending_alcohol_content(self) -> list[Beer]:
+        with self.__lock:
+            records = sorted(self.__records(self.__overlay), key=lambda record: (record_alcohol_content(record),
+                                                                                 record_id(record)))
+        return [decode_record(record) for record in records]
+
+    def get_beers_by_descending_alcohol_content(self) -> list[Beer]:
+        beers = self.get_beers_by_ascending_alcohol_content()
+        beers.reverse()
+        return beers
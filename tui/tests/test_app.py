@@ -4,6 +4,7 @@ import pytest
 from valid8 import ValidationError
 
 from beer_hub.app import App
+from beer_hub.cache import CachingBeerHub
 from beer_hub.domain import Beer, Name, Description, Brewery, BeerType, AlcoholContent, ID
 from beer_hub.logic import InMemoryBeerHub
 
@@ -36,7 +37,7 @@ class TestApp:
 
         with patch('builtins.input', side_effect=['2', 'user', '0']):
             app = App()
-            assert app._App__selected_hub is not None
+            assert isinstance(app._App__selected_hub, CachingBeerHub)
 
     @patch('beer_hub.app.RESTBeerHub')
     @patch('getpass.getpass')
@@ -58,6 +59,19 @@ class TestApp:
             assert app._App__selected_hub is not None
             assert app._App__selected_hub == mock_hub_instance
 
+    @patch('beer_hub.app.SQLiteBeerHub')
+    def test_select_sqlite_hub(self, mock_sqlite):
+        with patch('builtins.input', side_effect=['3', '0']):
+            app = App()
+            mock_sqlite.assert_called_once_with('beer_hub.sqlite3')
+            assert app._App__selected_hub == mock_sqlite.return_value
+
+    @patch('beer_hub.app.SQLiteBeerHub')
+    def test_sqlite_hub_is_closed_on_exit(self, mock_sqlite):
+        with patch('builtins.input', side_effect=['3', '0']):
+            App().run()
+        mock_sqlite.return_value.close.assert_called_once_with()
+
     def test_exit_hub_selection(self):
         with patch('builtins.input', side_effect=['0']):
             with pytest.raises(SystemExit):
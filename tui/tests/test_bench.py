@@ -0,0 +1,35 @@
+import random
+
+from beer_hub import bench
+from beer_hub.logic import InMemoryBeerHub
+
+
+def test_create_beers():
+    beers = bench.create_beers(30, random.Random(1))
+
+    assert len(beers) == 30
+    assert len({beer.id for beer in beers}) == 30
+
+
+def test_run_times_every_operation():
+    beers = bench.create_beers(30, random.Random(1))
+    hubs = []
+
+    def create_hub():
+        hubs.append(InMemoryBeerHub())
+        return hubs[-1]
+
+    results = bench.run(beers, 10, random.Random(1), create_hub)
+
+    assert set(results) >= {'add_beer', 'get_beer_by_id', 'get_beer_by_name', 'update_beer_by_id', 'delete_beer_by_id'}
+    assert all(seconds >= 0 for seconds in results.values())
+    assert hubs[0].number_of_beers() == len(beers)
+
+
+def test_main(capsys):
+    bench.main(['--beers', '20', '40', '--operations', '5'])
+
+    output = capsys.readouterr().out
+    assert '20 beers' in output
+    assert '40 beers' in output
+    assert 'get_beer_by_id' in output
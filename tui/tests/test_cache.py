@@ -0,0 +1,146 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from beer_hub_client import Client
+from beer_hub.cache import CachingBeerHub, CacheStatistics
+from beer_hub.domain import Beer, ID, Name, Description, Brewery, BeerType, AlcoholContent
+from beer_hub.logic import InMemoryBeerHub, NOT_MODIFIED, RESTBeerHub
+from beer_hub.mapper import beer_to_dto
+
+
+def create_beer(id: int, brewery: str = "Brewery") -> Beer:
+    return Beer(ID(id), Name(f"Beer {chr(ord('A') + id)}"), Description("description"), Brewery(brewery),
+                BeerType("Ale"), AlcoholContent(5.0))
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def hub():
+    hub = InMemoryBeerHub()
+    hub.add_beer(create_beer(0))
+    hub.add_beer(create_beer(1, "Other Brewery"))
+    return MagicMock(spec=InMemoryBeerHub, wraps=hub)
+
+
+@pytest.fixture
+def cache(hub, clock):
+    return CachingBeerHub(hub, ttl=10, max_entries=3, clock=clock)
+
+
+def test_reads_are_cached_until_they_expire(cache, hub, clock):
+    assert cache.get_beers() == [create_beer(0), create_beer(1, "Other Brewery")]
+    assert cache.get_beers() == [create_beer(0), create_beer(1, "Other Brewery")]
+    assert hub.get_beers.call_count == 1
+
+    clock.now = 10
+    cache.get_beers()
+    assert hub.get_beers.call_count == 2
+    assert cache.statistics() == CacheStatistics(hits=1, misses=2)
+
+
+def test_cached_lists_are_copies(cache):
+    cache.get_beers().clear()
+    assert len(cache.get_beers()) == 2
+
+
+def test_least_recently_used_is_evicted(cache, hub):
+    cache.get_beer_by_id(ID(0))
+    cache.get_beer_by_id(ID(1))
+    cache.get_breweries()
+    cache.get_beer_by_id(ID(0))
+    cache.get_beers_by_brewery(Brewery("Brewery"))  # evicts the lookup of beer 1
+
+    cache.get_beer_by_id(ID(0))
+    cache.get_beer_by_id(ID(1))
+    assert hub.get_beer_by_id.call_count == 3
+    assert cache.statistics().evictions == 2
+
+
+def test_writes_invalidate(cache, hub):
+    cache.get_beers()
+    cache.get_beer_by_id(ID(0))
+    cache.get_beer_by_id(ID(1))
+    cache.get_beer_by_id(ID(2))
+
+    cache.update_beer_by_id(ID(1), create_beer(1))
+    cache.add_beer(Beer.of(Name("New"), Description("New"), Brewery("Brewery"), BeerType("Ale"), AlcoholContent(5.0)))
+
+    assert cache.get_beers() == [create_beer(0), create_beer(1),
+                                 Beer(ID(2), Name("New"), Description("New"), Brewery("Brewery"), BeerType("Ale"),
+                                      AlcoholContent(5.0))]
+    assert cache.get_beer_by_id(ID(0)) == create_beer(0)
+    assert cache.get_beer_by_id(ID(1)) == create_beer(1)
+    assert cache.get_beer_by_id(ID(2)).name == Name("New")
+    # only the lookup of the unchanged beer 0 survived
+    assert hub.get_beer_by_id.call_count == 5
+    assert hub.get_beers.call_count == 2
+
+
+def rest_hub(*responses: httpx.Response) -> tuple[RESTBeerHub, list[httpx.Request]]:
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses[len(requests) - 1]
+
+    client = Client(base_url="http://localhost", raise_on_unexpected_status=True,
+                    httpx_args={"transport": httpx.MockTransport(handle)})
+    return RESTBeerHub(client), requests
+
+
+def test_rest_hub_is_revalidated_with_etags(clock):
+    hub, requests = rest_hub(
+        httpx.Response(200, json=[beer_to_dto(create_beer(1)).to_dict()], headers={"ETag": 'W/"1"'}),
+        httpx.Response(304, headers={"ETag": 'W/"1"'}),
+        httpx.Response(200, json={"count": 1}),
+    )
+    cache = CachingBeerHub(hub, ttl=10, clock=clock)
+
+    assert cache.get_beers() == [create_beer(1)]
+    clock.now = 10
+    assert cache.get_beers() == [create_beer(1)]
+    assert cache.number_of_beers() == 1
+
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == 'W/"1"'
+    # the ETag is not sent with later requests
+    assert "If-None-Match" not in requests[2].headers
+    assert cache.statistics() == CacheStatistics(misses=2, revalidations=1)
+    assert cache.statistics().hit_ratio == 1 / 3
+
+
+def test_rest_hub_revalidates_over_one_connection_pool(clock, monkeypatch):
+    clients = []
+    init = httpx.Client.__init__
+
+    def counting_init(self, *args, **kwargs):
+        clients.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(httpx.Client, "__init__", counting_init)
+    hub, requests = rest_hub(*[httpx.Response(304, headers={"ETag": 'W/"1"'})] * 5)
+    for _ in range(5):
+        assert hub.read_if_modified("get_beers", (), 'W/"1"') == ('W/"1"', NOT_MODIFIED)
+
+    assert len(clients) == 1
+    assert all(request.headers["If-None-Match"] == 'W/"1"' for request in requests)
+
+
+def test_rest_hub_unknown_id(clock):
+    hub, _ = rest_hub(httpx.Response(404))
+    cache = CachingBeerHub(hub, clock=clock)
+
+    assert cache.get_beer_by_id(ID(7)) is None
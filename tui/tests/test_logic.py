@@ -1,10 +1,10 @@
-import math
 from unittest.mock import MagicMock, patch
 
 import pytest
 from beer_hub_client.errors import UnexpectedStatus
+from beer_hub_client.models.beers_list_ordering import BeersListOrdering
 from beer_hub.domain import Beer, ID, Name, Description, Brewery, BeerType, AlcoholContent
-from beer_hub.logic import RESTBeerHub, InMemoryBeerHub
+from beer_hub.logic import RESTBeerHub, InMemoryBeerHub, SQLiteBeerHub
 from beer_hub.mapper import beer_to_dto
 
 # Sample beers for testing
@@ -58,9 +58,16 @@ def test_login_failure(client_mock):
 
 
 def test_number_of_beers(rest_beer_hub):
-    with patch.object(rest_beer_hub, "get_beers", return_value=[1, 2, 3]):
+    response_mock = MagicMock()
+    response_mock.content.decode.return_value = '{"count": 3}'
+
+    with patch("beer_hub_client.api.beers.beers_count.sync_detailed", return_value=response_mock) as count_mock, \
+            patch.object(rest_beer_hub, "get_beers") as get_beers_mock:
         assert rest_beer_hub.number_of_beers() == 3
 
+        count_mock.assert_called_once_with(client=rest_beer_hub._RESTBeerHub__client)
+        get_beers_mock.assert_not_called()
+
 
 def test_get_beers(rest_beer_hub):
     with patch("beer_hub_client.api.beers.beers_list.sync", return_value=test_dtos) as beers_list_mock:
@@ -152,21 +159,22 @@ def test_get_beers_by_brewery(rest_beer_hub):
 
 
 def test_get_beers_by_ascending_alcohol_content(rest_beer_hub):
-    with patch.object(rest_beer_hub, "get_beers",
-                      return_value=[MagicMock(alcohol_content=5.5), MagicMock(alcohol_content=4.5)]):
+    with patch("beer_hub_client.api.beers.beers_list.sync",
+               return_value=[test_dtos[1], test_dtos[0]]) as beers_list_mock:
         beers = rest_beer_hub.get_beers_by_ascending_alcohol_content()
 
-        assert math.isclose(beers[0].alcohol_content, 4.5, rel_tol=1e-9)
-        assert math.isclose(beers[1].alcohol_content, 5.5, rel_tol=1e-9)
+        beers_list_mock.assert_called_once_with(client=rest_beer_hub._RESTBeerHub__client,
+                                                ordering=BeersListOrdering.ALCOHOL_CONTENT)
+        assert beers == [test_beers[1], test_beers[0]]
 
 
 def test_get_beers_by_descending_alcohol_content(rest_beer_hub):
-    with patch.object(rest_beer_hub, "get_beers",
-                      return_value=[MagicMock(alcohol_content=4.5), MagicMock(alcohol_content=5.5)]):
+    with patch("beer_hub_client.api.beers.beers_list.sync", return_value=test_dtos) as beers_list_mock:
         beers = rest_beer_hub.get_beers_by_descending_alcohol_content()
 
-        assert math.isclose(beers[0].alcohol_content, 5.5, rel_tol=1e-9)
-        assert math.isclose(beers[1].alcohol_content, 4.5, rel_tol=1e-9)
+        beers_list_mock.assert_called_once_with(client=rest_beer_hub._RESTBeerHub__client,
+                                                ordering=BeersListOrdering("-alcohol_content"))
+        assert beers == test_beers
 
 
 # Additional tests for InMemoryBeerHub
@@ -265,3 +273,155 @@ def test_get_beers_by_brewery_in_memory():
 
     assert len(beers_by_brewery) == 1
     assert beers_by_brewery[0] == test_beers[0]
+
+
+def test_delete_beer_by_id_in_memory_updates_indexes():
+    beer_hub = InMemoryBeerHub()
+    [beer_hub.add_beer(beer) for beer in test_beers]
+
+    beer_hub.delete_beer_by_id(test_beers[0].id)
+
+    assert beer_hub.get_beer_by_id(test_beers[0].id) is None
+    assert beer_hub.get_beer_by_name(test_beers[0].name) is None
+    assert beer_hub.get_beers_by_brewery(test_beers[0].brewery) == []
+    assert beer_hub.get_breweries() == [test_beers[1].brewery]
+
+
+def test_delete_unknown_beer_in_memory():
+    beer_hub = InMemoryBeerHub()
+
+    with pytest.raises(ValueError):
+        beer_hub.delete_beer_by_id(ID(1))
+
+
+def test_ids_are_not_reused_in_memory():
+    beer_hub = InMemoryBeerHub()
+    [beer_hub.add_beer(Beer.of(beer.name, beer.description, beer.brewery, beer.beer_type, beer.alcohol_content))
+     for beer in test_beers]
+
+    beer_hub.delete_beer_by_id(ID(1))
+    beer_hub.add_beer(Beer.of(Name("Third"), Description("d"), Brewery("B"), BeerType("Ale"), AlcoholContent(5.0)))
+
+    assert [beer.id for beer in beer_hub.get_beers()] == [ID(0), ID(2)]
+
+
+def test_add_beer_with_existing_id_replaces_it_in_memory():
+    beer_hub = InMemoryBeerHub()
+    beer_hub.add_beer(test_beers[0])
+    replacement = Beer(test_beers[0].id, Name("Replacement"), Description("d"), Brewery("B"), BeerType("Ale"),
+                       AlcoholContent(5.0))
+
+    beer_hub.add_beer(replacement)
+
+    assert beer_hub.number_of_beers() == 1
+    assert beer_hub.get_beer_by_name(test_beers[0].name) is None
+    assert beer_hub.get_beer_by_id(test_beers[0].id) == replacement
+
+
+def test_get_beer_by_name_returns_first_namesake_in_memory():
+    beer_hub = InMemoryBeerHub()
+    first = Beer(ID(1), Name("Same"), Description("first"), Brewery("B"), BeerType("Ale"), AlcoholContent(5.0))
+    second = Beer(ID(2), Name("Same"), Description("second"), Brewery("B"), BeerType("Ale"), AlcoholContent(5.0))
+    beer_hub.add_beer(first)
+    beer_hub.add_beer(second)
+
+    assert beer_hub.get_beer_by_name(Name("Same")).description == first.description
+    beer_hub.delete_beer_by_id(ID(1))
+    assert beer_hub.get_beer_by_name(Name("Same")).description == second.description
+
+
+def create_beer(id: int, alcohol_content: float) -> Beer:
+    return Beer(ID(id), Name(f"Beer {chr(ord('A') + id)}"), Description("description"), Brewery("Brewery"),
+                BeerType("Ale"), AlcoholContent(alcohol_content))
+
+
+def test_sorted_views_follow_writes_in_memory():
+    beer_hub = InMemoryBeerHub()
+    [beer_hub.add_beer(create_beer(id, alcohol_content)) for id, alcohol_content in [(3, 5.0), (1, 7.0), (2, 4.0)]]
+
+    beer_hub.update_beer_by_id(ID(1), create_beer(1, 3.0))
+    beer_hub.delete_beer_by_id(ID(2))
+    beer_hub.add_beer(create_beer(0, 6.0))
+
+    assert [int(beer.id) for beer in beer_hub.get_beers()] == [0, 1, 3]
+    assert [int(beer.id) for beer in beer_hub.get_beers_by_ascending_alcohol_content()] == [1, 3, 0]
+    assert [int(beer.id) for beer in beer_hub.get_beers_by_descending_alcohol_content()] == [0, 3, 1]
+
+
+def test_sorted_views_break_ties_by_id_in_memory():
+    beer_hub = InMemoryBeerHub()
+    [beer_hub.add_beer(create_beer(id, 5.0)) for id in [2, 0, 1]]
+
+    assert [int(beer.id) for beer in beer_hub.get_beers_by_ascending_alcohol_content()] == [0, 1, 2]
+    assert [int(beer.id) for beer in beer_hub.get_beers_by_descending_alcohol_content()] == [2, 1, 0]
+
+
+def test_reads_return_independent_snapshots_in_memory():
+    beer_hub = InMemoryBeerHub()
+    [beer_hub.add_beer(create_beer(id, alcohol_content)) for id, alcohol_content in [(0, 5.0), (1, 4.0)]]
+
+    by_id = beer_hub.get_beers()
+    beer_hub.get_beers_by_ascending_alcohol_content()
+    by_id.clear()
+
+    assert [int(beer.id) for beer in beer_hub.get_beers()] == [0, 1]
+
+
+@pytest.fixture
+def sqlite_beer_hub(tmp_path):
+    with SQLiteBeerHub(tmp_path / "beers.sqlite3") as hub:
+        yield hub
+
+
+def test_crud_sqlite(sqlite_beer_hub):
+    sqlite_beer_hub.add_beer(test_beers[0])
+    sqlite_beer_hub.add_beer(test_beers[1])
+    sqlite_beer_hub.update_beer_by_id(ID(1), test_beers[1])
+    sqlite_beer_hub.delete_beer_by_id(ID(2))
+
+    assert sqlite_beer_hub.number_of_beers() == 1
+    assert sqlite_beer_hub.get_beer_by_id(ID(1)) == Beer(ID(1), *astuple_without_id(test_beers[1]))
+    assert sqlite_beer_hub.get_beer_by_id(ID(2)) is None
+    assert sqlite_beer_hub.get_beer_by_name(Name("Test Beer Two")).id == ID(1)
+    with pytest.raises(ValueError):
+        sqlite_beer_hub.update_beer_by_id(ID(2), test_beers[1])
+    with pytest.raises(ValueError):
+        sqlite_beer_hub.delete_beer_by_id(ID(2))
+
+
+def astuple_without_id(beer: Beer) -> tuple:
+    return beer.name, beer.description, beer.brewery, beer.beer_type, beer.alcohol_content
+
+
+def test_queries_sqlite(sqlite_beer_hub):
+    beers = [create_beer(3, 5.0), create_beer(4, 4.0), create_beer(5, 5.0), test_beers[1]]
+    sqlite_beer_hub.add_beers(beers)
+
+    assert sqlite_beer_hub.get_beers() == [beers[3]] + beers[:3]
+    assert sqlite_beer_hub.get_beers_by_ascending_alcohol_content() == [beers[1], beers[3], beers[0], beers[2]]
+    assert sqlite_beer_hub.get_beers_by_descending_alcohol_content() == [beers[2], beers[0], beers[3], beers[1]]
+    assert sqlite_beer_hub.number_of_breweries() == 2
+    assert sqlite_beer_hub.get_breweries() == [Brewery("Another Brewery"), Brewery("Brewery")]
+    assert sqlite_beer_hub.get_beers_by_brewery(Brewery("Brewery")) == beers[:3]
+
+
+def test_ids_are_not_reused_sqlite(sqlite_beer_hub):
+    sqlite_beer_hub.add_beer(test_beers[0])
+    sqlite_beer_hub.delete_beer_by_id(ID(1))
+    sqlite_beer_hub.add_beer(Beer.of(*astuple_without_id(test_beers[0])))
+    assert [beer.id for beer in sqlite_beer_hub.get_beers()] == [ID(2)]
+
+
+def test_failed_batch_is_rolled_back_sqlite(sqlite_beer_hub):
+    with pytest.raises(ValueError):
+        with sqlite_beer_hub.batch():
+            sqlite_beer_hub.add_beer(test_beers[0])
+            sqlite_beer_hub.delete_beer_by_id(ID(42))
+    assert sqlite_beer_hub.number_of_beers() == 0
+
+
+def test_persists_sqlite(tmp_path):
+    with SQLiteBeerHub(tmp_path / "beers.sqlite3") as hub:
+        hub.add_beer(test_beers[0])
+    with SQLiteBeerHub(tmp_path / "beers.sqlite3") as hub:
+        assert hub.get_beers() == [test_beers[0]]
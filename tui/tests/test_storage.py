@@ -0,0 +1,188 @@
+import os
+
+import pytest
+from beer_hub.domain import Beer, ID, Name, Description, Brewery, BeerType, AlcoholContent
+from beer_hub import storage
+from beer_hub.storage import FileBeerHub, DATA_FILE, INDEX_FILE, INDEX_HEADER, LOG_FILE, LOG_ENTRY_SIZE, RECORD, \
+    encode_record, decode_record, record_text
+
+
+def create_beer(id: int, alcohol_content: float, brewery: str = "Brewery") -> Beer:
+    return Beer(ID(id), Name(f"Beer {chr(ord('A') + id)}"), Description("Brewed in München"), Brewery(brewery),
+                BeerType("Ale"), AlcoholContent(alcohol_content))
+
+
+@pytest.fixture
+def hub(tmp_path):
+    with FileBeerHub(tmp_path, compact_threshold=1000) as hub:
+        yield hub
+
+
+def test_record_round_trip():
+    beer = Beer(ID(7), Name("ä" * 100), Description("ü" * 250), Brewery("ö" * 100), BeerType("Pale Ale"),
+                AlcoholContent(75.0))
+    record = encode_record(beer)
+    assert len(record) == RECORD.size
+    assert decode_record(record) == beer
+    assert record_text(record, 'brewery') == "ö" * 100
+
+
+def test_crud(hub):
+    hub.add_beer(create_beer(0, 5.0))
+    hub.add_beer(create_beer(1, 4.0, "Other Brewery"))
+    hub.update_beer_by_id(ID(0), create_beer(0, 6.0))
+    hub.delete_beer_by_id(ID(1))
+
+    assert hub.number_of_beers() == 1
+    assert hub.get_beers() == [create_beer(0, 6.0)]
+    assert hub.get_beer_by_id(ID(1)) is None
+    assert hub.get_beer_by_name(Name("Beer A")) == create_beer(0, 6.0)
+    assert hub.get_breweries() == [Brewery("Brewery")]
+    with pytest.raises(ValueError):
+        hub.update_beer_by_id(ID(1), create_beer(1, 4.0))
+    with pytest.raises(ValueError):
+        hub.delete_beer_by_id(ID(1))
+
+
+def test_add_beer_with_unknown_id(hub):
+    hub.add_beer(create_beer(4, 5.0))
+    beer = create_beer(0, 5.0)
+    hub.add_beer(Beer.of(beer.name, beer.description, beer.brewery, beer.beer_type, beer.alcohol_content))
+    assert [int(beer.id) for beer in hub.get_beers()] == [4, 5]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_reopen(tmp_path, compact):
+    with FileBeerHub(tmp_path) as hub:
+        for id in range(5):
+            hub.add_beer(create_beer(id, 5.0 - id, "Brewery" if id % 2 else "Other Brewery"))
+        hub.delete_beer_by_id(ID(4))
+        if compact:
+            hub.compact()
+
+    with FileBeerHub(tmp_path) as hub:
+        assert hub.number_of_beers() == 4
+        assert hub.get_beers() == [create_beer(id, 5.0 - id, "Brewery" if id % 2 else "Other Brewery")
+                                   for id in range(4)]
+        assert [int(beer.id) for beer in hub.get_beers_by_ascending_alcohol_content()] == [3, 2, 1, 0]
+        assert [int(beer.id) for beer in hub.get_beers_by_descending_alcohol_content()] == [0, 1, 2, 3]
+        assert [int(beer.id) for beer in hub.get_beers_by_brewery(Brewery("Brewery"))] == [1, 3]
+        assert hub.number_of_breweries() == 2
+        # a deleted highest id is not reused
+        hub.add_beer(Beer.of(Name("New"), Description("New"), Brewery("Brewery"), BeerType("Ale"),
+                             AlcoholContent(5.0)))
+        assert hub.get_beer_by_name(Name("New")).id == ID(5)
+
+
+def test_compaction_merges_the_log(tmp_path):
+    with FileBeerHub(tmp_path) as hub:
+        for id in range(3):
+            hub.add_beer(create_beer(id, 5.0))
+        hub.compact()
+        hub.update_beer_by_id(ID(1), create_beer(1, 7.0))
+        hub.delete_beer_by_id(ID(0))
+        hub.add_beer(create_beer(3, 1.0))
+        assert os.path.getsize(tmp_path / LOG_FILE) == 3 * LOG_ENTRY_SIZE
+
+        hub.compact()
+        assert os.path.getsize(tmp_path / LOG_FILE) == 0
+        assert os.path.getsize(tmp_path / INDEX_FILE) == INDEX_HEADER.size + 3 * 8
+        assert hub.number_of_beers() == 3
+        assert hub.get_beers() == [create_beer(1, 7.0), create_beer(2, 5.0), create_beer(3, 1.0)]
+
+
+def test_compaction_runs_in_the_background(tmp_path):
+    with FileBeerHub(tmp_path, compact_threshold=2) as hub:
+        for id in range(5):
+            hub.add_beer(create_beer(id, 5.0))
+        assert hub.number_of_beers() == 5
+    # writes during a compaction stay in the log
+    indexed = (os.path.getsize(tmp_path / INDEX_FILE) - INDEX_HEADER.size) // 8
+    assert indexed >= 2
+    assert indexed + os.path.getsize(tmp_path / LOG_FILE) // LOG_ENTRY_SIZE >= 5
+
+    with FileBeerHub(tmp_path) as hub:
+        assert [int(beer.id) for beer in hub.get_beers()] == list(range(5))
+
+
+def test_interrupted_write_is_discarded(tmp_path):
+    with FileBeerHub(tmp_path) as hub:
+        hub.add_beer(create_beer(0, 5.0))
+    with open(tmp_path / LOG_FILE, 'ab') as log:
+        log.write(b'P' + encode_record(create_beer(1, 5.0))[:10])
+
+    with FileBeerHub(tmp_path) as hub:
+        assert hub.get_beers() == [create_beer(0, 5.0)]
+        hub.add_beer(create_beer(1, 5.0))
+    with FileBeerHub(tmp_path) as hub:
+        assert hub.number_of_beers() == 2
+
+
+def test_missing_index_is_rebuilt(tmp_path):
+    with FileBeerHub(tmp_path) as hub:
+        for id in range(3):
+            hub.add_beer(create_beer(id, 5.0))
+        hub.compact()
+    os.remove(tmp_path / INDEX_FILE)
+
+    with FileBeerHub(tmp_path) as hub:
+        assert hub.get_beer_by_id(ID(2)) == create_beer(2, 5.0)
+
+
+@pytest.mark.parametrize("completed_replacements", [0, 1, 2])
+def test_interrupted_compaction(tmp_path, monkeypatch, completed_replacements):
+    with FileBeerHub(tmp_path) as hub:
+        for id in range(3):
+            hub.add_beer(create_beer(id, 5.0))
+        hub.compact()
+        hub.delete_beer_by_id(ID(1))
+        hub.add_beer(create_beer(3, 5.0))
+
+        # crash after the index, the data file or the log has been replaced
+        replace = os.replace
+        replacements = []
+
+        def crashing_replace(source, destination):
+            if len(replacements) == completed_replacements:
+                raise OSError("crash")
+            replacements.append(destination)
+            replace(source, destination)
+
+        monkeypatch.setattr(storage.os, "replace", crashing_replace)
+        with pytest.raises(OSError):
+            hub.compact()
+        monkeypatch.undo()
+
+    with FileBeerHub(tmp_path) as hub:
+        assert hub.get_beers() == [create_beer(0, 5.0), create_beer(2, 5.0), create_beer(3, 5.0)]
+        assert hub.get_beer_by_id(ID(1)) is None
+        assert hub.get_beer_by_id(ID(2)) == create_beer(2, 5.0)
+        assert hub.number_of_beers() == 3
+
+
+def test_compaction_syncs_the_files_before_replacing(tmp_path, monkeypatch):
+    synced, replaced = [], []
+    fsync, replace = os.fsync, os.replace
+
+    def recording_fsync(fd):
+        synced.append(os.fstat(fd).st_ino)
+        fsync(fd)
+
+    def recording_replace(source, destination):
+        assert os.stat(source).st_ino in synced
+        replaced.append(os.path.basename(destination))
+        replace(source, destination)
+
+    monkeypatch.setattr(storage.os, "fsync", recording_fsync)
+    monkeypatch.setattr(storage.os, "replace", recording_replace)
+    with FileBeerHub(tmp_path) as hub:
+        hub.add_beer(create_beer(0, 5.0))
+        replaced.clear()
+        hub.compact()
+    assert replaced == [INDEX_FILE, DATA_FILE, LOG_FILE]
+
+
+def test_rejects_foreign_files(tmp_path):
+    (tmp_path / DATA_FILE).write_bytes(b'not a beer hub' * 10)
+    with pytest.raises(ValueError):
+        FileBeerHub(tmp_path)